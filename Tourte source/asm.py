@@ -0,0 +1,51 @@
+# Structured x86-64 instructions, rendered to NASM text at the end of CodeGen
+
+class VReg:
+    """Virtual register, replaced by a machine register or a .bss slot by the allocator."""
+    count=0
+    def __init__(self, name=None):
+        VReg.count+=1
+        self.id=VReg.count
+        self.name=name # source variable, None for a temporary
+    def slot(self):
+        return f'v_{self.name}' if self.name is not None else f't_{self.id}'
+    def __repr__(self):
+        return f'%{self.name}' if self.name is not None else f'%t{self.id}'
+
+class Mem:
+    def __init__(self, label, size='qword'):
+        self.label=label; self.size=size
+    def __repr__(self):
+        return f'{self.size} [{self.label}]' if self.size else f'[{self.label}]'
+
+class Instr:
+    __slots__=('op','args')
+    def __init__(self, op, *args):
+        self.op=op; self.args=list(args)
+    def __repr__(self):
+        if self.op=='label': return f'{self.args[0]}:'
+        if self.op==';': return f'    ; {self.args[0]}'
+        if not self.args: return f'    {self.op}'
+        return f'    {self.op} '+','.join(str(a) for a in self.args)
+
+# Instructions that write their first operand without reading it
+WRITE_ONLY={'mov','lea','movzx','pop'}
+# Two-operand instructions that read and write their first operand
+READ_WRITE={'add','sub','imul','and','or','xor'}
+UNARY={'neg','not','inc','dec'}
+READ_ONLY={'cmp','test','push','idiv'}
+
+def is_jump(instr):
+    return instr.op[0]=='j'
+
+def defs_uses(instr):
+    """Virtual registers written and read by an instruction."""
+    op,args=instr.op,instr.args
+    if op in WRITE_ONLY: defs,uses=args[:1],args[1:]
+    elif op in READ_WRITE or op in UNARY: defs,uses=args[:1],args
+    elif op in READ_ONLY: defs,uses=[],args
+    else: defs,uses=[],[]
+    return [a for a in defs if isinstance(a,VReg)],[a for a in uses if isinstance(a,VReg)]
+
+def fits_imm32(value):
+    return not isinstance(value,int) or -2**31<=value<2**31
@@ -0,0 +1,232 @@
+import re
+import sys
+
+# Interpreter for the NASM subset emitted by CodeGen, used to check generated programs and
+# count what they execute where nasm (or x86-64) is not available. printf is simulated;
+# it clobbers the caller-saved registers so that values wrongly kept in them show up.
+
+MASK=(1<<64)-1
+REG64=['rax','rbx','rcx','rdx','rsi','rdi','rbp','rsp']+[f'r{i}' for i in range(8,16)]
+SUBREGS={}
+for _r,_e,_b in zip(REG64[:8],['eax','ebx','ecx','edx','esi','edi','ebp','esp'],['al','bl','cl','dl','sil','dil','bpl','spl']):
+    SUBREGS[_e]=(_r,32); SUBREGS[_b]=(_r,8)
+for _i in range(8,16):
+    SUBREGS[f'r{_i}d']=(f'r{_i}',32); SUBREGS[f'r{_i}b']=(f'r{_i}',8)
+CALLER_SAVED=['rax','rcx','rdx','rsi','rdi','r8','r9','r10','r11']
+CALLEE_SAVED=['rbx','rbp','r12','r13','r14','r15']
+CONDITIONS={
+    'e':lambda f:f['zf'],'z':lambda f:f['zf'],'ne':lambda f:not f['zf'],'nz':lambda f:not f['zf'],
+    'l':lambda f:f['sf']!=f['of'],'ge':lambda f:f['sf']==f['of'],
+    'le':lambda f:f['zf'] or f['sf']!=f['of'],'g':lambda f:not f['zf'] and f['sf']==f['of'],
+    'b':lambda f:f['cf'],'ae':lambda f:not f['cf'],'be':lambda f:f['cf'] or f['zf'],'a':lambda f:not f['cf'] and not f['zf'],
+}
+# Rough cost model (cycles): 1 per instruction, plus the extra latency below
+EXTRA_COST={'imul':2,'idiv':39,'call':0}
+LOAD_COST=3    # each memory operand read (L1 hit)
+TAKEN_COST=1   # each taken branch
+MEMORY=re.compile(r'(?:(byte|word|dword|qword)\s+)?\[([^\]]+)\]')
+
+def signed(v):
+    v&=MASK
+    return v-(1<<64) if v>>63 else v
+
+class SimError(Exception):
+    pass
+
+class Machine:
+    def __init__(self, lines, max_steps=10**8):
+        self.code=[]; self.labels={}; self.data={}; self.strings={}
+        self.max_steps=max_steps
+        self.parse(lines)
+
+    def parse(self, lines):
+        section=None
+        for line in lines:
+            line=(line if '"' in line else line.split(';',1)[0]).strip()
+            if not line or line.startswith(('extern','global')): continue
+            if line.startswith('section'):
+                section=line.split()[1]; continue
+            m=re.match(r'([A-Za-z_.][\w.]*):\s*(.*)$',line)
+            if m:
+                label,rest=m.groups()
+                if section in ('.bss','.data','.rodata'):
+                    self.define_data(label,rest)
+                else:
+                    self.labels[label]=len(self.code)
+                    if rest: self.code.append(self.split(rest))
+                continue
+            self.code.append(self.split(line))
+
+    def define_data(self, label, rest):
+        kind,_,values=rest.partition(' ')
+        if kind=='db':
+            out=bytearray()
+            for part in re.findall(r'"[^"]*"|[^,\s]+',values):
+                out+=part[1:-1].encode() if part.startswith('"') else bytes([int(part)])
+            self.strings[label]=bytes(out).split(b'\0')[0].decode()
+        else:
+            self.data[label]=0
+
+    @staticmethod
+    def split(text):
+        op,_,rest=text.partition(' ')
+        args=[a.strip() for a in re.split(r',(?![^\[]*\])',rest)] if rest.strip() else []
+        return op.lower(),args
+
+    # --- Operands ---
+    def address(self, expr):
+        total=0
+        for sign,term in re.findall(r'([+-]?)\s*([\w.]+)',expr):
+            value=self.regs[term] if term in self.regs else self.data_address(term) if not term[0].isdigit() else int(term,0)
+            total+=-value if sign=='-' else value
+        return total
+
+    def data_address(self, label):
+        if label not in self.addresses: raise SimError(f'unknown label {label}')
+        return self.addresses[label]
+
+    def read(self, operand):
+        if operand in self.regs: return self.regs[operand]
+        if operand in SUBREGS:
+            reg,bits=SUBREGS[operand]
+            return self.regs[reg]&((1<<bits)-1)
+        m=MEMORY.fullmatch(operand)
+        if m:
+            self.loads+=1
+            return self.memory.get(self.address(m.group(2)),0)
+        return int(operand,0)&MASK
+
+    def write(self, operand, value):
+        value&=MASK
+        if operand in self.regs: self.regs[operand]=value; return
+        if operand in SUBREGS:
+            reg,bits=SUBREGS[operand]
+            if bits==32: self.regs[reg]=value&0xffffffff
+            else: self.regs[reg]=(self.regs[reg]&~0xff)|(value&0xff)
+            return
+        m=MEMORY.fullmatch(operand)
+        if not m: raise SimError(f'cannot write to {operand}')
+        self.stores+=1
+        self.memory[self.address(m.group(2))]=value
+
+    def set_flags(self, result, of=False, cf=False):
+        result&=MASK
+        self.flags={'zf':result==0,'sf':bool(result>>63),'of':of,'cf':cf}
+
+    # --- Execution ---
+    def run(self, out=None):
+        out=sys.stdout if out is None else out
+        self.addresses={}; self.memory={}
+        for i,label in enumerate(list(self.data)+list(self.strings)):
+            self.addresses[label]=0x1000+8*i
+        self.regs={r:0 for r in REG64}
+        for i,r in enumerate(CALLEE_SAVED):
+            self.regs[r]=0x5a5a0000+i # checked on return
+        entry=dict(self.regs)
+        self.regs['rsp']=0x7ff0_0000-8 # main is entered with a return address pushed
+        self.flags={'zf':False,'sf':False,'of':False,'cf':False}
+        self.steps=self.loads=self.stores=self.cycles=0
+        self.output=[]
+        pc=self.labels['main']
+        while True:
+            if pc>=len(self.code): raise SimError('fell off the end of the code')
+            op,args=self.code[pc]
+            pc+=1
+            self.steps+=1
+            if self.steps>self.max_steps: raise SimError('step limit reached')
+            loads=self.loads
+            self.cycles+=1+EXTRA_COST.get(op,0)
+            if op=='ret':
+                if self.regs['rsp']!=0x7ff0_0000-8: raise SimError('stack pointer not restored')
+                for r in CALLEE_SAVED:
+                    if self.regs[r]!=entry[r]: raise SimError(f'callee-saved {r} not restored')
+                self.cycles+=LOAD_COST*(self.loads-loads)
+                return signed(self.regs['rax'])
+            target=self.execute(op,args,out)
+            self.cycles+=LOAD_COST*(self.loads-loads)
+            if target is not None:
+                pc=self.labels[target]; self.cycles+=TAKEN_COST
+
+    def execute(self, op, args, out):
+        if op=='mov': self.write(args[0],self.read(args[1]))
+        elif op=='movzx': self.write(args[0],self.read(args[1]))
+        elif op=='lea': self.write(args[0],self.address(MEMORY.fullmatch(args[1]).group(2)))
+        elif op in ('add','sub'):
+            a,b=self.read(args[0]),self.read(args[1])
+            r=a+b if op=='add' else a-b
+            sa,sb=signed(a),signed(b)
+            sr=sa+sb if op=='add' else sa-sb
+            self.write(args[0],r)
+            self.set_flags(r,of=signed(r)!=sr,cf=(r>MASK) if op=='add' else a<b)
+        elif op=='imul':
+            if len(args)==3: a,b=self.read(args[1]),self.read(args[2])
+            else: a,b=self.read(args[0]),self.read(args[1])
+            r=signed(a)*signed(b)
+            self.write(args[0],r)
+            self.set_flags(r,of=signed(r)!=r,cf=signed(r)!=r)
+        elif op=='idiv':
+            d=signed(self.read(args[0]))
+            if d==0: raise SimError('division by zero')
+            n=(signed(self.regs['rdx'])<<64)|self.regs['rax']
+            q=abs(n)//abs(d)*(1 if (n<0)==(d<0) else -1)
+            self.regs['rax']=q&MASK; self.regs['rdx']=(n-q*d)&MASK
+        elif op=='cqo': self.regs['rdx']=MASK if self.regs['rax']>>63 else 0
+        elif op in ('and','or','xor'):
+            a,b=self.read(args[0]),self.read(args[1])
+            r=a&b if op=='and' else a|b if op=='or' else a^b
+            self.write(args[0],r); self.set_flags(r)
+        elif op=='neg':
+            a=self.read(args[0]); self.write(args[0],-a); self.set_flags(-a,of=a==1<<63,cf=a!=0)
+        elif op=='not': self.write(args[0],~self.read(args[0]))
+        elif op in ('inc','dec'):
+            a=self.read(args[0]); r=a+1 if op=='inc' else a-1
+            self.write(args[0],r); self.set_flags(r,of=signed(r)!=signed(a)+(1 if op=='inc' else -1),cf=self.flags['cf'])
+        elif op=='cmp':
+            a,b=self.read(args[0]),self.read(args[1])
+            self.set_flags(a-b,of=signed(a-b)!=signed(a)-signed(b),cf=a<b)
+        elif op=='test': self.set_flags(self.read(args[0])&self.read(args[1]))
+        elif op.startswith('set') and op[3:] in CONDITIONS:
+            self.write(args[0],int(bool(CONDITIONS[op[3:]](self.flags))))
+        elif op=='jmp': return args[0]
+        elif op[0]=='j' and op[1:] in CONDITIONS:
+            if CONDITIONS[op[1:]](self.flags): return args[0]
+        elif op=='push':
+            self.regs['rsp']=(self.regs['rsp']-8)&MASK
+            self.stores+=1; self.memory[self.regs['rsp']]=self.read(args[0])
+        elif op=='pop':
+            self.loads+=1; self.write(args[0],self.memory.get(self.regs['rsp'],0))
+            self.regs['rsp']=(self.regs['rsp']+8)&MASK
+        elif op=='leave':
+            self.regs['rsp']=self.regs['rbp']
+            self.loads+=1; self.regs['rbp']=self.memory.get(self.regs['rsp'],0)
+            self.regs['rsp']+=8
+        elif op=='call': self.call(args[0],out)
+        else: raise SimError(f'unsupported instruction {op}')
+        return None
+
+    def call(self, name, out):
+        if name!='printf': raise SimError(f'unknown function {name}')
+        if self.regs['rsp']%16: raise SimError('stack not 16-byte aligned at call printf')
+        text=self.strings[next(l for l,a in self.addresses.items() if a==self.regs['rdi'])]
+        arguments=iter(['rsi','rdx','rcx','r8','r9'])
+        text=re.sub(r'%ld',lambda m:str(signed(self.regs[next(arguments)])),text)
+        out.write(text); self.output.append(text)
+        for i,r in enumerate(CALLER_SAVED):
+            self.regs[r]=0xdead0000+i
+        self.regs['rax']=len(text)
+
+def simulate(lines, out=None):
+    machine=Machine(lines)
+    machine.run(out)
+    return machine
+
+if __name__=='__main__':
+    if len(sys.argv)!=2:
+        print("Usage: python asmsim.py program.asm")
+        sys.exit(1)
+    try:
+        m=simulate(open(sys.argv[1]).read().split('\n'))
+    except SimError as e:
+        print(f'asmsim: {e}',file=sys.stderr)
+        sys.exit(1)
+    print(f'{m.steps} instructions, {m.loads} loads, {m.stores} stores, ~{m.cycles} cycles (estimate)',file=sys.stderr)
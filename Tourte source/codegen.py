@@ -1,115 +1,223 @@
-from ast import *
+from asm import Instr, Mem, VReg
+from ir import COMMUTATIVE, COMPARISONS, VOID, Const, Inst, liveness, lower, split_critical_edges, verify
+from opt import optimize
+from peephole import peephole
+from regalloc import allocate
+
+ARITH={'add':'add','sub':'sub','mul':'imul'}
+TWO_ADDRESS={'add','sub','mul','neg'}
+SETCC={'eq':'sete','ne':'setne','lt':'setl','le':'setle','gt':'setg','ge':'setge'}
+JCC={'eq':'je','ne':'jne','lt':'jl','le':'jle','gt':'jg','ge':'jge'}
+NEGATED={'eq':'ne','ne':'eq','lt':'ge','le':'gt','gt':'le','ge':'lt'}
+SWAPPED={'eq':'eq','ne':'ne','lt':'gt','le':'ge','gt':'lt','ge':'le'}
 
 class CodeGen:
-    def __init__(self):
+    def __init__(self, level=1):
         self.lines=[]
-        self.vars={}
-        self.label_id=0
+        self.code=[]
         self.format_label='fmt_int'
-
-    def new_label(self, base='L'):
-        self.label_id+=1
-        return f"{base}{self.label_id}"
+        self.level=level # -O level, see opt.py
+        self.ir=None
+        self.passes=None
+        self.allocation=None
+        self.rewrites=None # peephole statistics
 
     def emit(self, line): self.lines.append(line)
 
-    def ensure_var(self,name):
-        if name not in self.vars:
-            self.vars[name]=f'v_{name}'
-        return self.vars[name]
+    def ins(self, op, *args): self.code.append(Instr(op,*args))
 
     def gen(self, node):
+        self.ir=lower(node)
+        self.passes=optimize(self.ir,self.level)
+        split_critical_edges(self.ir)
+        verify(self.ir)
+        self.gen_function(self.ir)
+        self.allocation=allocate(self.code,registers=self.level>0)
+        if self.level>0:
+            self.allocation.code,self.rewrites=peephole(self.allocation.code)
+        saved=self.allocation.saved
         self.emit('extern printf')
         self.emit('global main')
         self.emit('section .text')
         self.emit('main:')
         self.emit('    push rbp')
         self.emit('    mov rbp,rsp')
-        self.gen_block(node)
+        for reg in saved: self.emit(f'    push {reg}')
+        if len(saved)%2: self.emit('    sub rsp,8') # printf needs a 16-byte aligned stack
+        self.lines.extend(str(i) for i in self.allocation.code)
         self.emit('    mov rax,0')
+        if len(saved)%2: self.emit('    add rsp,8')
+        for reg in reversed(saved): self.emit(f'    pop {reg}')
         self.emit('    leave')
         self.emit('    ret')
         # data
         self.emit('section .rodata')
         self.emit(f'{self.format_label}: db "%ld",10,0')
         self.emit('section .bss')
-        for name,label in self.vars.items():
+        for label in self.allocation.slots:
             self.emit(f'    {label}: dq 0')
 
-    def gen_block(self,block):
-        for s in block.stmts:
-            if s: self.gen_stmt(s)
+    # --- Blocks ---
+    def gen_function(self, func):
+        self.fused=fuse_branches(func)
+        self.regs=coalesce(func)
+        blocks=func.blocks
+        for i,block in enumerate(blocks):
+            following=blocks[i+1] if i+1<len(blocks) else None
+            self.ins('label',block.name)
+            for inst in block.insts: self.gen_inst(inst)
+            term=block.term
+            if term.op=='jmp':
+                target=term.targets[0]
+                self.gen_phi_copies(block,target)
+                if target is not following: self.ins('jmp',target.name)
+            elif term.op=='br':
+                then,other=term.targets
+                cond=term.args[0]
+                if cond in self.fused:
+                    op=self.gen_compare(cond)
+                else:
+                    self.ins('cmp',self.in_register(cond),0)
+                    op='ne'
+                if other is following: self.ins(JCC[op],then.name)
+                else:
+                    self.ins(JCC[NEGATED[op]],other.name)
+                    if then is not following: self.ins('jmp',then.name)
+            elif following is not None:
+                self.ins('jmp','Lreturn') # the epilogue follows the last block
+        if any(b.term.op=='ret' for b in blocks[:-1]): self.ins('label','Lreturn')
+
+    def gen_phi_copies(self, block, target):
+        """Copies into the phis of `target` on the edge from `block`, as one parallel copy."""
+        i=target.preds.index(block)
+        pending={}
+        for phi in target.phis:
+            dst,src=self.regs[phi],self.operand(phi.args[i])
+            if src is not dst: pending[dst]=src
+        while pending:
+            ready=next((d for d in pending if all(s is not d for s in pending.values())),None)
+            if ready is None:
+                # Cycle (phis swapping their values): save one destination first
+                ready=next(iter(pending))
+                saved=VReg()
+                self.ins('mov',saved,ready)
+                for d,s in pending.items():
+                    if s is ready: pending[d]=saved
+                continue
+            self.ins('mov',ready,pending.pop(ready))
 
-    def gen_stmt(self,s):
-        if isinstance(s,Assign):
-            lbl=self.ensure_var(s.name)
-            self.gen_expr(s.expr,'rax')
-            self.emit(f'    mov qword [{lbl}], rax')
-        elif isinstance(s,Print):
-            self.gen_expr(s.expr,'rdi')
-            self.emit('    mov rsi,rdi')
-            self.emit(f'    lea rdi,[{self.format_label}]')
-            self.emit('    xor rax,rax')
-            self.emit('    call printf')
-        elif isinstance(s,If):
-            Lelse=self.new_label('Lelse')
-            Lend=self.new_label('Lend')
-            self.gen_expr(s.cond,'rax')
-            self.emit('    cmp rax,0')
-            self.emit(f'    je {Lelse}')
-            self.gen_stmt(s.thenb) if not isinstance(s.thenb,Block) else self.gen_block(s.thenb)
-            self.emit(f'    jmp {Lend}')
-            self.emit(f'{Lelse}:')
-            if s.elseb:
-                self.gen_stmt(s.elseb) if not isinstance(s.elseb,Block) else self.gen_block(s.elseb)
-            self.emit(f'{Lend}:')
-        elif isinstance(s,While):
-            Lstart=self.new_label('Lstart')
-            Lend=self.new_label('Lend')
-            self.emit(f'{Lstart}:')
-            self.gen_expr(s.cond,'rax')
-            self.emit('    cmp rax,0')
-            self.emit(f'    je {Lend}')
-            self.gen_stmt(s.body) if not isinstance(s.body,Block) else self.gen_block(s.body)
-            self.emit(f'    jmp {Lstart}')
-            self.emit(f'{Lend}:')
-        elif isinstance(s,Block):
-            self.gen_block(s)
+    # --- Instructions ---
+    def gen_inst(self, inst):
+        op=inst.op
+        if op=='print':
+            self.ins('mov','rsi',self.operand(inst.args[0]))
+            self.ins('lea','rdi',Mem(self.format_label,None))
+            self.ins('xor','rax','rax')
+            self.ins('call','printf')
+        elif op in ARITH:
+            self.gen_binary(ARITH[op],inst)
+        elif op in ('div','mod'):
+            dst=self.regs[inst]
+            left=self.operand(inst.args[0])
+            right=self.in_register(inst.args[1]) # idiv takes no immediate
+            self.ins('mov','rax',left)
+            self.ins('mov','rdx',0)
+            self.ins('cqo')
+            self.ins('idiv',right)
+            self.ins('mov',dst,'rax' if op=='div' else 'rdx')
+        elif op=='neg':
+            dst=self.regs[inst]
+            self.ins('mov',dst,self.operand(inst.args[0]))
+            self.ins('neg',dst)
+        elif op in COMPARISONS:
+            if inst in self.fused: return # emitted with the branch
+            self.ins(SETCC[self.gen_compare(inst)],'al')
+            self.ins('movzx',self.regs[inst],'al')
+        elif op=='pow':
+            self.ins('mov',self.regs[inst],self.operand(inst.args[0]))
+            # simple pow via loop (naïf)
+            self.ins(';','pow not implemented')
         else:
-            raise NotImplementedError(s)
+            raise NotImplementedError(op)
 
-    def gen_expr(self,e,reg):
-        if isinstance(e,Num):
-            self.emit(f'    mov {reg},{e.val}')
-        elif isinstance(e,Var):
-            lbl=self.ensure_var(e.name)
-            self.emit(f'    mov {reg},qword [{lbl}]')
-        elif isinstance(e,BinOp):
-            self.gen_expr(e.left,'rax')
-            self.emit('    push rax')
-            self.gen_expr(e.right,'rbx')
-            self.emit('    pop rax')
-            if e.op=='+': self.emit('    add rax,rbx')
-            elif e.op=='-': self.emit('    sub rax,rbx')
-            elif e.op=='*': self.emit('    imul rax,rbx')
-            elif e.op=='/':
-                self.emit('    mov rdx,0')
-                self.emit('    cqo')
-                self.emit('    idiv rbx')
-            elif e.op=='%':
-                self.emit('    mov rdx,0')
-                self.emit('    cqo')
-                self.emit('    idiv rbx')
-                self.emit('    mov rax,rdx')
-            elif e.op=='**':
-                # simple pow via loop (naïf)
-                self.emit('    ; pow not implemented')
+    def gen_compare(self, inst):
+        """cmp for a comparison; returns its condition, reversed if the operands were swapped."""
+        op,(left,right)=inst.op,inst.args
+        if isinstance(left,Const) and not isinstance(right,Const):
+            op,left,right=SWAPPED[op],right,left # cmp takes no immediate on the left
+        self.ins('cmp',self.in_register(left),self.operand(right))
+        return op
+
+    def gen_binary(self, op, inst):
+        dst=self.regs[inst]
+        left,right=self.operand(inst.args[0]),self.operand(inst.args[1])
+        if right is dst and left is not dst:
+            # The result shares the right operand's register (coalesced)
+            if inst.op in COMMUTATIVE: left,right=right,left
             else:
-                self.emit(f'    ; unknown binop {e.op}')
-            if reg!='rax':
-                self.emit(f'    mov {reg},rax')
-        elif isinstance(e,UniOp):
-            self.gen_expr(e.val,reg)
-            if e.op=='-': self.emit(f'    neg {reg}')
-        else:
-            raise NotImplementedError(e)
+                tmp=VReg()
+                self.ins('mov',tmp,left); self.ins(op,tmp,right); self.ins('mov',dst,tmp)
+                return
+        self.ins('mov',dst,left)
+        self.ins(op,dst,right)
+
+    def operand(self, value):
+        return value.value if isinstance(value,Const) else self.regs[value]
+
+    def in_register(self, value):
+        operand=self.operand(value)
+        if isinstance(operand,VReg): return operand
+        reg=VReg()
+        self.ins('mov',reg,operand)
+        return reg
+
+def fuse_branches(func):
+    """Comparisons only used by the branch of their block: they become cmp+jcc instead of
+    setcc, movzx, cmp 0 and je. Each is moved just before the branch, so that nothing
+    clobbers the flags in between and its operands stay live until there."""
+    fused=set()
+    for b in func.blocks:
+        cond=b.term.args[0] if b.term.op=='br' else None
+        if isinstance(cond,Inst) and cond.op in COMPARISONS and cond.block is b and cond.users==[b.term]:
+            b.insts.remove(cond); b.insts.append(cond)
+            fused.add(cond)
+    return fused
+
+# --- Out of SSA ---
+def coalesce(func):
+    """Virtual register of each value. Values that do not interfere share a register (Sreedhar's
+    congruence classes): a phi with its operands, so that most phi copies disappear, then the
+    result of a two-address instruction with its operand, so that `x = add a, b` needs no
+    `mov x,a`. Two values interfere when one is live where the other is defined."""
+    live_in,live_out=liveness(func)
+    live_at={}
+    for b in func.blocks:
+        live=set(live_out[b])
+        for inst in reversed(b.insts+[b.term]):
+            live.discard(inst)
+            live_at[inst]=set(live)
+            live.update(a for a in inst.args if not isinstance(a,Const))
+        for p in b.phis:
+            live_at[p]=(live|set(b.phis))-{p}
+    classes={}
+    def merge(x, y):
+        if isinstance(y,Const): return False
+        left=classes.get(x,[x]); right=classes.get(y,[y])
+        if left is right: return True
+        if any(u in live_at[v] or v in live_at[u] for u in left for v in right): return False
+        merged=left+right
+        for v in merged: classes[v]=merged
+        return True
+    for b in func.blocks:
+        for p in b.phis:
+            for a in p.args: merge(p,a)
+    for v in func.values():
+        if v.op in TWO_ADDRESS and not merge(v,v.args[0]) and v.op in COMMUTATIVE:
+            merge(v,v.args[1])
+    regs={}
+    for v in func.values():
+        if v.op in VOID or v in regs: continue
+        members=classes.get(v,[v])
+        reg=VReg(next((m.name for m in members if m.name is not None and m.name.isidentifier()),None))
+        for m in members: regs[m]=reg
+    return regs
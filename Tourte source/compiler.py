@@ -2,9 +2,10 @@ import sys
 from lexer import lex
 from parser import Parser
 from codegen import CodeGen
+from ir import format_ir
 
 if len(sys.argv)<2:
-    print("Usage: python compiler.py source.t -o out.asm")
+    print("Usage: python compiler.py source.t -o out.asm [-O0|-O1|-O2] [--ir]")
     sys.exit(1)
 
 srcfile = sys.argv[1]
@@ -17,8 +18,21 @@ tokens=list(lex(src))
 parser=Parser(tokens)
 ast=parser.parse()
 
-cg=CodeGen()
+level=1
+for arg in sys.argv[2:]:
+    if arg in ('-O0','-O1','-O2'): level=int(arg[2])
+cg=CodeGen(level)
 cg.gen(ast)
 with open(outfile,'w') as f:
     f.write('\n'.join(cg.lines))
+if '--ir' in sys.argv:
+    print(format_ir(cg.ir))
 print(f"ASM written to {outfile}")
+a=cg.allocation
+p=cg.passes
+print(f"-O{level}: {p['folded']} folded, {p['cse']} common subexpressions, {p['hoisted']} hoisted, "
+      f"{p['dead']} dead values removed; {a.registers} registers, {a.spilled} spilled to .bss")
+if cg.rewrites is not None:
+    r=cg.rewrites
+    fired=', '.join(f"{name.replace('_',' ')} {n}" for name,n in r.items() if n and name!='removed')
+    print(f"peephole: {r['removed']} instructions removed" + (f" ({fired})" if fired else ""))
@@ -0,0 +1,448 @@
+from ast import *
+
+# SSA intermediate representation between the AST and CodeGen.
+# A Function is a list of basic blocks in layout order. Each block holds its phis, its
+# instructions and one terminator (jmp, br or ret); values are instructions, phis or constants.
+
+BINOPS={'+':'add','-':'sub','*':'mul','/':'div','%':'mod','**':'pow',
+        '==':'eq','!=':'ne','<':'lt','<=':'le','>':'gt','>=':'ge'}
+COMPARISONS={'eq','ne','lt','le','gt','ge'}
+COMMUTATIVE={'add','mul','eq','ne'}
+TERMINATORS={'jmp','br','ret'}
+VOID={'print'}
+
+class IRError(Exception):
+    pass
+
+class Value:
+    def __init__(self):
+        self.users=[]
+        self.name=None # source variable the value was assigned to, for listings and .bss slots
+
+class Const(Value):
+    def __init__(self, value):
+        super().__init__()
+        self.value=value
+
+class Inst(Value):
+    def __init__(self, op, args, block=None, targets=()):
+        super().__init__()
+        self.op=op; self.args=[]; self.block=block; self.targets=list(targets)
+        for a in args: self.add_arg(a)
+    def add_arg(self, value):
+        self.args.append(value); value.users.append(self)
+    def set_arg(self, i, value):
+        self.args[i].users.remove(self)
+        self.args[i]=value; value.users.append(self)
+
+class Phi(Inst):
+    def __init__(self, block, var):
+        super().__init__('phi',[],block)
+        self.name=var
+
+class BasicBlock:
+    def __init__(self, name):
+        self.name=name
+        self.phis=[]; self.insts=[]; self.term=None
+        self.preds=[]
+    @property
+    def succs(self):
+        return self.term.targets if self.term is not None else []
+
+class Function:
+    def __init__(self):
+        self.blocks=[]
+        self.entry=None
+        self.consts={}
+    def const(self, value):
+        key=(type(value),value)
+        if key not in self.consts: self.consts[key]=Const(value)
+        return self.consts[key]
+    def values(self):
+        for b in self.blocks:
+            yield from b.phis
+            yield from b.insts
+
+def replace_uses(value, new):
+    for user in list(value.users):
+        for i,a in enumerate(user.args):
+            if a is value: user.set_arg(i,new)
+
+def remove_inst(inst):
+    """Take an instruction or phi without users out of its block."""
+    for a in inst.args: a.users.remove(inst)
+    inst.args=[]
+    (inst.block.phis if isinstance(inst,Phi) else inst.block.insts).remove(inst)
+
+# --- Construction (Braun et al., "Simple and Efficient Construction of SSA Form", 2013) ---
+class Lowering:
+    def __init__(self):
+        self.func=Function()
+        self.current_def={} # variable -> {block: value}
+        self.incomplete={}  # unsealed block -> {variable: phi}
+        self.sealed=set()
+        self.replaced={}    # removed trivial phi -> its replacement
+        self.label_id=0
+        self.block=None
+
+    def new_block(self, base):
+        self.label_id+=1
+        return BasicBlock(f'{base}{self.label_id}')
+
+    def start(self, block):
+        """Continue lowering in `block`, placed after the blocks already laid out."""
+        self.func.blocks.append(block)
+        self.block=block
+
+    def const(self, value):
+        return self.func.const(value)
+
+    def emit(self, op, *args):
+        inst=Inst(op,args,self.block)
+        self.block.insts.append(inst)
+        return inst
+
+    def terminate(self, block, op, args=(), targets=()):
+        block.term=Inst(op,args,block,targets)
+        for t in targets: t.preds.append(block)
+
+    def jump(self, block, target):
+        self.terminate(block,'jmp',(),[target])
+
+    # Variables
+    def write(self, var, block, value):
+        self.current_def.setdefault(var,{})[block]=value
+
+    def read(self, var, block):
+        value=self.current_def.get(var,{}).get(block)
+        return value if value is not None else self.read_recursive(var,block)
+
+    def read_recursive(self, var, block):
+        if block not in self.sealed:
+            value=Phi(block,var)
+            block.phis.append(value)
+            self.incomplete.setdefault(block,{})[var]=value
+        elif not block.preds:
+            value=self.const(0) # read before any assignment, like a zeroed .bss slot
+        elif len(block.preds)==1:
+            value=self.read(var,block.preds[0])
+        else:
+            value=Phi(block,var)
+            block.phis.append(value)
+            self.write(var,block,value)
+            value=self.add_phi_operands(var,value)
+        self.write(var,block,value)
+        return value
+
+    def add_phi_operands(self, var, phi):
+        for pred in phi.block.preds:
+            phi.add_arg(self.read(var,pred))
+        return self.remove_trivial_phi(phi)
+
+    def remove_trivial_phi(self, phi):
+        same=None
+        for op in phi.args:
+            if op is same or op is phi: continue
+            if same is not None: return phi # merges at least two values
+            same=op
+        if same is None: same=self.const(0)
+        users=[u for u in phi.users if u is not phi]
+        replace_uses(phi,same)
+        remove_inst(phi)
+        self.replaced[phi]=same
+        for defs in self.current_def.values():
+            for b,v in defs.items():
+                if v is phi: defs[b]=same
+        for u in users:
+            if isinstance(u,Phi) and u in u.block.phis: self.remove_trivial_phi(u)
+        while same in self.replaced: same=self.replaced[same] # removed by the recursion
+        return same
+
+    def seal(self, block):
+        for var,phi in self.incomplete.pop(block,{}).items():
+            self.add_phi_operands(var,phi)
+        self.sealed.add(block)
+
+    # Statements
+    def lower(self, program):
+        entry=self.func.entry=self.new_block('Lentry')
+        self.seal(entry)
+        self.start(entry)
+        self.lower_stmt(program)
+        self.terminate(self.block,'ret')
+        return self.func
+
+    def lower_stmt(self, s):
+        if s is None: return
+        if isinstance(s,Block):
+            for x in s.stmts: self.lower_stmt(x)
+        elif isinstance(s,Assign):
+            value=self.lower_expr(s.expr)
+            if value.name is None and not isinstance(value,Const): value.name=s.name
+            self.write(s.name,self.block,value)
+        elif isinstance(s,Print):
+            self.emit('print',self.lower_expr(s.expr))
+        elif isinstance(s,If):
+            then=self.new_block('Lthen')
+            other=self.new_block('Lelse') if s.elseb else None
+            end=self.new_block('Lend')
+            self.branch(s.cond,then,other or end)
+            for block,body in ((then,s.thenb),(other,s.elseb)):
+                if block is None: continue
+                self.seal(block)
+                self.start(block)
+                self.lower_stmt(body)
+                self.jump(self.block,end)
+            self.seal(end)
+            self.start(end)
+        elif isinstance(s,While):
+            header=self.new_block('Lstart')
+            self.jump(self.block,header)
+            self.start(header)
+            exit_block=self.enter_loop(header,s.cond)
+            self.lower_stmt(s.body)
+            self.leave_loop(header,exit_block)
+        elif isinstance(s,For):
+            # Python's range: bounds evaluated once, the variable takes the values of a hidden
+            # counter (a zero step runs no iteration instead of raising)
+            header=self.new_block('Lfor')
+            # Not a valid identifier: cannot clash with a variable. Named after the loop, so that
+            # nested loops over the same variable each keep their own position
+            counter=f' for {s.var} {header.name}'
+            start=self.lower_expr(s.start)
+            self.write(counter,self.block,start)
+            end=self.lower_expr(s.end)
+            step=self.lower_expr(s.step) if s.step is not None else self.const(1)
+            self.jump(self.block,header)
+            self.start(header)
+            i=self.read(counter,header)
+            if isinstance(step,Const):
+                cond=self.emit('lt',i,end) if step.value>0 else self.emit('gt',i,end) if step.value<0 else self.const(0)
+            else:
+                up=self.emit('mul',self.emit('gt',step,self.const(0)),self.emit('lt',i,end))
+                down=self.emit('mul',self.emit('lt',step,self.const(0)),self.emit('gt',i,end))
+                cond=self.emit('add',up,down)
+            exit_block=self.enter_loop(header,cond)
+            self.write(s.var,self.block,i)
+            self.lower_stmt(s.body)
+            self.write(counter,self.block,self.emit('add',self.read(counter,self.block),step))
+            self.leave_loop(header,exit_block)
+        else:
+            raise NotImplementedError(s)
+
+    def enter_loop(self, header, cond):
+        """Branch on `cond` (an expression, or a value already computed) at the end of the loop
+        header; continue in the body. Returns the exit block."""
+        body=self.new_block('Lbody')
+        exit_block=self.new_block('Lend')
+        if isinstance(cond,Node): self.branch(cond,body,exit_block)
+        else: self.terminate(header,'br',[cond],[body,exit_block])
+        self.seal(body); self.seal(exit_block)
+        self.start(body)
+        return exit_block
+
+    def leave_loop(self, header, exit_block):
+        """Back edge to the header, which now knows all its predecessors."""
+        self.jump(self.block,header)
+        self.seal(header)
+        self.start(exit_block)
+
+    def branch(self, cond, then, other):
+        """Jump to `then` if the expression `cond` is true, else to `other`. 'and', 'or' and
+        'not' become control flow: no boolean is computed for them."""
+        if isinstance(cond,BinOp) and cond.op in ('and','or'):
+            second=self.new_block('Land' if cond.op=='and' else 'Lor')
+            if cond.op=='and': self.branch(cond.left,second,other)
+            else: self.branch(cond.left,then,second)
+            self.seal(second)
+            self.start(second)
+            self.branch(cond.right,then,other)
+        elif isinstance(cond,UniOp) and cond.op=='not':
+            self.branch(cond.val,other,then)
+        else:
+            value=self.lower_expr(cond) # may end in another block ('and'/'or' values)
+            self.terminate(self.block,'br',[value],[then,other])
+
+    # Expressions
+    def lower_expr(self, e):
+        if isinstance(e,Num): return self.const(e.val)
+        if isinstance(e,Var): return self.read(e.name,self.block)
+        if isinstance(e,BinOp) and e.op in ('and','or'):
+            # The value of the operand that decided, merged by a phi of a hidden variable
+            var=f' {e.op}'
+            left=self.lower_expr(e.left)
+            self.write(var,self.block,left)
+            second=self.new_block('Land' if e.op=='and' else 'Lor')
+            end=self.new_block('Ljoin')
+            self.terminate(self.block,'br',[left],[second,end] if e.op=='and' else [end,second])
+            self.seal(second)
+            self.start(second)
+            right=self.lower_expr(e.right)
+            self.write(var,self.block,right)
+            self.jump(self.block,end)
+            self.seal(end)
+            self.start(end)
+            return self.read(var,end)
+        if isinstance(e,BinOp):
+            left=self.lower_expr(e.left)
+            right=self.lower_expr(e.right)
+            if e.op not in BINOPS: raise NotImplementedError(e.op)
+            return self.emit(BINOPS[e.op],left,right)
+        if isinstance(e,UniOp):
+            value=self.lower_expr(e.val)
+            if e.op=='-': return self.emit('neg',value)
+            if e.op=='not': return self.emit('eq',value,self.const(0))
+            return value
+        raise NotImplementedError(e)
+
+def lower(program):
+    """SSA Function of a parsed program (ast.Block)."""
+    return Lowering().lower(program)
+
+# --- CFG utilities ---
+def reverse_postorder(func):
+    seen=set(); order=[]
+    stack=[(func.entry,iter(func.entry.succs))]
+    seen.add(func.entry)
+    while stack:
+        block,succs=stack[-1]
+        for s in succs:
+            if s not in seen:
+                seen.add(s); stack.append((s,iter(s.succs))); break
+        else:
+            stack.pop(); order.append(block)
+    return order[::-1]
+
+def dominators(func):
+    """Immediate dominator of each reachable block (Cooper, Harvey & Kennedy)."""
+    order=reverse_postorder(func)
+    index={b:i for i,b in enumerate(order)}
+    idom={func.entry:func.entry}
+    changed=True
+    while changed:
+        changed=False
+        for b in order[1:]:
+            new=None
+            for p in b.preds:
+                if p not in idom: continue
+                if new is None: new=p; continue
+                x,y=p,new
+                while x is not y:
+                    while index[x]>index[y]: x=idom[x]
+                    while index[y]>index[x]: y=idom[y]
+                new=x
+            if idom.get(b) is not new:
+                idom[b]=new; changed=True
+    return idom
+
+def dominates(idom, a, b):
+    while True:
+        if a is b: return True
+        if idom[b] is b: return False
+        b=idom[b]
+
+def split_critical_edges(func):
+    """Give a block of its own to every edge from a block with several successors to a block
+    with several predecessors, where phi copies can be placed."""
+    for block in list(func.blocks):
+        if len(block.preds)<2: continue
+        for i,pred in enumerate(block.preds):
+            if len(pred.succs)<2: continue
+            edge=BasicBlock(f'{pred.name}_{block.name}')
+            func.blocks.insert(func.blocks.index(block),edge)
+            pred.term.targets[pred.term.targets.index(block)]=edge
+            edge.preds.append(pred)
+            edge.term=Inst('jmp',[],edge,[block])
+            block.preds[i]=edge
+
+def liveness(func):
+    """Values live on entry to and on exit from each block. A phi operand is live at the
+    end of the corresponding predecessor, not on entry to the phi's block."""
+    use={};define={}
+    for b in func.blocks:
+        u=set();d=set(b.phis)
+        for inst in b.insts+[b.term]:
+            u.update(a for a in inst.args if not isinstance(a,Const) and a not in d)
+            d.add(inst)
+        use[b]=u;define[b]=d
+    live_in={b:set() for b in func.blocks}; live_out={b:set() for b in func.blocks}
+    changed=True
+    while changed:
+        changed=False
+        for b in reversed(func.blocks):
+            out=set()
+            for s in b.succs:
+                out|=live_in[s]
+                i=s.preds.index(b)
+                out.update(p.args[i] for p in s.phis if not isinstance(p.args[i],Const))
+            inn=use[b]|(out-define[b])
+            if out!=live_out[b] or inn!=live_in[b]:
+                live_out[b]=out; live_in[b]=inn; changed=True
+    return live_in,live_out
+
+# --- Verifier ---
+def verify(func):
+    """Check the structural invariants of the IR; raise IRError on the first violation."""
+    def fail(msg): raise IRError(msg)
+    if func.entry is None or func.entry.preds: fail('entry block missing or has predecessors')
+    reachable=set(reverse_postorder(func))
+    defined={}
+    for b in func.blocks:
+        if b not in reachable: fail(f'{b.name} is unreachable')
+        if b.term is None or b.term.op not in TERMINATORS: fail(f'{b.name} has no terminator')
+        if len(b.term.targets)!={'jmp':1,'br':2,'ret':0}[b.term.op]: fail(f'{b.name}: bad targets')
+        for s in b.succs:
+            if b not in s.preds: fail(f'{b.name} -> {s.name} missing from predecessors')
+        for p in b.preds:
+            if b not in p.succs: fail(f'{p.name} listed as predecessor of {b.name}')
+        for i,phi in enumerate(b.phis):
+            if not isinstance(phi,Phi) or phi.block is not b: fail(f'{b.name}: bad phi')
+            if len(phi.args)!=len(b.preds): fail(f'{b.name}: phi has {len(phi.args)} operands for {len(b.preds)} predecessors')
+            defined[phi]=(b,-1)
+        for i,inst in enumerate(b.insts):
+            if inst.op in TERMINATORS or isinstance(inst,Phi): fail(f'{b.name}: {inst.op} in the middle of the block')
+            if inst.block is not b: fail(f'{b.name}: instruction of another block')
+            defined[inst]=(b,i)
+    idom=dominators(func)
+    for b in func.blocks:
+        for phi in b.phis:
+            for pred,a in zip(b.preds,phi.args):
+                check_use(fail,defined,idom,a,phi,pred,len(pred.insts))
+        for i,inst in enumerate(b.insts+[b.term]):
+            for a in inst.args:
+                check_use(fail,defined,idom,a,inst,b,i)
+
+def check_use(fail, defined, idom, value, user, block, index):
+    """`value` must be available at position `index` of `block`."""
+    if user not in value.users: fail(f'{user.op} missing from the users of its operand')
+    if isinstance(value,Const): return
+    if value not in defined: fail(f'{user.op} uses a value that is not in the function')
+    b,i=defined[value]
+    if b is block:
+        if i>=index: fail(f'{block.name}: value used before its definition')
+    elif not dominates(idom,b,block): fail(f'{block.name}: use not dominated by its definition in {b.name}')
+
+# --- Printer ---
+def format_ir(func):
+    """Textual listing of a Function, one instruction per line."""
+    names={}
+    def name(v):
+        if isinstance(v,Const): return str(v.value)
+        if v not in names: names[v]=f'%{len(names)}'
+        return names[v]
+    for v in func.values():
+        if v.op not in VOID: name(v)
+    lines=[]
+    for b in func.blocks:
+        preds=', '.join(p.name for p in b.preds)
+        lines.append(f'{b.name}:'+(f'  ; preds {preds}' if preds else ''))
+        for phi in b.phis:
+            ops=', '.join(f'[{p.name}: {name(a)}]' for p,a in zip(b.preds,phi.args))
+            lines.append(f'    {name(phi)} = phi {ops}  ; {phi.name.strip()}')
+        for inst in b.insts:
+            text=f'{inst.op} '+', '.join(name(a) for a in inst.args)
+            note=f'  ; {inst.name}' if inst.name else ''
+            lines.append(f'    {text}' if inst.op in VOID else f'    {name(inst)} = {text}{note}')
+        t=b.term
+        lines.append('    '+' '.join([t.op]+[', '.join([name(a) for a in t.args]+[s.name for s in t.targets])]).rstrip())
+    return '\n'.join(lines)
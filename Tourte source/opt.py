@@ -0,0 +1,169 @@
+from ir import COMMUTATIVE, COMPARISONS, TERMINATORS, VOID, Const, Phi, dominates, dominators, remove_inst, replace_uses
+
+# Optimization passes over the SSA IR, run by CodeGen before emitting x86-64.
+#   -O0  none; every value lives in .bss (no register allocation)
+#   -O1  dead code elimination, register allocation, peephole rules (peephole.py)
+#   -O2  -O1 + constant folding, common subexpression elimination, loop-invariant code motion
+
+PURE={'add','sub','mul','div','mod','neg'}|COMPARISONS
+INT64_MIN=-2**63
+
+def wrap(value):
+    value&=(1<<64)-1
+    return value-(1<<64) if value>>63 else value
+
+def safe_division(divisor):
+    """idiv cannot trap for this divisor, whatever the dividend."""
+    return isinstance(divisor,Const) and type(divisor.value) is int and divisor.value not in (0,-1)
+
+def can_move(inst):
+    return inst.op in PURE and (inst.op not in ('div','mod') or safe_division(inst.args[1]))
+
+# --- Constant folding ---
+def fold(inst):
+    """Constant or value equal to `inst`, or None. Follows x86-64: 64-bit wrapping, idiv
+    truncating towards zero; a division that would trap is left to run."""
+    op,args=inst.op,inst.args
+    if op not in PURE: return None
+    if all(isinstance(a,Const) and type(a.value) is int for a in args):
+        values=[a.value for a in args]
+        if op=='neg': return wrap(-values[0])
+        a,b=values
+        if op=='add': return wrap(a+b)
+        if op=='sub': return wrap(a-b)
+        if op=='mul': return wrap(a*b)
+        if op in ('div','mod'):
+            if b==0 or (b==-1 and a==INT64_MIN): return None
+            q=abs(a)//abs(b)*(1 if (a<0)==(b<0) else -1)
+            return q if op=='div' else a-q*b
+        return int({'eq':a==b,'ne':a!=b,'lt':a<b,'le':a<=b,'gt':a>b,'ge':a>=b}[op])
+    if op in ('add','sub','mul') and len(args)==2:
+        a,b=args
+        for x,y in ((a,b),(b,a)) if op!='sub' else ((a,b),):
+            if isinstance(y,Const) and type(y.value) is int:
+                if y.value==0 and op!='mul': return x  # x+0, x-0
+                if y.value==1 and op=='mul': return x
+                if y.value==0 and op=='mul': return 0
+    return None
+
+# --- Passes ---
+def cse(func, stats):
+    """Fold constants and replace each pure instruction by an identical one that dominates it,
+    walking the dominator tree with a scoped table."""
+    idom=dominators(func)
+    children={b:[] for b in func.blocks}
+    for b,parent in idom.items():
+        if b is not parent: children[parent].append(b)
+    table={}
+    stack=[(func.entry,None)]
+    while stack:
+        block,added=stack.pop()
+        if added is not None:
+            for key in added: del table[key]
+            continue
+        added=[]
+        stack.append((block,added))
+        for inst in list(block.insts):
+            folded=fold(inst)
+            if folded is not None:
+                stats['folded']+=1
+                replace(inst,func.const(folded) if isinstance(folded,int) else folded)
+                continue
+            if inst.op not in PURE: continue
+            key=value_key(inst)
+            if key in table:
+                stats['cse']+=1
+                replace(inst,table[key])
+            else:
+                table[key]=inst; added.append(key)
+        stack.extend((c,None) for c in reversed(children[block]))
+    simplify_phis(func)
+
+def value_key(inst):
+    args=[('c',type(a.value).__name__,a.value) if isinstance(a,Const) else ('v',id(a)) for a in inst.args]
+    if inst.op in COMMUTATIVE: args.sort()
+    return (inst.op,tuple(args))
+
+def replace(inst, value):
+    if value.name is None and not isinstance(value,Const): value.name=inst.name
+    replace_uses(inst,value)
+    remove_inst(inst)
+
+def simplify_phis(func):
+    """Remove the phis that merge a single value (left behind by folding and CSE)."""
+    changed=True
+    while changed:
+        changed=False
+        for b in func.blocks:
+            for phi in list(b.phis):
+                values={id(a):a for a in phi.args if a is not phi}
+                if len(values)==1:
+                    replace(phi,next(iter(values.values()))); changed=True
+
+def natural_loops(func, idom):
+    """Blocks of each natural loop, by header."""
+    loops={}
+    for b in func.blocks:
+        for h in b.succs:
+            if dominates(idom,h,b): # back edge
+                body=loops.setdefault(h,{h})
+                stack=[b]
+                while stack:
+                    x=stack.pop()
+                    if x not in body:
+                        body.add(x); stack.extend(x.preds)
+    return loops
+
+def licm(func, stats):
+    """Move the pure instructions whose operands are defined outside a loop to its preheader,
+    innermost loops first (their preheader lies in the enclosing loop, which may hoist them again)."""
+    idom=dominators(func)
+    for header,body in sorted(natural_loops(func,idom).items(),key=lambda item:len(item[1])):
+        outside=[p for p in header.preds if p not in body]
+        if len(outside)!=1 or len(outside[0].succs)!=1: continue
+        preheader=outside[0]
+        changed=True
+        while changed:
+            changed=False
+            for b in func.blocks:
+                if b not in body: continue
+                for inst in list(b.insts):
+                    if can_move(inst) and all(isinstance(a,Const) or a.block not in body for a in inst.args):
+                        b.insts.remove(inst)
+                        inst.block=preheader; preheader.insts.append(inst)
+                        stats['hoisted']+=1; changed=True
+
+def dce(func, stats):
+    """Mark and sweep: keep what prints or decides a branch, the divisions that may trap, and
+    the values they need. Values that are never read (dead assignments, loop counters nobody
+    reads) disappear, with their registers or .bss slots."""
+    live=set()
+    work=[]
+    for b in func.blocks:
+        for inst in b.insts+[b.term]:
+            if inst.op in VOID or inst.op in TERMINATORS or \
+                    (inst.op in ('div','mod') and not safe_division(inst.args[1])):
+                live.add(inst); work.append(inst)
+    while work:
+        inst=work.pop()
+        for a in inst.args:
+            if not isinstance(a,Const) and a not in live:
+                live.add(a); work.append(a)
+    dead=[v for b in func.blocks for v in b.phis+b.insts if v not in live and v.op not in VOID]
+    for v in dead:
+        for a in v.args: a.users.remove(v)
+        v.args=[]
+    for v in dead:
+        (v.block.phis if isinstance(v,Phi) else v.block.insts).remove(v)
+    stats['dead']+=len(dead)
+
+def optimize(func, level):
+    """Run the passes of `level` on `func`; returns the count of each transformation."""
+    stats={'folded':0,'cse':0,'hoisted':0,'dead':0}
+    if level>=2:
+        cse(func,stats)
+        licm(func,stats)
+        cse(func,stats) # hoisted instructions may now duplicate one in the preheader
+    if level>=1:
+        dce(func,stats)
+    return stats
@@ -96,8 +96,24 @@ class Parser:
         body=self.parse_stmt()
         return For(var, start, end, step, body)
 
-    # Simple expressions (supports +,-,*,/,%,**)
+    # Conditions: 'or' binds looser than 'and', itself looser than comparisons.
+    # Like Python, 'a and b' / 'a or b' give one of their operands and skip the second if they can.
     def parse_expr(self):
+        left = self.parse_and()
+        while self.peek().type=='ID' and self.peek().val=='or':
+            self.pop()
+            left = BinOp('or', left, self.parse_and())
+        return left
+
+    def parse_and(self):
+        left = self.parse_comparison()
+        while self.peek().type=='ID' and self.peek().val=='and':
+            self.pop()
+            left = BinOp('and', left, self.parse_comparison())
+        return left
+
+    # Simple expressions (supports +,-,*,/,%,**)
+    def parse_comparison(self):
         left = self.parse_add()
         t = self.peek()
         if t.type == 'OP' and t.val in ('==','!=','<','>','<=','>='):
@@ -127,6 +143,10 @@ class Parser:
         if self.peek().type=='OP' and self.peek().val=='-':
             self.pop()
             return UniOp('-', self.parse_unary())
+        t=self.peek()
+        if (t.type=='OP' and t.val=='!') or (t.type=='ID' and t.val=='not'):
+            self.pop()
+            return UniOp('not', self.parse_unary())
         return self.parse_primary()
 
     def parse_primary(self):
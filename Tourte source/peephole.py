@@ -0,0 +1,167 @@
+from asm import READ_WRITE, UNARY, WRITE_ONLY, Instr, Mem, fits_imm32, is_jump
+from regalloc import basic_blocks
+
+# Peephole optimizer over the allocated instructions (machine registers and .bss slots).
+# Each rule looks at the instruction at a position, the next one and the registers live
+# after them, and returns how many instructions it replaces and by what.
+
+REGISTERS=('rax','rbx','rcx','rdx','rsi','rdi','rbp','rsp')+tuple(f'r{i}' for i in range(8,16))
+DWORD=dict(zip(REGISTERS,('eax','ebx','ecx','edx','esi','edi','ebp','esp')+tuple(f'r{i}d' for i in range(8,16))))
+FULL={**{r:r for r in REGISTERS},**{d:r for r,d in DWORD.items()},'al':'rax'}
+CALL_CLOBBERS=('rax','rcx','rdx','rsi','rdi','r8','r9','r10','r11','flags')
+# Instructions with no effect besides their register (and flags) results
+SIDE_EFFECT_FREE=(WRITE_ONLY-{'pop'})|READ_WRITE|UNARY|{'cmp','test','cqo'}
+# Instructions whose second operand may be replaced by the source of a preceding mov
+FORWARD={'mov','add','sub','imul','and','or','xor','cmp','test'}
+INVERSE={'je':'jne','jne':'je','jl':'jge','jge':'jl','jle':'jg','jg':'jle'}
+
+def register(operand):
+    """64-bit register named by `operand`, or None (immediate, memory, label)."""
+    return FULL.get(operand) if isinstance(operand,str) else None
+
+def effects(ins):
+    """Machine registers (and 'flags') written and read by an instruction."""
+    op,args=ins.op,ins.args
+    regs=[r for r in map(register,args) if r is not None]
+    if op=='call': return CALL_CLOBBERS,('rdi','rsi','rax')
+    if op=='cqo': return ('rdx',),('rax',)
+    if op=='idiv': return ('rax','rdx','flags'),('rax','rdx',*regs)
+    if op.startswith('set'): return ('rax',),('rax','flags') # writes al only
+    if op in ('xor','sub') and len(regs)==2 and args[0]==args[1]: return (regs[0],'flags'),()
+    if op in WRITE_ONLY:
+        dst=register(args[0])
+        return ([dst] if dst else []),[r for r in map(register,args[1:]) if r is not None]
+    if op in READ_WRITE or op in UNARY: return [r for r in [register(args[0]),'flags'] if r],regs
+    if op in ('cmp','test'): return ('flags',),regs
+    if op=='push': return (),regs
+    if is_jump(ins) and op!='jmp': return (),('flags',)
+    return (),()
+
+def live_after(code):
+    """Registers live after each instruction. Nothing is live at the end: the epilogue follows."""
+    if not code: return []
+    blocks,succ=basic_blocks(code)
+    table=[effects(ins) for ins in code]
+    use=[];define=[]
+    for s,e in blocks:
+        u=set();d=set()
+        for defs,uses in table[s:e]:
+            u.update(r for r in uses if r not in d)
+            d.update(defs)
+        use.append(u);define.append(d)
+    live_in=[set() for _ in blocks]; live_out=[set() for _ in blocks]
+    changed=True
+    while changed:
+        changed=False
+        for b in reversed(range(len(blocks))):
+            out=set().union(*(live_in[n] for n in succ[b]))
+            inn=use[b]|(out-define[b])
+            if out!=live_out[b] or inn!=live_in[b]:
+                live_out[b]=out; live_in[b]=inn; changed=True
+    live=[None]*len(code)
+    for b,(s,e) in enumerate(blocks):
+        current=set(live_out[b])
+        for i in range(e-1,s-1,-1):
+            live[i]=frozenset(current)
+            defs,uses=table[i]
+            current.difference_update(defs); current.update(uses)
+    return live
+
+def following_labels(code, i):
+    labels=set()
+    for ins in code[i:]:
+        if ins.op=='label': labels.add(ins.args[0])
+        elif ins.op!=';': break
+    return labels
+
+# --- Rules: (code, i, live) -> (instructions replaced, replacement) or None ---
+def dead_code(code, i, live):
+    """An instruction whose results are overwritten before being read (`mov rdx,0` before
+    `cqo`, a register loaded twice, a `cmp` nobody tests)."""
+    ins=code[i]
+    if ins.op not in SIDE_EFFECT_FREE or (ins.args and isinstance(ins.args[0],Mem)): return None
+    defs,_=effects(ins)
+    if defs and not any(r in live[i] for r in defs): return 1,[]
+    return None
+
+def push_pop(code, i, live):
+    """`push x; pop y` is a move."""
+    if i+1>=len(code) or code[i].op!='push' or code[i+1].op!='pop': return None
+    src,dst=code[i].args[0],code[i+1].args[0]
+    return 2,[] if str(src)==str(dst) else [Instr('mov',dst,src)]
+
+def forward_move(code, i, live):
+    """`mov r,x; op y,r` with r dead afterwards becomes `op y,x`."""
+    if i+1>=len(code): return None
+    first,second=code[i],code[i+1]
+    if first.op!='mov' or first.args[0] not in REGISTERS: return None
+    reg,src=first.args
+    if second.op not in FORWARD or len(second.args)!=2 or second.args[1]!=reg or second.args[0]==reg: return None
+    if reg in live[i+1]: return None
+    dst=second.args[0]
+    if isinstance(src,Mem) and isinstance(dst,Mem): return None
+    if isinstance(src,int) and not fits_imm32(src) and not (second.op=='mov' and dst in REGISTERS): return None
+    if second.op=='mov' and str(dst)==str(src): return 2,[]
+    return 2,[Instr(second.op,dst,src)]
+
+def jump_to_next(code, i, live):
+    """A jump to the label that follows it."""
+    ins=code[i]
+    if is_jump(ins) and ins.args[0] in following_labels(code,i+1): return 1,[]
+    return None
+
+def branch_over_jump(code, i, live):
+    """`jcc L; jmp M; L:` becomes `jncc M`."""
+    if i+1>=len(code): return None
+    first,second=code[i],code[i+1]
+    if first.op in INVERSE and second.op=='jmp' and first.args[0] in following_labels(code,i+2):
+        return 2,[Instr(INVERSE[first.op],second.args[0])]
+    return None
+
+def zero_idiom(code, i, live):
+    """`mov r,0` (where the flags are dead) and `xor r,r` become the shorter `xor r32,r32`."""
+    ins=code[i]
+    if ins.op=='mov' and ins.args[0] in REGISTERS and ins.args[1]==0 and 'flags' not in live[i] \
+            or ins.op=='xor' and ins.args[0] in REGISTERS and ins.args[1]==ins.args[0]:
+        reg=DWORD[ins.args[0]]
+        return 1,[Instr('xor',reg,reg)]
+    return None
+
+RULES=(dead_code,push_pop,forward_move,jump_to_next,branch_over_jump,zero_idiom)
+
+def remove_unused_labels(code):
+    targets={ins.args[0] for ins in code if is_jump(ins)}
+    kept=[ins for ins in code if ins.op!='label' or ins.args[0] in targets]
+    return kept,len(code)-len(kept)
+
+def count(code):
+    return sum(ins.op not in ('label',';') for ins in code)
+
+def peephole(code):
+    """Apply the rules until none matches. Returns the new code and, per rule, how many
+    times it fired, with the number of instructions removed under 'removed'."""
+    stats={rule.__name__:0 for rule in RULES}
+    stats['labels']=0
+    before=count(code)
+    changed=True
+    while changed:
+        code,removed=remove_unused_labels(code)
+        stats['labels']+=removed
+        live=live_after(code)
+        out=[]
+        changed=False
+        i=0
+        while i<len(code):
+            for rule in RULES:
+                match=rule(code,i,live)
+                if match is not None:
+                    consumed,replacement=match
+                    out.extend(replacement)
+                    i+=consumed
+                    stats[rule.__name__]+=1; changed=True
+                    break
+            else:
+                out.append(code[i]); i+=1
+        code=out
+    stats['removed']=before-count(code)
+    return code,stats
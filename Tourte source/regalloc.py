@@ -0,0 +1,169 @@
+from asm import Instr, Mem, VReg, defs_uses, fits_imm32, is_jump
+
+# Allocatable registers. rax and rdx are kept for idiv and as scratch registers,
+# rdi and rsi for the printf arguments.
+CALLER_SAVED=('rcx','r8','r9','r10','r11')
+CALLEE_SAVED=('rbx','r12','r13','r14','r15')
+MAX_LOOP_WEIGHT=8
+
+class Interval:
+    __slots__=('vreg','start','end','weight','crosses_call','reg')
+    def __init__(self, vreg, position):
+        self.vreg=vreg; self.start=self.end=position
+        self.weight=0; self.crosses_call=False; self.reg=None
+
+class Allocation:
+    def __init__(self, code, slots, saved, registers, spilled):
+        self.code=code          # instructions on machine registers
+        self.slots=slots        # .bss slots of the spilled virtual registers
+        self.saved=saved        # callee-saved registers to preserve in main
+        self.registers=registers
+        self.spilled=spilled
+
+# --- Control flow and liveness ---
+def basic_blocks(code):
+    """(start, end) ranges of the basic blocks of `code` and the successors of each block."""
+    leaders={0}
+    for i,ins in enumerate(code):
+        if ins.op=='label': leaders.add(i)
+        elif is_jump(ins) or ins.op=='ret': leaders.add(i+1)
+    leaders=sorted(l for l in leaders if l<len(code))
+    blocks=list(zip(leaders,leaders[1:]+[len(code)]))
+    block_of={code[s].args[0]:b for b,(s,e) in enumerate(blocks) if code[s].op=='label'}
+    succ=[]
+    for b,(s,e) in enumerate(blocks):
+        last=code[e-1]; out=[]
+        if is_jump(last): out.append(block_of[last.args[0]])
+        if last.op not in ('jmp','ret') and b+1<len(blocks): out.append(b+1)
+        succ.append(out)
+    return blocks,succ
+
+def liveness(code, blocks, succ):
+    """Virtual registers live on entry to and on exit from each block."""
+    use=[];define=[]
+    for s,e in blocks:
+        u=set();d=set()
+        for ins in code[s:e]:
+            defs,uses=defs_uses(ins)
+            u.update(v for v in uses if v not in d)
+            d.update(defs)
+        use.append(u);define.append(d)
+    live_in=[set() for _ in blocks]; live_out=[set() for _ in blocks]
+    changed=True
+    while changed:
+        changed=False
+        for b in reversed(range(len(blocks))):
+            out=set().union(*(live_in[n] for n in succ[b]))
+            inn=use[b]|(out-define[b])
+            if out!=live_out[b] or inn!=live_in[b]:
+                live_out[b]=out; live_in[b]=inn; changed=True
+    return live_in,live_out
+
+def loop_depths(code):
+    """Loop nesting depth of each instruction, from the backward jumps."""
+    labels={ins.args[0]:i for i,ins in enumerate(code) if ins.op=='label'}
+    depth=[0]*len(code)
+    for j,ins in enumerate(code):
+        if is_jump(ins) and labels[ins.args[0]]<=j:
+            for k in range(labels[ins.args[0]],j+1): depth[k]+=1
+    return depth
+
+def live_intervals(code):
+    """One interval per virtual register, covering every instruction where it is live."""
+    if not code: return [],set()
+    blocks,succ=basic_blocks(code)
+    live_in,live_out=liveness(code,blocks,succ)
+    intervals={}
+    def extend(v,i):
+        iv=intervals.get(v)
+        if iv is None: intervals[v]=Interval(v,i)
+        else: iv.start=min(iv.start,i); iv.end=max(iv.end,i)
+    for b,(s,e) in enumerate(blocks):
+        live=set(live_out[b])
+        for v in live: extend(v,e-1)
+        for i in range(e-1,s-1,-1):
+            ins=code[i]
+            if ins.op=='call':
+                for v in live: intervals[v].crosses_call=True
+            defs,uses=defs_uses(ins)
+            for v in defs: extend(v,i); live.discard(v)
+            for v in uses: extend(v,i); live.add(v)
+        for v in live: extend(v,s)
+    depth=loop_depths(code)
+    for i,ins in enumerate(code):
+        defs,uses=defs_uses(ins)
+        for v in set(defs+uses): intervals[v].weight+=10**min(depth[i],MAX_LOOP_WEIGHT)
+    return list(intervals.values()),live_in[0]
+
+# --- Linear scan ---
+def linear_scan(code, intervals):
+    """Poletto & Sarkar linear scan. Intervals that live across a call only get callee-saved
+    registers; under pressure the interval with the lowest loop-weighted use count is spilled."""
+    by_vreg={iv.vreg:iv for iv in intervals}
+    active=[]
+    free=list(CALLER_SAVED+CALLEE_SAVED)
+    for iv in sorted(intervals,key=lambda iv:(iv.start,iv.end)):
+        for a in [a for a in active if a.end<=iv.start]:
+            active.remove(a); free.append(a.reg)
+        allowed=CALLEE_SAVED if iv.crosses_call else CALLER_SAVED+CALLEE_SAVED
+        choices=[r for r in allowed if r in free]
+        if choices:
+            hint=move_source(code[iv.start],iv.vreg)
+            hint=by_vreg[hint].reg if hint is not None else None
+            iv.reg=hint if hint in choices else choices[0]
+            free.remove(iv.reg); active.append(iv)
+            continue
+        victim=min((a for a in active if a.reg in allowed),key=lambda a:a.weight,default=None)
+        if victim is not None and victim.weight<iv.weight:
+            iv.reg,victim.reg=victim.reg,None
+            active.remove(victim); active.append(iv)
+
+def move_source(ins, vreg):
+    """Source of `mov vreg, source`: giving both the same register makes the move disappear."""
+    if ins.op=='mov' and ins.args[0] is vreg and isinstance(ins.args[1],VReg):
+        return ins.args[1]
+    return None
+
+# --- Rewriting ---
+def legalize(ins, out):
+    """Append `ins` to `out`, going through rax (or rdx) where x86 forbids the operand combination."""
+    op,args=ins.op,ins.args
+    if op=='mov' and str(args[0])==str(args[1]): return
+    if len(args)==2 and op!='lea':
+        dst,src=args
+        big=not isinstance(src,(str,Mem)) and not fits_imm32(src)
+        if op=='movzx' and isinstance(dst,Mem):
+            out.append(Instr('movzx','rax',src)); out.append(Instr('mov',dst,'rax'))
+            return
+        if op=='imul' and isinstance(dst,Mem):
+            out.append(Instr('mov','rax',dst))
+            if big: out.append(Instr('mov','rdx',src)); src='rdx'
+            out.append(Instr('imul','rax',src)); out.append(Instr('mov',dst,'rax'))
+            return
+        if (isinstance(dst,Mem) and isinstance(src,Mem)) or (big and not (op=='mov' and isinstance(dst,str))):
+            out.append(Instr('mov','rax',src)); args[1]='rax'
+    out.append(ins)
+
+def allocate(code, registers=True):
+    """Assign a machine register or a .bss slot to each virtual register of `code`.
+    Without `registers`, every virtual register lives in memory."""
+    intervals,entry_live=live_intervals(code)
+    if registers: linear_scan(code,intervals)
+    location={}
+    slots=[]
+    for iv in sorted(intervals,key=lambda iv:iv.vreg.id):
+        if iv.reg is not None:
+            location[iv.vreg]=iv.reg
+            continue
+        slot=iv.vreg.slot()
+        if slot in slots: slot=f'{slot}_{iv.vreg.id}' # a variable split over several registers
+        location[iv.vreg]=Mem(slot); slots.append(slot)
+    out=[]
+    # Variables read before any assignment are 0, like their .bss slot
+    for v in sorted(entry_live,key=lambda v:v.id):
+        if isinstance(location[v],str): out.append(Instr('mov',location[v],0))
+    for ins in code:
+        legalize(Instr(ins.op,*[location.get(a,a) if isinstance(a,VReg) else a for a in ins.args]),out)
+    used=set(location.values())
+    saved=[r for r in CALLEE_SAVED if r in used]
+    return Allocation(out,sorted(slots),saved,len({r for r in used if isinstance(r,str)}),len(slots))
@@ -0,0 +1,73 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from tourte_compil import BinaryOpNode, iter_child_nodes
+from tourte_exec import Runtime
+from tourte_modules import ModuleLoader
+from tourte_optim import OptimizingLoader
+from tourte_types import is_specialized
+from tourte_vm import VirtualMachine, compile_program
+
+# Un int trop grand pour un float : 2 ** 4096
+BIG_INT = "i = 2; n = 0; while (n < 12) { i = i * i; n = n + 1; };\n"
+
+
+def run(source, engine, loader_class=ModuleLoader):
+    """Sortie du programme, ou message de l'erreur qui l'arrête, et son module analysé."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'programme.tourte')
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(source)
+        loader = loader_class()
+        output = io.StringIO()
+        try:
+            with contextlib.redirect_stdout(output):
+                module = loader.load(path)
+                if engine == 'vm':
+                    VirtualMachine(loader).run(compile_program(module.ast))
+                else:
+                    Runtime(loader).run(module.ast)
+        except Exception as error:
+            return f"Erreur: {error}", None
+        return output.getvalue(), module
+
+
+def binary_nodes(node):
+    if isinstance(node, BinaryOpNode):
+        yield node
+    for child in iter_child_nodes(node):
+        yield from binary_nodes(child)
+
+
+class SpecializedOperationsTest(unittest.TestCase):
+    def test_mixed_int_float_overflow_is_a_tourte_error(self):
+        for expression in ("i + 0.5", "i - 0.5", "i * 0.5", "i // 2.5", "i % 2.5", "0.5 + i", "i + x"):
+            source = BIG_INT + f"x = 0.5; y = {expression}; print(y);\n"
+            expected, _ = run(source, 'vm')
+            self.assertIn("impossible entre", expected)
+            for loader_class in (ModuleLoader, OptimizingLoader):
+                with self.subTest(expression=expression, loader=loader_class.__name__):
+                    self.assertEqual(run(source, 'exec', loader_class)[0], expected)
+
+    def test_mixed_comparison_stays_specialized(self):
+        output, module = run(BIG_INT + "print(i < 0.5, i + 1 > i, 2.5 * 2.0);\n", 'exec')
+        self.assertEqual(output, "False True 5.0\n")
+        specialized = {node.op.value for node in binary_nodes(module.ast) if is_specialized(node)}
+        self.assertTrue({'<', '>', '+', '*'} <= specialized)
+
+
+class OptimizedConstantsTest(unittest.TestCase):
+    def test_negative_zero_keeps_its_sign(self):
+        # Le pliage produit -0.0, égal à 0.0 : la VM ne doit pas les ranger dans le même registre
+        source = "a = 0.0; b = 0.0 * (0 - 1); print(a, b);\n"
+        for engine in ('exec', 'vm'):
+            for loader_class in (ModuleLoader, OptimizingLoader):
+                with self.subTest(engine=engine, loader=loader_class.__name__):
+                    self.assertEqual(run(source, engine, loader_class)[0], "0.0 -0.0\n")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import random
+import unittest
+
+from tourte_compil import Lexer, Parser
+from tourte_incremental import IncrementalDocument
+
+SOURCE = """a = 1;
+b = 2;;
+if (a) {
+    print(a + b);
+};
+
+c = a + b;
+print(c);
+"""
+PIECES = [';', ';;', '\n', '\n\n', ' ', 'x', '1', 'a = 1;', '\nb = 3;\n', 'print(a);',
+          '(', ')', '{', '}', '"', 'if (a) {', '};', '']
+
+
+def full_parse(source):
+    """AST (repr) ou message d'erreur d'une analyse complète de `source`."""
+    try:
+        return repr(Parser(Lexer(source).get_tokens()).parse_program())
+    except Exception as error:
+        return f"Erreur: {error}"
+
+
+def incremental_edit(document, start, end, text):
+    try:
+        return repr(document.edit(start, end, text))
+    except Exception as error:
+        return f"Erreur: {error}"
+
+
+class IncrementalDocumentTest(unittest.TestCase):
+    def test_separators_before_edited_statement(self):
+        document = IncrementalDocument('a = 1;;\nb = 2;\n')
+        self.assertEqual(repr(document.edit(12, 13, '3')), full_parse('a = 1;;\nb = 3;\n'))
+
+    def test_edits_match_full_parse(self):
+        # Modifications aléatoires, surtout autour des séparateurs où les segments se touchent :
+        # l'AST ou la première erreur doit être celui d'une analyse complète
+        for seed in range(150):
+            rng = random.Random(seed)
+            source = SOURCE
+            document = IncrementalDocument(source)
+            for step in range(30):
+                if rng.random() < 0.5:
+                    separators = [i for i, char in enumerate(source) if char in ';\n'] or [0]
+                    start = min(rng.choice(separators) + rng.choice((0, 1)), len(source))
+                else:
+                    start = rng.randint(0, len(source))
+                end = min(len(source), start + rng.choice((0, 0, 1, 2, 5)))
+                text = rng.choice(PIECES)
+                source = source[:start] + text + source[end:]
+                with self.subTest(seed=seed, step=step, source=source):
+                    self.assertEqual(incremental_edit(document, start, end, text), full_parse(source))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,314 @@
+import gc
+import marshal
+import sys
+from array import array
+
+from tourte_compil import (
+    KIND_TYPE_NAMES, Token,
+    AssignmentNode, BinaryOpNode, DictionaryNode, FunctionCallNode, FunctionDeclarationNode,
+    IdentifierNode, IfStatementNode, ImportStatementNode, InputFunctionCallNode, ListNode,
+    NoneNode, NumberNode, PrintStatementNode, ProgramNode, ReturnStatementNode, StringNode,
+    SubscriptNode, TypeConversionNode, UnaryOpNode, WhileStatementNode,
+)
+
+# --- Disposition des champs de chaque classe de nœud ---
+# CHILD : nœud, liste, tuple ou None, encodé comme une ligne de l'arène (-1 pour None)
+# TOKEN : token secondaire, index dans la table des tokens (-1 pour None)
+# VALUE : valeur simple (nom, nombre, chaîne...), index dans la table des valeurs
+CHILD, TOKEN, VALUE = range(3)
+
+_LAYOUTS = {
+    NumberNode: (('value', VALUE),),
+    StringNode: (('value', VALUE),),
+    IdentifierNode: (('name', VALUE), ('depth', VALUE), ('slot', VALUE), ('inferred_type', VALUE)),
+    NoneNode: (('value', VALUE),),
+    BinaryOpNode: (('left', CHILD), ('op', TOKEN), ('right', CHILD), ('operand_types', VALUE),
+                   ('inferred_type', VALUE)),
+    UnaryOpNode: (('op', TOKEN), ('operand', CHILD)),
+    ListNode: (('elements', CHILD),),
+    DictionaryNode: (('pairs', CHILD),),
+    SubscriptNode: (('target', CHILD), ('index_expr', CHILD)),
+    ProgramNode: (('statements', CHILD), ('frame_size', VALUE)),
+    AssignmentNode: (('identifier', CHILD), ('expression', CHILD)),
+    PrintStatementNode: (('expressions', CHILD),),
+    InputFunctionCallNode: (('prompt_expr', CHILD),),
+    TypeConversionNode: (('type_token', TOKEN), ('expression', CHILD)),
+    FunctionCallNode: (('identifier', CHILD), ('arguments', CHILD)),
+    FunctionDeclarationNode: (('identifier', CHILD), ('parameters', CHILD), ('body_statements', CHILD),
+                              ('frame_size', VALUE)),
+    ReturnStatementNode: (('expression', CHILD),),
+    IfStatementNode: (('condition', CHILD), ('if_body', CHILD), ('elif_branches', CHILD), ('else_body', CHILD)),
+    WhileStatementNode: (('condition', CHILD), ('body_statements', CHILD)),
+    ImportStatementNode: (('file_path', VALUE), ('path', VALUE), ('bindings', VALUE)),
+}
+
+NODE_CLASSES = list(_LAYOUTS)
+NODE_KINDS = {node_class: kind for kind, node_class in enumerate(NODE_CLASSES)}
+LIST_KIND = len(NODE_CLASSES) # Pseudo-nœuds : listes et tuples (ex: paires d'un dictionnaire)
+TUPLE_KIND = LIST_KIND + 1
+
+# Version du format de to_bytes(), à changer avec la disposition ou les colonnes
+ARENA_FORMAT = 4
+
+# Les champs CHILD d'une disposition sont exactement les `_fields` de la classe, dans le même ordre
+for _node_class, _layout in _LAYOUTS.items():
+    if tuple(name for name, nature in _layout if nature == CHILD) != _node_class._fields:
+        raise Exception(f"Disposition de l'arène incohérente avec {_node_class.__name__}._fields")
+
+# Position de chaque attribut dans les champs d'une ligne, par sorte de nœud
+_FIELD_POSITIONS = [{name: (position, nature) for position, (name, nature) in enumerate(_LAYOUTS[node_class])}
+                    for node_class in NODE_CLASSES]
+
+
+# --- Arène : l'AST aplati en colonnes typées ---
+class Arena:
+    """AST aplati en colonnes typées : une ligne par nœud, listes et tuples compris.
+
+    Les lignes sont rangées en ordre postfixe (enfants avant parent, racine en dernier) :
+    parcourir range(len(arena)) visite tout l'arbre sans rien allouer. Les champs de la
+    ligne i sont fields[start(i):ends[i]], interprétés selon la disposition de sa classe.
+    Les tokens sont recopiés dans leur propre table (sorte, valeur, position) ; un même
+    token partagé par plusieurs champs n'y figure qu'une fois.
+    """
+    COLUMNS = ('kinds', 'tokens', 'ends', 'fields', 'token_kinds', 'token_values',
+               'token_offsets', 'token_lengths', 'token_lines', 'token_columns')
+
+    def __init__(self):
+        self.kinds = array('B')
+        self.tokens = array('i')
+        self.ends = array('i')
+        self.fields = array('i')
+        self.token_kinds = array('B')
+        self.token_values = array('i')
+        self.token_offsets = array('i')
+        self.token_lengths = array('i')
+        self.token_lines = array('i')
+        self.token_columns = array('i')
+        self.values = []
+        self.value_table = {}
+
+    def __len__(self):
+        return len(self.kinds)
+
+    @property
+    def root(self):
+        return len(self.kinds) - 1
+
+    def start(self, index):
+        return self.ends[index - 1] if index else 0
+
+    def node_count(self):
+        """Nombre de vrais nœuds (hors listes et tuples)."""
+        return sum(1 for kind in self.kinds if kind < LIST_KIND)
+
+    def intern(self, value):
+        key = (type(value), value)
+        index = self.value_table.get(key)
+        if index is None:
+            index = self.value_table[key] = len(self.values)
+            self.values.append(value)
+        return index
+
+    # --- Encodage ---
+    @classmethod
+    def from_ast(cls, root):
+        """Aplatit l'arbre `root` (parcours postfixe avec une pile explicite)."""
+        arena = cls()
+        token_indices = {} # id(token) -> index ; les tokens restent vivants tant que l'AST l'est
+        encoded = [] # Lignes des éléments déjà encodés, en attente de leur parent
+        pending = [(root, None)]
+        while pending:
+            item, children = pending.pop()
+            if item is None:
+                encoded.append(-1)
+                continue
+            if children is None:
+                if isinstance(item, (list, tuple)):
+                    children = item
+                else:
+                    if type(item) not in NODE_KINDS:
+                        raise Exception(f"Classe de nœud inconnue de l'arène: {type(item).__name__}")
+                    children = [getattr(item, name) for name in item._fields]
+                if children:
+                    pending.append((item, children))
+                    pending.extend([(child, None) for child in reversed(children)])
+                    continue
+            # Tous les enfants sont encodés : ce sont les len(children) dernières lignes
+            if children:
+                rows = encoded[-len(children):]
+                del encoded[-len(children):]
+            else:
+                rows = children
+            encoded.append(arena._add_row(item, rows, token_indices))
+        return arena
+
+    def _add_row(self, item, rows, token_indices):
+        if isinstance(item, list):
+            self.kinds.append(LIST_KIND)
+            self.tokens.append(-1)
+            self.fields.extend(rows)
+        elif isinstance(item, tuple):
+            self.kinds.append(TUPLE_KIND)
+            self.tokens.append(-1)
+            self.fields.extend(rows)
+        else:
+            node_class = type(item)
+            fields = self.fields
+            self.kinds.append(NODE_KINDS[node_class])
+            self.tokens.append(self._add_token(item.token, token_indices))
+            child = 0
+            for name, nature in _LAYOUTS[node_class]:
+                if nature == CHILD:
+                    fields.append(rows[child])
+                    child += 1
+                elif nature == TOKEN:
+                    fields.append(self._add_token(getattr(item, name), token_indices))
+                else:
+                    fields.append(self.intern(getattr(item, name)))
+        self.ends.append(len(self.fields))
+        return len(self.kinds) - 1
+
+    def _add_token(self, token, token_indices):
+        if token is None:
+            return -1
+        index = token_indices.get(id(token))
+        if index is None:
+            index = token_indices[id(token)] = len(self.token_kinds)
+            offset = token.offset
+            line = token.line
+            column = token.column
+            self.token_kinds.append(token.kind)
+            self.token_values.append(self.intern(token.value))
+            self.token_offsets.append(-1 if offset is None else offset)
+            self.token_lengths.append(token.length)
+            self.token_lines.append(-1 if line is None else line)
+            self.token_columns.append(-1 if column is None else column)
+        return index
+
+    # --- Décodage ---
+    def token(self, index):
+        """Reconstruit le token d'index `index` de la table (None pour -1)."""
+        if index < 0:
+            return None
+        offset = self.token_offsets[index]
+        line = self.token_lines[index]
+        column = self.token_columns[index]
+        kind = self.token_kinds[index]
+        return Token(KIND_TYPE_NAMES[kind], self.values[self.token_values[index]],
+                     None if line < 0 else line, None if column < 0 else column,
+                     None if offset < 0 else offset, self.token_lengths[index], None, kind)
+
+    def item(self, index):
+        """Vue sur la ligne `index` : ArenaNode pour un nœud, liste ou tuple de vues sinon."""
+        if index < 0:
+            return None
+        kind = self.kinds[index]
+        if kind < LIST_KIND:
+            return ArenaNode(self, index)
+        items = [self.item(row) for row in self.fields[self.start(index):self.ends[index]]]
+        return items if kind == LIST_KIND else tuple(items)
+
+    def to_ast(self):
+        """Reconstruit l'arbre d'objets ; les tokens partagés le redeviennent."""
+        built = [None] * len(self.kinds)
+        tokens = [None] * len(self.token_kinds)
+        fields = self.fields
+        values = self.values
+        def token(index):
+            if index < 0:
+                return None
+            if tokens[index] is None:
+                tokens[index] = self.token(index)
+            return tokens[index]
+
+        # Construction en masse d'objets qui ne forment aucun cycle : le ramasse-miettes
+        # cyclique, déclenché sans cesse par ces allocations, est suspendu le temps du décodage
+        collecting = gc.isenabled()
+        gc.disable()
+        try:
+            start = 0
+            for index, kind in enumerate(self.kinds):
+                end = self.ends[index]
+                if kind >= LIST_KIND:
+                    items = [None if row < 0 else built[row] for row in fields[start:end]]
+                    built[index] = items if kind == LIST_KIND else tuple(items)
+                else:
+                    node_class = NODE_CLASSES[kind]
+                    node = node_class.__new__(node_class)
+                    node.token = token(self.tokens[index])
+                    for (name, nature), row in zip(_LAYOUTS[node_class], fields[start:end]):
+                        if nature == CHILD:
+                            setattr(node, name, None if row < 0 else built[row])
+                        elif nature == TOKEN:
+                            setattr(node, name, token(row))
+                        else:
+                            setattr(node, name, values[row])
+                    built[index] = node
+                start = end
+        finally:
+            if collecting:
+                gc.enable()
+        return built[-1] if built else None
+
+    # --- Sérialisation ---
+    def to_bytes(self):
+        """Encodage binaire compact : colonnes brutes et valeurs, via marshal."""
+        columns = [getattr(self, name).tobytes() for name in self.COLUMNS]
+        return marshal.dumps((ARENA_FORMAT, sys.byteorder, columns, self.values))
+
+    @classmethod
+    def from_bytes(cls, data):
+        format, byteorder, columns, values = marshal.loads(data)
+        if format != ARENA_FORMAT or byteorder != sys.byteorder:
+            raise Exception(f"Format d'arène incompatible: {format} ({byteorder})")
+        arena = cls()
+        for name, column in zip(cls.COLUMNS, columns):
+            getattr(arena, name).frombytes(column)
+        arena.values = values
+        arena.value_table = {(type(value), value): index for index, value in enumerate(values)}
+        return arena
+
+    def memory_size(self):
+        """Taille en octets des colonnes et de la table des valeurs."""
+        columns = [getattr(self, name) for name in self.COLUMNS]
+        return (sum(sys.getsizeof(column) for column in columns) + sys.getsizeof(self.values)
+                + sys.getsizeof(self.value_table) + sum(sys.getsizeof(value) for value in self.values))
+
+
+class ArenaNode:
+    """Vue légère sur un nœud de l'arène, qui expose les mêmes attributs que le nœud d'origine."""
+    __slots__ = ('arena', 'index')
+
+    def __init__(self, arena, index):
+        self.arena = arena
+        self.index = index
+
+    @property
+    def node_class(self):
+        return NODE_CLASSES[self.arena.kinds[self.index]]
+
+    @property
+    def token(self):
+        return self.arena.token(self.arena.tokens[self.index])
+
+    def __getattr__(self, name):
+        arena = self.arena
+        field = _FIELD_POSITIONS[arena.kinds[self.index]].get(name)
+        if field is None:
+            raise AttributeError(f"'{self.node_class.__name__}' n'a pas d'attribut '{name}'")
+        position, nature = field
+        row = arena.fields[arena.start(self.index) + position]
+        if nature == CHILD:
+            return arena.item(row)
+        if nature == TOKEN:
+            return arena.token(row)
+        return arena.values[row]
+
+    def __eq__(self, other):
+        return isinstance(other, ArenaNode) and other.arena is self.arena and other.index == self.index
+
+    def __hash__(self):
+        return hash((id(self.arena), self.index))
+
+    def __repr__(self):
+        return f"ArenaNode({self.node_class.__name__}, {self.index})"
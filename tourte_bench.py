@@ -0,0 +1,559 @@
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from tourte_compil import ASTNode, IdentifierNode, Lexer, NodeVisitor, Parser, SemanticAnalyzer, lex_file
+from tourte_arena import Arena
+from tourte_build import ParallelBuilder
+from tourte_cache import compile_file
+from tourte_cli import check
+from tourte_exec import BINARY_OPERATORS, CONVERSIONS, ClosureCompiler, Function, Runtime, format_value
+from tourte_incremental import IncrementalDocument
+from tourte_modules import ModuleLoader
+from tourte_optim import Optimizer
+from tourte_pyback import compile_program as compile_python
+from tourte_stats import Stats
+from tourte_types import TypeInference
+from tourte_vm import Program, VirtualMachine, compile_program
+
+# --- Génération de sources Tourte synthétiques ---
+def generate_source(statements=20000):
+    lines = []
+    for i in range(statements):
+        lines.append(f"variable_{i} = {i} * (compteur + 3) // 2; # commentaire {i}")
+        lines.append(f'print("Valeur:", variable_{i}, [1, 2.5, "abc"]);')
+    return "\n".join(lines) + "\n"
+
+def generate_expression_source(statements=20000):
+    lines = []
+    for i in range(statements):
+        lines.append(f"resultat = (a + {i}) * b - c // 2 ** d + e % 7 /// 3 - (f * g + h) / (i - j + k);")
+        lines.append(f"test = a < {i} and b >= c or not d == e and f not in g or h in i and j != k;")
+    return "\n".join(lines) + "\n"
+
+def best_of(function, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def peak_memory(function):
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def retained_memory(function):
+    """Octets encore alloués après l'appel, tant que son résultat est vivant."""
+    tracemalloc.start()
+    try:
+        result = function()
+        return tracemalloc.get_traced_memory()[0], result
+    finally:
+        tracemalloc.stop()
+
+# --- Bancs d'essai ---
+def bench_lexer(statements):
+    source = generate_source(statements)
+    reference = best_of(lambda: Lexer(source, fast=False).get_tokens())
+    fast = best_of(lambda: Lexer(source).get_tokens())
+    print(f"Lexer ({len(source) / 1e6:.2f} Mo) : caractère par caractère {reference:.3f} s, "
+          f"regex maîtresse {fast:.3f} s (x{reference / fast:.1f})")
+
+def bench_stream(statements):
+    with tempfile.NamedTemporaryFile('w', suffix='.tourte', delete=False, encoding='utf-8') as source_file:
+        source_file.write(generate_source(statements))
+    try:
+        def whole():
+            with open(source_file.name, encoding='utf-8') as f:
+                Lexer(f.read()).get_tokens()
+        def streamed():
+            for _ in lex_file(source_file.name, chunk_size=1 << 16):
+                pass
+        size = os.path.getsize(source_file.name)
+        print(f"Mémoire max ({size / 1e6:.2f} Mo) : liste complète {peak_memory(whole) / 1e6:.1f} Mo, "
+              f"lex_file {peak_memory(streamed) / 1e6:.2f} Mo")
+    finally:
+        os.remove(source_file.name)
+
+def bench_tokens(statements):
+    source = generate_source(statements)
+    count = len(Lexer(source).get_tokens())
+    as_objects = peak_memory(lambda: Lexer(source).get_tokens())
+    as_columns = peak_memory(lambda: Lexer(source).get_token_buffer())
+    print(f"Stockage de {count} tokens : objets Token {as_objects / count:.0f} o/token, "
+          f"TokenBuffer {as_columns / count:.0f} o/token ({as_objects / as_columns:.1f}x moins)")
+
+def bench_incremental(statements):
+    source = generate_source(statements)
+    full = best_of(lambda: Parser(Lexer(source).get_tokens()).parse_program())
+    document = IncrementalDocument(source)
+    target = f"variable_{statements // 2} = "
+    position = source.index(target) + len(target)
+    edits = 200
+    start = time.perf_counter()
+    for i in range(edits):
+        # Frappe puis effacement d'un caractère au milieu du fichier
+        document.edit(position, position, "1")
+        document.edit(position, position + 1, "")
+    per_edit = (time.perf_counter() - start) / (2 * edits)
+    print(f"Ré-analyse ({len(source) / 1e6:.2f} Mo) : complète {full * 1e3:.1f} ms, "
+          f"incrémentale {per_edit * 1e3:.2f} ms par modification "
+          f"({document.relexed_characters} caractères relus, {document.reparsed_statements} instruction(s))")
+
+def bench_parser(statements):
+    source = generate_expression_source(statements)
+    # Le parser modifie certains tokens ('not' suivi de 'in') : une liste neuve par essai
+    runs = [Lexer(source).get_tokens() for _ in range(3)]
+    tokens = runs[0]
+    elapsed = best_of(lambda: Parser(runs.pop()).parse_program())
+    print(f"Parser ({len(tokens)} tokens, expressions) : {elapsed:.3f} s, {len(tokens) / elapsed / 1e6:.2f} Mtokens/s")
+
+def bench_nesting(statements):
+    depth = statements
+    source = "a = 1;\n" + "if (a) {\n" * depth + "x = ((((a + 1))));\n" + "};\n" * depth
+    start = time.perf_counter()
+    ast = Parser(Lexer(source).get_tokens()).parse_program()
+    SemanticAnalyzer().visit(ast)
+    print(f"Imbrication de {depth} blocs 'if' : analyse complète en {time.perf_counter() - start:.2f} s "
+          f"(limite de récursion {sys.getrecursionlimit()})")
+
+def bench_ast(statements):
+    source = generate_source(statements)
+    as_objects, ast = retained_memory(lambda: Parser(Lexer(source).get_tokens()).parse_program())
+    arena = Arena.from_ast(ast)
+    nodes = arena.node_count()
+    print(f"AST de {nodes} nœuds (tokens compris) : objets {as_objects / nodes:.0f} o/nœud, "
+          f"arène {arena.memory_size() / nodes:.0f} o/nœud ({as_objects / arena.memory_size():.1f}x moins)")
+
+def bench_cache(statements):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'programme.tourte')
+        with open(path, 'w', encoding='utf-8') as source_file:
+            source_file.write("compteur = 0;\n" + generate_source(statements))
+        uncached = best_of(lambda: compile_file(path, use_cache=False), repeat=1)
+        start = time.perf_counter()
+        compile_file(path) # Remplit le cache
+        cold = time.perf_counter() - start
+        warm = best_of(lambda: compile_file(path))
+        print(f"Compilation ({os.path.getsize(path) / 1e6:.2f} Mo) : sans cache {uncached:.2f} s, "
+              f"premier passage {cold:.2f} s, depuis le cache {warm:.2f} s (x{uncached / warm:.1f})")
+
+class DirWalker:
+    """Référence : répartition par nom construit et enfants trouvés par dir(), comme l'ancien generic_visit."""
+    def walk(self, root):
+        pending = [root]
+        while pending:
+            node = pending.pop()
+            getattr(self, 'visit_' + node.__class__.__name__, None)
+            for attr_name in dir(node):
+                if not attr_name.startswith('__') and not callable(getattr(node, attr_name)):
+                    attr = getattr(node, attr_name)
+                    if isinstance(attr, ASTNode):
+                        pending.append(attr)
+                    elif isinstance(attr, list):
+                        for item in attr:
+                            if isinstance(item, ASTNode):
+                                pending.append(item)
+                            elif isinstance(item, tuple) and all(isinstance(elem, ASTNode) for elem in item):
+                                pending.extend(item)
+
+class GenericWalker(NodeVisitor):
+    pass
+
+def bench_visitor(statements):
+    ast = Parser(Lexer("compteur = 0;\n" + generate_source(statements)).get_tokens()).parse_program()
+    by_dir = best_of(lambda: DirWalker().walk(ast))
+    by_fields = best_of(lambda: GenericWalker().visit(ast))
+    analysis = best_of(lambda: SemanticAnalyzer().visit(ast))
+    print(f"Parcours générique de l'AST : dir() {by_dir:.2f} s, _fields {by_fields:.2f} s (x{by_dir / by_fields:.1f}) ; "
+          f"analyse sémantique {analysis:.2f} s")
+
+def bench_modules(statements):
+    modules = 50
+    with tempfile.TemporaryDirectory() as directory:
+        def write(name, text):
+            with open(os.path.join(directory, name), 'w', encoding='utf-8') as module_file:
+                module_file.write(text)
+        # Une grosse bibliothèque partagée, importée par tous les modules du programme
+        write('bibliotheque.tourte', "".join(f"func outil_{i}(x) {{ return x * {i} + 1; }};\n"
+                                             for i in range(statements // 10)))
+        for i in range(modules):
+            write(f'module_{i}.tourte', f'import "bibliotheque";\nfunc tache_{i}(x) {{ return outil_{i}(x); }};\n')
+        write('principal.tourte', "".join(f'import "module_{i}";\n' for i in range(modules)) + 'print(tache_0(1));\n')
+        loader = ModuleLoader()
+        start = time.perf_counter()
+        loader.load(os.path.join(directory, 'principal.tourte'))
+        elapsed = time.perf_counter() - start
+        print(f"Programme de {modules + 2} fichiers : chargé en {elapsed:.2f} s, {loader.parsed_files} fichiers parsés "
+              f"(bibliothèque parsée une fois pour {modules} imports)")
+
+def bench_build(statements):
+    modules = 16
+    with tempfile.TemporaryDirectory() as directory:
+        for i in range(modules):
+            with open(os.path.join(directory, f'module_{i}.tourte'), 'w', encoding='utf-8') as module_file:
+                module_file.write(f"func tache_{i}(compteur) {{ return compteur; }};\ncompteur = 0;\n"
+                                  + generate_source(statements // modules))
+        with open(os.path.join(directory, 'principal.tourte'), 'w', encoding='utf-8') as main_file:
+            main_file.write("".join(f'import "module_{i}";\n' for i in range(modules)) + 'print(tache_0(1));\n')
+        main = os.path.join(directory, 'principal.tourte')
+        serial = best_of(lambda: ModuleLoader().load(main), repeat=1)
+        workers = max(2, os.cpu_count() or 1)
+        parallel = best_of(lambda: ParallelBuilder(workers=workers).build(main), repeat=1)
+        print(f"Construction de {modules + 1} fichiers ({os.cpu_count()} cœur(s)) : en série {serial:.2f} s, "
+              f"{workers} processus {parallel:.2f} s (x{serial / parallel:.1f})")
+
+CLI_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tourte_cli.py')
+
+def bench_check(statements):
+    files = 400
+    with tempfile.TemporaryDirectory() as directory:
+        for i in range(files):
+            with open(os.path.join(directory, f'script_{i}.tourte'), 'w', encoding='utf-8') as script:
+                script.write("compteur = 1;\n" + generate_source(statements // files))
+        # Le premier passage en série compte le lancement d'un interpréteur Python par fichier
+        per_process = best_of(lambda: [subprocess.run([sys.executable, CLI_SCRIPT, 'check',
+                                                       os.path.join(directory, f'script_{i}.tourte')],
+                                                      capture_output=True) for i in range(20)], repeat=1) * files / 20
+        serial = best_of(lambda: check([directory], 1, io.StringIO(), io.StringIO()), repeat=1)
+        workers = max(2, os.cpu_count() or 1)
+        parallel = best_of(lambda: check([directory], workers, io.StringIO(), io.StringIO()), repeat=1)
+        print(f"Vérification de {files} fichiers ({os.cpu_count()} cœur(s)) : un processus par fichier {per_process:.2f} s "
+              f"(extrapolé), en série {serial:.2f} s, {workers} processus {parallel:.2f} s")
+
+def bench_stats(statements):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'programme.tourte')
+        with open(path, 'w', encoding='utf-8') as source_file:
+            source_file.write("compteur = 1;\n" + generate_source(statements))
+        plain = best_of(lambda: ModuleLoader().load(path), repeat=1)
+        stats = Stats()
+        measured = best_of(lambda: ModuleLoader(stats=stats).load(path), repeat=1)
+        traced = best_of(lambda: ModuleLoader(stats=Stats(memory=True)).load(path), repeat=1)
+        phases = stats.report()['phases']
+        print(f"Instrumentation ({phases['lex']['tokens_per_second']} tokens/s, "
+              f"{phases['parse']['nodes_per_second']} nœuds/s, {phases['analyze']['lookups']} recherches) : "
+              f"sans mesures {plain:.2f} s, avec --stats {measured:.2f} s, avec tracemalloc {traced:.2f} s")
+
+class ReturnValue(Exception):
+    pass
+
+class TreeWalker:
+    """Référence : interprète qui parcourt l'AST à chaque évaluation, répartition par nom de classe."""
+    def run(self, ast):
+        frame = [None] * (ast.frame_size + 1)
+        self.execute_block(ast.statements, frame)
+        return frame
+
+    def execute_block(self, statements, frame):
+        for statement in statements:
+            self.evaluate(statement, frame)
+
+    def evaluate(self, node, frame):
+        return getattr(self, 'eval_' + node.__class__.__name__)(node, frame)
+
+    def frame_of(self, identifier, frame):
+        for _ in range(identifier.depth):
+            frame = frame[0]
+        return frame
+
+    def eval_NumberNode(self, node, frame):
+        return node.value
+
+    eval_StringNode = eval_NumberNode
+
+    def eval_NoneNode(self, node, frame):
+        return None
+
+    def eval_IdentifierNode(self, node, frame):
+        return self.frame_of(node, frame)[node.slot + 1]
+
+    def eval_AssignmentNode(self, node, frame):
+        value = self.evaluate(node.expression, frame)
+        target = node.identifier
+        if isinstance(target, IdentifierNode):
+            self.frame_of(target, frame)[target.slot + 1] = value
+        else:
+            self.evaluate(target.target, frame)[self.evaluate(target.index_expr, frame)] = value
+
+    def eval_BinaryOpNode(self, node, frame):
+        symbol = node.op.value
+        left = self.evaluate(node.left, frame)
+        if symbol == 'and':
+            return left and self.evaluate(node.right, frame)
+        if symbol == 'or':
+            return left or self.evaluate(node.right, frame)
+        right = self.evaluate(node.right, frame)
+        if symbol == 'in':
+            return left in right
+        if symbol == 'not in':
+            return left not in right
+        return BINARY_OPERATORS[symbol](left, right)
+
+    def eval_UnaryOpNode(self, node, frame):
+        return not self.evaluate(node.operand, frame)
+
+    def eval_ListNode(self, node, frame):
+        return [self.evaluate(element, frame) for element in node.elements]
+
+    def eval_DictionaryNode(self, node, frame):
+        return {self.evaluate(key, frame): self.evaluate(value, frame) for key, value in node.pairs}
+
+    def eval_SubscriptNode(self, node, frame):
+        return self.evaluate(node.target, frame)[self.evaluate(node.index_expr, frame)]
+
+    def eval_PrintStatementNode(self, node, frame):
+        print(*[format_value(self.evaluate(expression, frame)) for expression in node.expressions])
+
+    def eval_InputFunctionCallNode(self, node, frame):
+        return input(format_value(self.evaluate(node.prompt_expr, frame)))
+
+    def eval_TypeConversionNode(self, node, frame):
+        return CONVERSIONS[node.type_token.value](self.evaluate(node.expression, frame))
+
+    def eval_FunctionDeclarationNode(self, node, frame):
+        locals = [None] * (node.frame_size - len(node.parameters))
+        frame[node.identifier.slot + 1] = Function(node.identifier.name, locals, node, frame)
+
+    def eval_FunctionCallNode(self, node, frame):
+        function = self.eval_IdentifierNode(node.identifier, frame)
+        callee_frame = [function.frame] + [self.evaluate(argument, frame) for argument in node.arguments] + function.locals
+        try:
+            self.execute_block(function.body.body_statements, callee_frame)
+        except ReturnValue as result:
+            return result.args[0]
+
+    def eval_ReturnStatementNode(self, node, frame):
+        raise ReturnValue(self.evaluate(node.expression, frame) if node.expression else None)
+
+    def eval_IfStatementNode(self, node, frame):
+        if self.evaluate(node.condition, frame):
+            return self.execute_block(node.if_body, frame)
+        for condition, body in node.elif_branches:
+            if self.evaluate(condition, frame):
+                return self.execute_block(body, frame)
+        if node.else_body:
+            self.execute_block(node.else_body, frame)
+
+    def eval_WhileStatementNode(self, node, frame):
+        while self.evaluate(node.condition, frame):
+            self.execute_block(node.body_statements, frame)
+
+EXECUTION_SOURCE = """
+func fib(n) {
+    if (n < 2) { return n; };
+    return fib(n - 1) + fib(n - 2);
+};
+func crible(limite) {
+    premiers = [];
+    compte = 0;
+    n = 2;
+    while (n < limite) {
+        est_premier = 1;
+        k = 0;
+        while (k < compte and est_premier) {
+            p = premiers[k];
+            if (p * p > n) { k = compte; } elif (n % p == 0) { est_premier = 0; };
+            k = k + 1;
+        };
+        if (est_premier) { premiers = premiers + [n]; compte = compte + 1; };
+        n = n + 1;
+    };
+    return compte;
+};
+resultat = [fib(20), crible(20000)];
+"""
+
+def bench_exec(statements):
+    ast = Parser(Lexer(EXECUTION_SOURCE).get_tokens()).parse_program()
+    SemanticAnalyzer().analyze(ast, verbose=False)
+    reference = best_of(lambda: TreeWalker().run(ast), repeat=1)
+    compiled = best_of(lambda: Runtime().run(ast), repeat=1)
+    frame = Runtime().run(ast)
+    assert TreeWalker().run(ast)[-1] == frame[-1]
+    print(f"Exécution (fib(20), crible jusqu'à 20000 -> {frame[-1]}) : parcours de l'AST {reference:.2f} s, "
+          f"fermetures compilées {compiled:.2f} s (x{reference / compiled:.1f})")
+
+LOOP_SOURCE = """
+total = 0;
+i = 0;
+while (i < 300000) {
+    if (i % 3 == 0) { total = total + i; } elif (i % 5 == 0) { total = total - 1; };
+    i = i + 1;
+};
+limite = 200000;
+crible = [1] * limite;
+premiers = 0;
+n = 2;
+while (n < limite) {
+    if (crible[n]) {
+        premiers = premiers + 1;
+        m = n * n;
+        while (m < limite) { crible[m] = 0; m = m + n; };
+    };
+    n = n + 1;
+};
+"""
+
+def bench_vm(statements):
+    ast = Parser(Lexer(LOOP_SOURCE).get_tokens()).parse_program()
+    SemanticAnalyzer().analyze(ast, verbose=False)
+    program = compile_program(ast)
+    closures = best_of(lambda: Runtime().run(ast), repeat=1)
+    bytecode = best_of(lambda: VirtualMachine().run(program), repeat=1)
+    counting = VirtualMachine(count=True)
+    counted = best_of(lambda: counting.run(program), repeat=1)
+    assert Runtime().run(ast)[1:7] == VirtualMachine().run(Program.from_bytes(program.to_bytes()))[1:7]
+    instructions = sum(len(unit.code) // 4 for unit in program.codes)
+    executed = sum(counting.counts)
+    print(f"Boucles while ({instructions} instructions, {len(program.to_bytes())} octets sérialisés) : "
+          f"fermetures {closures:.2f} s, bytecode {bytecode:.2f} s (x{closures / bytecode:.1f}), "
+          f"avec compteurs {counted:.2f} s ({executed / bytecode / 1e6:.1f} M instructions/s)")
+
+def captured_output(function):
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        function()
+    return output.getvalue()
+
+def bench_pyback(statements):
+    programs = (("fib(20) + crible", EXECUTION_SOURCE + "print(resultat);"),
+                ("boucles while", LOOP_SOURCE + "print(total, premiers);"))
+    for label, source in programs:
+        ast = Parser(Lexer(source).get_tokens()).parse_program()
+        SemanticAnalyzer().analyze(ast, verbose=False)
+        program = compile_program(ast)
+        translation = best_of(lambda: compile_python(ast), repeat=1)
+        code = compile_python(ast)
+        def run_python():
+            namespace = {}
+            exec(code, namespace)
+            namespace['main']()
+        outputs = {captured_output(lambda: Runtime().run(ast)), captured_output(lambda: VirtualMachine().run(program)),
+                   captured_output(run_python)}
+        assert len(outputs) == 1, outputs
+        closures = best_of(lambda: captured_output(lambda: Runtime().run(ast)), repeat=1)
+        bytecode = best_of(lambda: captured_output(lambda: VirtualMachine().run(program)), repeat=1)
+        python = best_of(lambda: captured_output(run_python), repeat=1)
+        print(f"Backend Python ({label}, traduction {translation * 1000:.1f} ms) : fermetures {closures:.2f} s, "
+              f"bytecode {bytecode:.2f} s, code Python {python:.2f} s (x{closures / python:.1f} / x{bytecode / python:.1f})")
+
+CONSTANT_SOURCE = """
+trace = 0;
+taille = 2 ** 10;
+pas = 64 /// 3;
+total = 0;
+i = 0;
+while (i < 200000) {
+    if (trace) { print("i =", i); } elif (taille > 1000) { total = total + i % taille * (3 * 4 + 1) - pas; };
+    i = i + 1;
+};
+print(total);
+"""
+
+def bench_optim(statements):
+    ast = Parser(Lexer(CONSTANT_SOURCE).get_tokens()).parse_program()
+    SemanticAnalyzer().analyze(ast, verbose=False)
+    optimized = Parser(Lexer(CONSTANT_SOURCE).get_tokens()).parse_program()
+    SemanticAnalyzer().analyze(optimized, verbose=False)
+    optimizer = Optimizer()
+    duration = best_of(lambda: optimizer.optimize(optimized), repeat=1)
+    assert captured_output(lambda: Runtime().run(ast)) == captured_output(lambda: Runtime().run(optimized))
+    plain = best_of(lambda: captured_output(lambda: Runtime().run(ast)), repeat=1)
+    faster = best_of(lambda: captured_output(lambda: Runtime().run(optimized)), repeat=1)
+    plain_vm = best_of(lambda: captured_output(lambda: VirtualMachine().run(compile_program(ast))), repeat=1)
+    faster_vm = best_of(lambda: captured_output(lambda: VirtualMachine().run(compile_program(optimized))), repeat=1)
+    print(f"Optimisation de l'AST ({optimizer.removed} nœuds supprimés en {duration * 1000:.2f} ms) : "
+          f"fermetures {plain:.2f} s -> {faster:.2f} s, bytecode {plain_vm:.2f} s -> {faster_vm:.2f} s")
+
+def bench_types(statements):
+    for label, source in (("fib(20) + crible", EXECUTION_SOURCE), ("boucles while", LOOP_SOURCE)):
+        generic = Parser(Lexer(source).get_tokens()).parse_program()
+        SemanticAnalyzer().analyze(generic, verbose=False)
+        typed = Parser(Lexer(source).get_tokens()).parse_program()
+        SemanticAnalyzer().analyze(typed, verbose=False)
+        inference = TypeInference()
+        duration = best_of(lambda: inference.infer(typed), repeat=1)
+        plain = best_of(ClosureCompiler().compile(generic), repeat=1) # Sans inférence : aucune annotation
+        specialized = best_of(ClosureCompiler().compile(typed), repeat=1)
+        print(f"Inférence de types ({label}, {duration * 1000:.2f} ms) : {inference.specialized}/{inference.operations} "
+              f"opérations spécialisées, {inference.typed_reads}/{len(inference.reads)} lectures typées ; "
+              f"fermetures {plain:.2f} s -> {specialized:.2f} s")
+
+# Le compilateur natif (Tourte source/) a son propre ast.py : il tourne dans un autre processus
+NATIVE_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Tourte source')
+
+NATIVE_LOOPS = """n = 2000;
+s = 0;
+t = 1;
+while (n) {
+    k = 5;
+    while (k) {
+        s = s + n * k % 7;
+        k = k - 1;
+    }
+    t = t + s - n * 3;
+    n = n - 1;
+}
+print(s);
+print(t);
+"""
+
+def native_counts(source, *options):
+    """Compteurs du simulateur asmsim pour le programme natif compilé avec `options`."""
+    output = source[:-2] + '.asm'
+    subprocess.run([sys.executable, 'compiler.py', source, '-o', output, *options],
+                   cwd=NATIVE_DIRECTORY, check=True, capture_output=True)
+    result = subprocess.run([sys.executable, 'asmsim.py', output], cwd=NATIVE_DIRECTORY,
+                            check=True, capture_output=True, text=True)
+    return result.stdout, result.stderr.strip()
+
+def bench_native(statements):
+    with tempfile.TemporaryDirectory() as directory:
+        source = os.path.join(directory, 'loops.t')
+        with open(source, 'w') as file:
+            file.write(NATIVE_LOOPS)
+        results = {level: native_counts(source, level) for level in ('-O0', '-O1', '-O2')}
+    outputs = {output for output, _ in results.values()}
+    assert len(outputs) == 1
+    print("Backend natif (boucles, simulées) :")
+    for level, (_, counts) in results.items():
+        print(f"  {level} : {counts}")
+
+BENCHMARKS = {
+    'lexer': bench_lexer,
+    'stream': bench_stream,
+    'tokens': bench_tokens,
+    'parser': bench_parser,
+    'ast': bench_ast,
+    'cache': bench_cache,
+    'visitor': bench_visitor,
+    'modules': bench_modules,
+    'build': bench_build,
+    'check': bench_check,
+    'stats': bench_stats,
+    'incremental': bench_incremental,
+    'nesting': bench_nesting,
+    'exec': bench_exec,
+    'vm': bench_vm,
+    'pyback': bench_pyback,
+    'optim': bench_optim,
+    'types': bench_types,
+    'native': bench_native,
+}
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        BENCHMARKS[name](20000)
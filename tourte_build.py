@@ -0,0 +1,89 @@
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from tourte_arena import Arena
+from tourte_modules import ModuleLoader, find_imports, parse_module
+
+# --- Tâche exécutée dans les processus de travail ---
+def parse_to_bytes(path):
+    """Lit et parse un fichier ; renvoie (état du fichier, arène sérialisée, imports, erreur).
+
+    L'AST voyage sous forme d'arène (Arena.to_bytes) plutôt que d'objets picklés ; en cas
+    d'échec seul le message d'erreur revient, identique à celui d'un chargement en série.
+    """
+    try:
+        ast, stamp = parse_module(path)
+    except Exception as error:
+        return None, None, [], str(error)
+    return stamp, Arena.from_ast(ast).to_bytes(), [node.file_path for node in find_imports(ast)], None
+
+
+# --- Construction parallèle ---
+class ParallelBuilder(ModuleLoader):
+    """ModuleLoader dont les fichiers sont lexés et parsés en parallèle dans un ProcessPoolExecutor.
+
+    build() découvre le graphe des imports au fil des résultats : chaque fichier parsé révèle
+    ses imports, aussitôt soumis aux processus libres. Les ASTs reçus sont décodés pendant que
+    les autres fichiers se parsent. Vient ensuite le chargement en série de ModuleLoader.load,
+    qui puise dans ces résultats au lieu de parser : résolution des symboles entre modules,
+    ordre d'analyse et erreurs (parsing, cycle, analyse) sont donc exactement ceux d'un
+    chargement en série.
+    """
+    def __init__(self, search_paths=(), workers=None):
+        super().__init__(search_paths)
+        self.workers = workers
+        self.prepared = {} # Chemin -> (AST ou None, état du fichier, erreur)
+
+    def build(self, path):
+        root = os.path.abspath(path)
+        if root not in self.modules and (self.workers or os.cpu_count() or 1) > 1:
+            self.prefetch(root) # Avec un seul processus, le pool ne ferait qu'ajouter la sérialisation
+        return self.load(root)
+
+    def prefetch(self, root):
+        with ProcessPoolExecutor(self.workers) as pool:
+            submitted = {root} | set(self.modules)
+            futures = {pool.submit(parse_to_bytes, root): root}
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path = futures.pop(future)
+                    stamp, data, imports, error = future.result()
+                    for name in imports:
+                        try:
+                            dependency = self.resolve(name, path)
+                        except Exception:
+                            continue # Signalé par le chargement en série, à sa place dans l'ordre
+                        if dependency not in submitted:
+                            submitted.add(dependency)
+                            futures[pool.submit(parse_to_bytes, dependency)] = dependency
+                    ast = Arena.from_bytes(data).to_ast() if error is None else None
+                    self.prepared[path] = (ast, stamp, error)
+
+    def parse(self, path):
+        prepared = self.prepared.pop(path, None)
+        if prepared is None:
+            return super().parse(path)
+        self.parsed_files += 1
+        ast, stamp, error = prepared
+        if error is not None:
+            raise Exception(error)
+        return ast, stamp
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python tourte_build.py <programme.tourte> [processus]")
+        sys.exit(2)
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    builder = ParallelBuilder(workers=workers)
+    start = time.perf_counter()
+    try:
+        builder.build(sys.argv[1])
+    except Exception as e:
+        print(e)
+        sys.exit(1)
+    print(f"{len(builder.order)} module(s) analysé(s) en {time.perf_counter() - start:.2f} s "
+          f"({workers or os.cpu_count()} processus)")
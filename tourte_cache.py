@@ -0,0 +1,125 @@
+import codecs
+import hashlib
+import io
+import os
+import sys
+import tempfile
+import zlib
+
+import tourte_arena
+import tourte_compil
+from tourte_arena import Arena
+from tourte_compil import Lexer, Parser, SemanticAnalyzer
+from tourte_modules import ModuleLoader, find_imports
+
+# --- Cache disque des AST analysés (comme __pycache__) ---
+CACHE_DIRECTORY = '__tourtecache__'
+CACHE_SUFFIX = '.tast'
+CACHE_MAGIC = b'TAST'
+
+_compiler_version = None
+
+def compiler_version():
+    """Empreinte du compilateur : contenu de ses modules et version de Python.
+
+    Toute modification du lexer, du parser, de l'analyseur ou de l'arène invalide
+    donc le cache sans qu'il faille penser à changer un numéro de version.
+    """
+    global _compiler_version
+    if _compiler_version is None:
+        digest = hashlib.sha256()
+        for module in (tourte_compil, tourte_arena):
+            with open(module.__file__, 'rb') as module_file:
+                digest.update(module_file.read())
+        digest.update(sys.version.encode())
+        digest.update(str(tourte_arena.ARENA_FORMAT).encode())
+        _compiler_version = digest.digest()
+    return _compiler_version
+
+def cache_key(data):
+    """Clé d'un source (octets bruts) : hash du contenu et de la version du compilateur."""
+    return hashlib.sha256(compiler_version() + data).digest()
+
+def cache_path(path):
+    directory, name = os.path.split(os.path.abspath(path))
+    return os.path.join(directory, CACHE_DIRECTORY, name + CACHE_SUFFIX)
+
+def load_cached(path, key):
+    """AST en cache pour `path` s'il correspond à `key`, None sinon (absent, périmé ou illisible).
+
+    Une entrée est : CACHE_MAGIC, la clé, le CRC32 du contenu, puis l'arène sérialisée.
+    """
+    try:
+        with open(cache_path(path), 'rb') as cache_file:
+            data = cache_file.read()
+    except OSError:
+        return None
+    header = CACHE_MAGIC + key
+    if not data.startswith(header):
+        return None
+    checksum = data[len(header):len(header) + 4]
+    payload = data[len(header) + 4:]
+    if zlib.crc32(payload).to_bytes(4, 'little') != checksum:
+        return None # Entrée abîmée sur le disque
+    try:
+        return Arena.from_bytes(payload).to_ast()
+    except Exception:
+        return None # Entrée corrompue ou d'un autre format : elle sera réécrite
+
+def store_cached(path, key, ast):
+    """Écrit l'entrée de cache de `path` de façon atomique.
+
+    L'entrée est écrite dans un fichier temporaire du même dossier puis mise en place par
+    os.replace : un lecteur voit l'ancienne entrée ou la nouvelle, jamais un fichier partiel,
+    et le dernier de plusieurs processus concurrents l'emporte. Un cache impossible à écrire
+    (dossier en lecture seule...) est simplement ignoré.
+    """
+    target = cache_path(path)
+    try:
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        descriptor, temporary = tempfile.mkstemp(dir=os.path.dirname(target), prefix='.', suffix='.tmp')
+    except OSError:
+        return False
+    try:
+        with os.fdopen(descriptor, 'wb') as cache_file:
+            payload = Arena.from_ast(ast).to_bytes()
+            cache_file.write(CACHE_MAGIC + key + zlib.crc32(payload).to_bytes(4, 'little'))
+            cache_file.write(payload)
+        os.chmod(temporary, os.stat(path).st_mode & 0o666) # mkstemp crée le fichier en 0600
+        os.replace(temporary, target)
+        return True
+    except OSError:
+        try:
+            os.remove(temporary)
+        except OSError:
+            pass
+        return False
+
+def decode_source(data):
+    """Décode comme read_source_chunks : UTF-8 et fins de ligne universelles."""
+    decoder = io.IncrementalNewlineDecoder(codecs.getincrementaldecoder('utf-8')(), translate=True)
+    return decoder.decode(data, final=True)
+
+def compile_file(path, use_cache=True):
+    """Lexe, parse et analyse un fichier Tourte, ou recharge son AST depuis le cache.
+
+    Renvoie (ast, depuis_le_cache). Seuls les programmes analysés sans erreur et sans import
+    sont mis en cache ; les imports sont chargés avec un ModuleLoader.
+    """
+    with open(path, 'rb') as source_file:
+        data = source_file.read()
+    key = cache_key(data)
+    if use_cache:
+        ast = load_cached(path, key)
+        if ast is not None:
+            return ast, True
+
+    ast = Parser(Lexer(decode_source(data)).get_tokens()).parse_program()
+    if find_imports(ast):
+        # L'analyse dépend alors des fichiers importés, que la clé ne couvre pas : pas de cache
+        ModuleLoader().load(path, ast)
+        return ast, False
+    SemanticAnalyzer().analyze(ast, verbose=False)
+    if use_cache:
+        store_cached(path, key, ast)
+    return ast, False
@@ -0,0 +1,159 @@
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from tourte_modules import MODULE_EXTENSION, ModuleLoader
+from tourte_stats import Stats
+
+# Début des erreurs Tourte situées : "Erreur de syntaxe à L3 C5: ..."
+POSITIONED_ERROR = re.compile(r"(Erreur [^\n]*?) à L(\S+) C(\S+): (.*)")
+
+PHASES = {'Erreur lexicale': 'lexer', 'Erreur de syntaxe': 'parser', 'Erreur sémantique': 'semantic'}
+
+# --- Fichiers à vérifier ---
+def collect_files(paths):
+    """Fichiers désignés par `paths` : les fichiers tels quels, et les .tourte des répertoires
+    (parcourus récursivement, dans l'ordre alphabétique)."""
+    files = []
+    for path in paths:
+        if not os.path.isdir(path):
+            files.append(path)
+            continue
+        for directory, subdirectories, names in os.walk(path):
+            subdirectories.sort()
+            files.extend(os.path.join(directory, name) for name in sorted(names) if name.endswith(MODULE_EXTENSION))
+    return files
+
+
+# --- Vérification d'un fichier (exécutée dans les processus de travail) ---
+def check_file(path, stats=False, memory=False):
+    """Lexe, parse et analyse `path` avec ses imports ; renvoie (taille en octets, diagnostics,
+    mesures par phase si `stats`, sinon None)."""
+    measures = Stats(memory) if stats else None
+    try:
+        size = os.path.getsize(path)
+    except OSError as error:
+        return 0, [diagnostic(path, 'load', f"Lecture impossible: {error.strerror}")], None
+    try:
+        ModuleLoader(stats=measures).load(path)
+    except Exception as error:
+        return size, diagnostics(path, str(error)), measures and measures.phases
+    return size, [], measures and measures.phases
+
+def diagnostic(path, phase, message, line=None, column=None, via=None):
+    """Diagnostic JSON ; `via` est le fichier vérifié quand l'erreur est dans un module qu'il importe."""
+    item = {'file': path, 'line': line, 'column': column, 'phase': phase, 'message': message}
+    if via is not None:
+        item['via'] = via
+    return item
+
+def diagnostics(path, text):
+    """Diagnostics d'une erreur de ModuleLoader : une erreur lexicale ou de syntaxe, ou l'échec
+    de l'analyse sémantique suivi d'une erreur par ligne ; le message commence par le chemin du
+    module fautif quand ce n'est pas une erreur de chargement (import introuvable, cycle...)."""
+    file, text = split_module_path(path, text)
+    via = path if file != path else None
+    found = []
+    for line in text.split('\n'):
+        match = POSITIONED_ERROR.match(line)
+        if match is not None:
+            kind, row, column, message = match.groups()
+            found.append(diagnostic(file, PHASES.get(kind, 'semantic'), message, position(row), position(column), via))
+    if not found:
+        found.append(diagnostic(file, 'load', text.split('\n', 1)[0], via=via))
+    return found
+
+def split_module_path(path, text):
+    """(fichier, message) : retire de `text` le chemin de module qui le préfixe, s'il y en a un."""
+    start = 0
+    while True:
+        end = text.find(': ', start)
+        if end < 0:
+            return path, text
+        file = text[:end]
+        if os.path.isfile(file):
+            # Le fichier vérifié garde le chemin donné ; un module importé a son chemin absolu
+            return (path if file == os.path.abspath(path) else file), text[end + 2:]
+        start = end + 1
+
+def position(text):
+    return int(text) if text.isdigit() else None
+
+
+# --- Vérification d'un ensemble de fichiers ---
+def check_files(files, workers=None, stats=False, memory=False):
+    """Résultat de check_file pour chaque fichier, dans l'ordre de `files`.
+
+    Les fichiers sont répartis par lots entre `workers` processus qui restent actifs d'un lot
+    à l'autre : le coût de démarrage de Python est payé une fois par processus, pas par fichier.
+    Avec un seul processus, tout est vérifié dans le processus courant.
+    """
+    task = partial(check_file, stats=stats, memory=memory)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(files) < 2:
+        return map(task, files)
+    chunk = max(1, min(64, len(files) // (workers * 4)))
+    with ProcessPoolExecutor(workers) as pool:
+        return list(pool.map(task, files, chunksize=chunk))
+
+def check(paths, workers=None, output=sys.stdout, summary=sys.stderr, stats=False, memory=False):
+    """Commande `check` : un diagnostic JSON par ligne sur `output`, le bilan sur `summary` ;
+    renvoie le code de sortie (1 si au moins un fichier est en erreur).
+
+    Avec `stats`, une dernière ligne JSON {"stats": ...} donne les mesures par phase cumulées
+    sur tous les fichiers (tourte_stats.Stats.report) ; avec `memory`, les pics de mémoire aussi.
+    """
+    files = collect_files(paths)
+    start = time.perf_counter()
+    total = Stats(memory)
+    total_size = 0
+    failed = 0
+    count = 0
+    for size, found, phases in check_files(files, workers, stats, memory):
+        total_size += size
+        failed += bool(found)
+        count += 1
+        for item in found:
+            output.write(json.dumps(item, ensure_ascii=False) + '\n')
+        if phases:
+            total.merge(phases)
+    if stats:
+        output.write(json.dumps({'stats': total.report()}, ensure_ascii=False) + '\n')
+    elapsed = max(time.perf_counter() - start, 1e-9)
+    print(f"{count} fichier(s) vérifié(s), {failed} en erreur, en {elapsed:.2f} s : "
+          f"{count / elapsed:.0f} fichiers/s, {total_size / elapsed / 1e6:.2f} Mo/s "
+          f"({workers or os.cpu_count() or 1} processus)", file=summary)
+    return 1 if failed else 0
+
+
+USAGE = "Usage: python tourte_cli.py check [--jobs N] [--stats] [--memory] <fichiers ou répertoires...>"
+
+def main(arguments):
+    if not arguments or arguments[0] != 'check':
+        print(USAGE)
+        return 2
+    arguments = arguments[1:]
+    workers = None
+    options = set()
+    while arguments and arguments[0].startswith('--'):
+        option = arguments.pop(0)
+        if option == '--jobs' and arguments and arguments[0].isdigit() and int(arguments[0]) > 0:
+            workers = int(arguments.pop(0))
+        elif option in ('--stats', '--memory'):
+            options.add(option)
+        else:
+            print(USAGE)
+            return 2
+    if not arguments:
+        print(USAGE)
+        return 2
+    memory = '--memory' in options
+    return check(arguments, workers, stats='--stats' in options or memory, memory=memory)
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
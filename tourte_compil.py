@@ -1,4 +1,13 @@
+import codecs
+import io
+import mmap
+import os
 import re
+import sys
+from array import array
+from bisect import bisect_right
+from collections import deque
+from types import GeneratorType
 
 # --- Définition des types de tokens ---
 TOKEN_TYPES = {
@@ -32,27 +41,281 @@ DELIMITERS = {
     '||'
 }
 
+TYPE_KEYWORDS = {'int', 'float', 'STR', 'List', 'Dictionary', 'none'}
+
+# Triés une fois pour toutes : le plus long d'abord (maximal munch)
+OPERATORS_BY_LENGTH = sorted(OPERATORS, key=len, reverse=True)
+DELIMITERS_BY_LENGTH = sorted(DELIMITERS, key=len, reverse=True)
+
+# --- Expression régulière maîtresse du scanner rapide ---
+# Ne reconnaît que les débuts de tokens ASCII ; tout le reste (identifiants
+# accentués, chiffres Unicode, erreurs) est délégué au scanner caractère par caractère.
+TOKEN_REGEX = re.compile(
+    r"(?P<WHITESPACE>[^\S\n]+)"
+    r"|(?P<COMMENT>#[^\n]*)"
+    r"|(?P<NUMBER>[0-9]+(?P<FRACTION>\.[0-9]*)?)"
+    r"|(?P<WORD>[A-Za-z_]\w*)"
+    r"|(?P<STRING>\"[^\"]*\"|'[^']*')"
+    r"|(?P<OPERATOR>" + '|'.join(re.escape(op) for op in OPERATORS_BY_LENGTH) + r")"
+    r"|(?P<DELIMITER>" + '|'.join(re.escape(delim) for delim in DELIMITERS_BY_LENGTH) + r")"
+    r"|(?P<NEWLINE>\n)"
+)
+
+def word_token_type(value):
+    if value in KEYWORDS:
+        if value in TYPE_KEYWORDS:
+            return TOKEN_TYPES['TYPE_KEYWORD']
+        return TOKEN_TYPES['KEYWORD']
+    return TOKEN_TYPES['IDENTIFIER']
+
+# --- Sortes de tokens : un petit entier par type, et par valeur pour la ponctuation et les mots-clés ---
+VALUE_KINDED_TYPES = {TOKEN_TYPES['OPERATOR'], TOKEN_TYPES['DELIMITER'], TOKEN_TYPES['KEYWORD'], TOKEN_TYPES['TYPE_KEYWORD']}
+
+KIND_TYPE_NAMES = [TOKEN_TYPES[name] for name in
+                   ('EOF', 'NEWLINE', 'IDENTIFIER', 'INT_LITERAL', 'FLOAT_LITERAL', 'STR_LITERAL')]
+TOKEN_KINDS = {name: kind for kind, name in enumerate(KIND_TYPE_NAMES)}
+for _value in sorted(OPERATORS) + sorted(DELIMITERS) + sorted(KEYWORDS):
+    TOKEN_KINDS[_value] = len(KIND_TYPE_NAMES)
+    KIND_TYPE_NAMES.append(TOKEN_TYPES['OPERATOR'] if _value in OPERATORS else
+                           TOKEN_TYPES['DELIMITER'] if _value in DELIMITERS else word_token_type(_value))
+
+def token_kind(type, value):
+    return TOKEN_KINDS[value] if type in VALUE_KINDED_TYPES else TOKEN_KINDS[type]
+
+KIND_EOF = TOKEN_KINDS['EOF']
+KIND_IDENTIFIER = TOKEN_KINDS['IDENTIFIER']
+KIND_INT_LITERAL = TOKEN_KINDS['INT_LITERAL']
+KIND_FLOAT_LITERAL = TOKEN_KINDS['FLOAT_LITERAL']
+KIND_STR_LITERAL = TOKEN_KINDS['STR_LITERAL']
+KIND_LPAREN = TOKEN_KINDS['(']
+KIND_LBRACKET = TOKEN_KINDS['[']
+KIND_DOUBLE_BAR = TOKEN_KINDS['||']
+KIND_NOT = TOKEN_KINDS['not']
+KIND_IN = TOKEN_KINDS['in']
+KIND_INPUT = TOKEN_KINDS['input']
+KIND_NONE = TOKEN_KINDS['none']
+CONVERSION_KINDS = {TOKEN_KINDS['int'], TOKEN_KINDS['float'], TOKEN_KINDS['STR']}
+
+# Priorité des opérateurs binaires, indexée par sorte de token (0 : pas un opérateur binaire).
+# 'not' n'y figure que pour 'not in' ; tous les opérateurs sont associatifs à gauche.
+BINARY_PRECEDENCE = [0] * len(KIND_TYPE_NAMES)
+for _precedence, _operators in enumerate((
+        ('or',),
+        ('and',),
+        ('==', '!=', '>', '<', '>=', '<=', 'in', 'not'),
+        ('+', '-'),
+        ('*', '/', '//', '**', '///', '%')), start=1):
+    for _value in _operators:
+        BINARY_PRECEDENCE[TOKEN_KINDS[_value]] = _precedence
+
+# --- Index des débuts de ligne ---
+class LineIndex:
+    """Offsets des débuts de ligne d'un texte : ligne et colonne d'un offset sont retrouvées par bisect.
+
+    `line` et `column` donnent la position du premier caractère du texte
+    (utile quand le texte n'est qu'un morceau d'un fichier plus grand).
+    """
+    def __init__(self, text='', line=1, column=1):
+        self.line = line
+        self.column = column
+        self.starts = array('i', [0])
+        newline = text.find('\n')
+        while newline != -1:
+            self.starts.append(newline + 1)
+            newline = text.find('\n', newline + 1)
+
+    def line_of(self, offset):
+        return self.line + bisect_right(self.starts, offset) - 1
+
+    def column_of(self, offset):
+        index = bisect_right(self.starts, offset) - 1
+        column = offset - self.starts[index] + 1
+        return column + self.column - 1 if index == 0 else column
+
 # --- Classe Token ---
 class Token:
-    def __init__(self, type, value, line=None, column=None):
+    """Un token ne retient que son offset et sa longueur ; ligne et colonne sont calculées
+    à la demande via `lines` (un LineIndex), sauf si elles sont données explicitement."""
+    __slots__ = ('type', 'value', 'kind', 'offset', 'length', 'lines', '_line', '_column')
+
+    def __init__(self, type, value, line=None, column=None, offset=None, length=0, lines=None, kind=None):
         self.type = type
         self.value = value
-        self.line = line
-        self.column = column
+        if kind is None:
+            kind = TOKEN_KINDS[value] if type in VALUE_KINDED_TYPES else TOKEN_KINDS[type]
+        self.kind = kind # Donnée explicitement quand la valeur a été réécrite (ex: 'not in')
+        self.offset = offset
+        self.length = length
+        self.lines = lines
+        self._line = line
+        self._column = column
+
+    @property
+    def line(self):
+        if self._line is None and self.lines is not None:
+            # Une chaîne sur plusieurs lignes porte la ligne de sa fin
+            return self.lines.line_of(self.offset + max(self.length - 1, 0))
+        return self._line
+
+    @property
+    def column(self):
+        if self._column is None and self.lines is not None:
+            return self.lines.column_of(self.offset)
+        return self._column
 
     def __repr__(self):
         if self.line is not None and self.column is not None:
             return f"Token({self.type}, '{self.value}', L{self.line} C{self.column})"
         return f"Token({self.type}, '{self.value}')"
 
+def track_lines(fields):
+    """Ajoute ligne et colonne aux champs (type, valeur, début, fin) du scanner en suivant les sauts de ligne.
+
+    Tous les '\\n' du source sont soit des tokens NEWLINE, soit à l'intérieur d'une
+    chaîne : il suffit donc de regarder les tokens, sans aucun index.
+    """
+    line = 1
+    line_start = 0
+    for type, value, start, end in fields:
+        column = start - line_start + 1
+        if type == TOKEN_TYPES['NEWLINE']:
+            yield type, value, line, column, start, end
+            line += 1
+            line_start = end
+            continue
+        if type == TOKEN_TYPES['STR_LITERAL'] and '\n' in value:
+            line += value.count('\n')
+            line_start = start + 2 + value.rfind('\n')
+        yield type, value, line, column, start, end
+
+# --- Stockage compact des tokens (structure de tableaux) ---
+class TokenBuffer:
+    """Tokens rangés en colonnes parallèles (sorte, début, longueur, valeur) plutôt qu'en objets Token.
+
+    Les valeurs sont internées dans une table partagée ; les lignes et colonnes
+    sont retrouvées à la demande à partir des débuts de ligne.
+    """
+    def __init__(self):
+        self.kinds = array('B')
+        self.starts = array('i')
+        self.lengths = array('i')
+        self.value_indices = array('i')
+        self.values = []
+        self.value_table = {}
+        self.lines = LineIndex()
+
+    def intern(self, value):
+        key = (type(value), value)
+        index = self.value_table.get(key)
+        if index is None:
+            index = self.value_table[key] = len(self.values)
+            self.values.append(value)
+        return index
+
+    def append(self, type, value, start, end):
+        self.kinds.append(token_kind(type, value))
+        self.starts.append(start)
+        self.lengths.append(end - start)
+        self.value_indices.append(self.intern(value))
+        if type == TOKEN_TYPES['NEWLINE']:
+            self.lines.starts.append(end)
+        elif type == TOKEN_TYPES['STR_LITERAL'] and '\n' in value:
+            # Les chaînes sont les seuls tokens qui peuvent contenir des sauts de ligne
+            newline = value.find('\n')
+            while newline != -1:
+                self.lines.starts.append(start + 2 + newline)
+                newline = value.find('\n', newline + 1)
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self.kinds)
+        if not 0 <= index < len(self.kinds):
+            raise IndexError("Index de token hors limites")
+        return TokenView(self, index)
+
+    def __iter__(self):
+        for index in range(len(self.kinds)):
+            yield TokenView(self, index)
+
+    def memory_size(self):
+        """Taille en octets des colonnes et de la table des valeurs."""
+        columns = (self.kinds, self.starts, self.lengths, self.value_indices, self.lines.starts)
+        return (sum(sys.getsizeof(column) for column in columns) + sys.getsizeof(self.values)
+                + sys.getsizeof(self.value_table) + sum(sys.getsizeof(value) for value in self.values))
+
+class TokenView:
+    """Vue légère sur un token d'un TokenBuffer, interchangeable avec Token pour le Parser."""
+    __slots__ = ('buffer', 'index')
+
+    def __init__(self, buffer, index):
+        self.buffer = buffer
+        self.index = index
+
+    @property
+    def type(self):
+        return KIND_TYPE_NAMES[self.buffer.kinds[self.index]]
+
+    @property
+    def kind(self):
+        return self.buffer.kinds[self.index]
+
+    @property
+    def value(self):
+        return self.buffer.values[self.buffer.value_indices[self.index]]
+
+    @value.setter
+    def value(self, value):
+        self.buffer.value_indices[self.index] = self.buffer.intern(value)
+
+    @property
+    def offset(self):
+        return self.buffer.starts[self.index]
+
+    @property
+    def length(self):
+        return self.buffer.lengths[self.index]
+
+    @property
+    def line(self):
+        # Une chaîne sur plusieurs lignes porte la ligne de sa fin, comme dans le scanner de référence
+        return self.buffer.lines.line_of(self.offset + max(self.length - 1, 0))
+
+    @property
+    def column(self):
+        return self.buffer.lines.column_of(self.offset)
+
+    def __repr__(self):
+        return f"Token({self.type}, '{self.value}', L{self.line} C{self.column})"
+
 # --- Classe Lexer ---
 class Lexer:
-    def __init__(self, code):
+    def __init__(self, code, fast=True):
         self.code = code
         self.position = 0
-        self.line = 1
-        self.column = 1
         self.tokens = []
+        self.fast = fast
+        # Position (ligne, colonne) du premier caractère de self.code
+        self.first_line = 1
+        self.first_column = 1
+        self._lines = None
+
+    @property
+    def lines(self):
+        """Index des débuts de ligne de self.code, construit une seule fois."""
+        if self._lines is None:
+            self._lines = LineIndex(self.code, self.first_line, self.first_column)
+        return self._lines
+
+    @property
+    def line(self):
+        return self.lines.line_of(self.position)
+
+    @property
+    def column(self):
+        return self.lines.column_of(self.position)
 
     def current_char(self):
         if self.position < len(self.code):
@@ -61,11 +324,6 @@ class Lexer:
 
     def advance(self):
         char = self.current_char()
-        if char == '\n':
-            self.line += 1
-            self.column = 1
-        else:
-            self.column += 1
         self.position += 1
         return char
 
@@ -74,13 +332,15 @@ class Lexer:
             return self.code[self.position + offset]
         return None
 
+    def make_token(self, type, value, start):
+        return Token(type, value, None, None, start, self.position - start, self.lines)
+
     def skip_whitespace(self):
         while self.current_char() is not None and self.current_char().isspace() and self.current_char() != '\n':
             self.advance()
 
     def tokenize_number(self):
         start_pos = self.position
-        start_col = self.column
         while self.current_char() is not None and self.current_char().isdigit():
             self.advance()
         if self.current_char() == '.':
@@ -88,14 +348,13 @@ class Lexer:
             while self.current_char() is not None and self.current_char().isdigit():
                 self.advance()
             value = self.code[start_pos:self.position]
-            self.tokens.append(Token(TOKEN_TYPES['FLOAT_LITERAL'], float(value), self.line, start_col))
+            self.tokens.append(self.make_token(TOKEN_TYPES['FLOAT_LITERAL'], float(value), start_pos))
         else:
             value = self.code[start_pos:self.position]
-            self.tokens.append(Token(TOKEN_TYPES['INT_LITERAL'], int(value), self.line, start_col))
+            self.tokens.append(self.make_token(TOKEN_TYPES['INT_LITERAL'], int(value), start_pos))
 
     def tokenize_string(self, quote_char):
         start_pos = self.position
-        start_col = self.column
         self.advance()
         string_value = ""
         while self.current_char() is not None and self.current_char() != quote_char:
@@ -105,102 +364,248 @@ class Lexer:
             raise Exception(f"Erreur lexicale à L{self.line} C{self.column}: Chaîne non terminée, guillemet '{quote_char}' attendu.")
         
         self.advance()
-        self.tokens.append(Token(TOKEN_TYPES['STR_LITERAL'], string_value, self.line, start_col))
+        self.tokens.append(self.make_token(TOKEN_TYPES['STR_LITERAL'], string_value, start_pos))
 
     def tokenize_identifier_or_keyword(self):
         start_pos = self.position
-        start_col = self.column
         while self.current_char() is not None and (self.current_char().isalnum() or self.current_char() == '_'):
             self.advance()
         
         value = self.code[start_pos:self.position]
-        
-        if value in KEYWORDS:
-            if value in {'int', 'float', 'STR', 'List', 'Dictionary', 'none'}:
-                self.tokens.append(Token(TOKEN_TYPES['TYPE_KEYWORD'], value, self.line, start_col))
-            else:
-                self.tokens.append(Token(TOKEN_TYPES['KEYWORD'], value, self.line, start_col))
-        else:
-            self.tokens.append(Token(TOKEN_TYPES['IDENTIFIER'], value, self.line, start_col))
+        self.tokens.append(self.make_token(word_token_type(value), value, start_pos))
 
-    def get_tokens(self):
-        while self.position < len(self.code):
-            self.skip_whitespace()
+    def scan_token(self):
+        """Analyse un token (ou saute un commentaire) à la position courante, caractère par caractère."""
+        self.skip_whitespace()
 
-            char = self.current_char()
+        char = self.current_char()
 
-            if char is None:
-                break
+        if char is None:
+            return
 
-            if char == '#':
+        if char == '#':
+            self.advance()
+            while self.current_char() is not None and self.current_char() != '\n':
                 self.advance()
-                while self.current_char() is not None and self.current_char() != '\n':
-                    self.advance()
-                continue
-            
-            if char.isdigit():
-                self.tokenize_number()
-                continue
+            return
 
-            if char == '"' or char == "'":
-                self.tokenize_string(char)
-                continue
+        if char.isdigit():
+            self.tokenize_number()
+            return
 
-            if char.isalpha() or char == '_':
-                self.tokenize_identifier_or_keyword()
-                continue
-            
-            found_operator = False
-            for op in sorted(OPERATORS, key=len, reverse=True):
-                if self.code[self.position:].startswith(op):
-                    self.tokens.append(Token(TOKEN_TYPES['OPERATOR'], op, self.line, self.column))
-                    self.position += len(op)
-                    self.column += len(op)
-                    found_operator = True
-                    break
-            if found_operator:
-                continue
+        if char == '"' or char == "'":
+            self.tokenize_string(char)
+            return
 
-            found_delimiter = False
-            for delim in sorted(DELIMITERS, key=len, reverse=True):
-                if self.code[self.position:].startswith(delim):
-                    self.tokens.append(Token(TOKEN_TYPES['DELIMITER'], delim, self.line, self.column))
-                    self.position += len(delim)
-                    self.column += len(delim)
-                    found_delimiter = True
-                    break
-            if found_delimiter:
-                continue
+        if char.isalpha() or char == '_':
+            self.tokenize_identifier_or_keyword()
+            return
 
-            if char == '\n':
-                self.tokens.append(Token(TOKEN_TYPES['NEWLINE'], char, self.line, self.column))
-                self.advance()
-                continue
+        start_pos = self.position
+        for op in OPERATORS_BY_LENGTH:
+            if self.code.startswith(op, self.position):
+                self.position += len(op)
+                self.tokens.append(self.make_token(TOKEN_TYPES['OPERATOR'], op, start_pos))
+                return
+
+        for delim in DELIMITERS_BY_LENGTH:
+            if self.code.startswith(delim, self.position):
+                self.position += len(delim)
+                self.tokens.append(self.make_token(TOKEN_TYPES['DELIMITER'], delim, start_pos))
+                return
 
-            raise Exception(f"Erreur lexicale à L{self.line} C{self.column}: Caractère non reconnu '{char}'")
-        
-        self.tokens.append(Token(TOKEN_TYPES['EOF'], 'EOF', self.line, self.column))
+        if char == '\n':
+            self.advance()
+            self.tokens.append(self.make_token(TOKEN_TYPES['NEWLINE'], char, start_pos))
+            return
+
+        raise Exception(f"Erreur lexicale à L{self.line} C{self.column}: Caractère non reconnu '{char}'")
+
+    def get_tokens(self):
+        if self.fast:
+            return self.get_tokens_fast()
+
+        while self.position < len(self.code):
+            self.scan_token()
+
+        self.tokens.append(self.make_token(TOKEN_TYPES['EOF'], 'EOF', self.position))
+        return self.tokens
+
+    def get_tokens_fast(self):
+        """Scanner en temps linéaire piloté par TOKEN_REGEX ; même flux de tokens que le scanner caractère par caractère."""
+        lines = self.lines
+        append = self.tokens.append
+        for type, value, start, end in self.scan():
+            append(Token(type, value, None, None, start, end - start, lines))
         return self.tokens
 
+    def get_token_buffer(self, chunks=None):
+        """Analyse directement vers un TokenBuffer, sans créer d'objets Token."""
+        buffer = TokenBuffer()
+        append = buffer.append
+        for type, value, start, end in self.scan(chunks):
+            append(type, value, start, end)
+        return buffer
+
+    def iter_tokens(self, chunks=None):
+        """Génère les tokens un par un, jusqu'au token EOF inclus.
+
+        Sans `chunks`, tout self.code est analysé et les tokens résolvent leur
+        ligne/colonne à la demande via self.lines. `chunks` est un itérable de
+        morceaux de texte consommés au fil de l'eau : seul le morceau en cours
+        reste en mémoire, et les tokens reçoivent leur ligne/colonne au passage.
+        """
+        if chunks is None:
+            lines = self.lines
+            for type, value, start, end in self.scan():
+                yield Token(type, value, None, None, start, end - start, lines)
+        else:
+            for type, value, line, column, start, end in track_lines(self.scan(chunks)):
+                yield Token(type, value, line, column, offset=start)
+
+    def scan(self, chunks=None):
+        """Cœur du scanner rapide : génère (type, valeur, début, fin), début et fin étant des offsets absolus.
+
+        Aucun suivi de ligne ni de colonne ici : ils se déduisent des offsets.
+        """
+        if chunks is None:
+            chunks = (self.code,)
+        chunks = iter(chunks)
+        next_chunk = next(chunks, None)
+
+        match_token = TOKEN_REGEX.match
+        operator_type = TOKEN_TYPES['OPERATOR']
+        delimiter_type = TOKEN_TYPES['DELIMITER']
+        buffer = ''
+        base = 0 # Offset absolu du début du tampon
+        position = 0
+
+        while next_chunk is not None:
+            # On ne garde du tampon que la partie non encore analysée
+            if position:
+                newlines = buffer.count('\n', 0, position)
+                if newlines:
+                    self.first_line += newlines
+                    self.first_column = position - buffer.rfind('\n', 0, position)
+                else:
+                    self.first_column += position
+                buffer = buffer[position:]
+                base += position
+                position = 0
+            buffer += next_chunk
+            next_chunk = next(chunks, None)
+            final = next_chunk is None
+            length = len(buffer)
+            if buffer is not self.code:
+                self.code = buffer
+                self._lines = None
+
+            while position < length:
+                match = match_token(buffer, position)
+                kind = match.lastgroup if match else None
+                end = match.end() if match else position
+
+                # Les nombres suivis d'un chiffre non ASCII (ex: '١') relèvent du scanner de référence
+                if kind == 'NUMBER' and end < length and buffer[end] >= '\x80':
+                    kind = None
+
+                if kind is None:
+                    # Délégation au scanner caractère par caractère (le token commence ici)
+                    self.position = position
+                    scanned_tokens = self.tokens
+                    self.tokens = []
+                    try:
+                        self.scan_token()
+                    except Exception:
+                        if final:
+                            raise
+                        break # Le token continue peut-être dans le morceau suivant
+                    finally:
+                        scanned_tokens, self.tokens = self.tokens, scanned_tokens
+                    if not final and self.position >= length:
+                        break
+                    for token in scanned_tokens:
+                        yield token.type, token.value, base + token.offset, base + token.offset + token.length
+                    position = self.position
+                    continue
+
+                if end >= length and not final:
+                    break # Le token peut se prolonger dans le morceau suivant
+
+                if kind == 'WHITESPACE' or kind == 'COMMENT':
+                    pass
+                elif kind == 'WORD':
+                    value = match.group()
+                    yield word_token_type(value), value, base + position, base + end
+                elif kind == 'DELIMITER':
+                    yield delimiter_type, match.group(), base + position, base + end
+                elif kind == 'OPERATOR':
+                    yield operator_type, match.group(), base + position, base + end
+                elif kind == 'NUMBER':
+                    if match.group('FRACTION') is not None:
+                        yield TOKEN_TYPES['FLOAT_LITERAL'], float(match.group()), base + position, base + end
+                    else:
+                        yield TOKEN_TYPES['INT_LITERAL'], int(match.group()), base + position, base + end
+                elif kind == 'STRING':
+                    yield TOKEN_TYPES['STR_LITERAL'], buffer[position + 1:end - 1], base + position, base + end
+                else: # NEWLINE
+                    yield TOKEN_TYPES['NEWLINE'], '\n', base + position, base + end
+                position = end
+
+        self.position = position
+        yield TOKEN_TYPES['EOF'], 'EOF', base + position, base + position
+
+
+def read_source_chunks(path, chunk_size=1 << 20):
+    """Lit un fichier source UTF-8 par morceaux via mmap (mêmes fins de ligne qu'un open() en mode texte)."""
+    decoder = io.IncrementalNewlineDecoder(codecs.getincrementaldecoder('utf-8')(), translate=True)
+    with open(path, 'rb') as source_file:
+        size = os.fstat(source_file.fileno()).st_size
+        if size == 0:
+            return
+        with mmap.mmap(source_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for start in range(0, size, chunk_size):
+                end = min(start + chunk_size, size)
+                yield decoder.decode(mapped[start:end], final=end == size)
+
+def lex_file(path, chunk_size=1 << 20):
+    """Génère paresseusement les tokens d'un fichier sans le charger en entier."""
+    return Lexer('').iter_tokens(read_source_chunks(path, chunk_size))
+
+def parse_file(path, chunk_size=1 << 20):
+    return StreamingParser(lex_file(path, chunk_size)).parse_program()
+
 
 # --- Classes pour les Nœuds de l'Arbre Syntaxique Abstrait (AST) ---
 class ASTNode:
-    """Classe de base pour tous les nœuds de l'AST."""
+    """Classe de base pour tous les nœuds de l'AST.
+
+    `_fields` nomme, dans l'ordre, les attributs qui contiennent des enfants : un nœud,
+    une liste de nœuds ou de tuples (ex: paires d'un dictionnaire), ou None.
+    """
+    __slots__ = ('token',)
+    _fields = ()
+    _visit_name = 'visit_ASTNode'
     def __init__(self, token=None):
         self.token = token
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._visit_name = 'visit_' + cls.__name__
+
     def __repr__(self):
         return f"{self.__class__.__name__}({self.token.value if self.token else ''})"
 
     def visit(self, visitor):
-        method_name = 'visit_' + self.__class__.__name__
-        visitor_method = getattr(visitor, method_name, self.generic_visit)
+        visitor_method = getattr(visitor, self._visit_name, self.generic_visit)
         return visitor_method(self)
 
     def generic_visit(self, node):
         raise Exception(f"Aucune méthode visit_{node.__class__.__name__} n'est définie pour le visiteur.")
 
 class NumberNode(ASTNode):
+    __slots__ = ('value',)
+    _fields = ()
     def __init__(self, token):
         super().__init__(token)
         self.value = token.value
@@ -209,6 +614,8 @@ class NumberNode(ASTNode):
         return f"Number({self.value})"
 
 class StringNode(ASTNode):
+    __slots__ = ('value',)
+    _fields = ()
     def __init__(self, token):
         super().__init__(token)
         self.value = token.value
@@ -217,14 +624,24 @@ class StringNode(ASTNode):
         return f"String('{self.value}')"
 
 class IdentifierNode(ASTNode):
+    """Identifiant ; l'analyse sémantique le résout en (depth, slot) : la variable est à l'index
+    `slot` du cadre situé `depth` fonctions englobantes plus haut (0 : cadre courant).
+    `inferred_type` est le type prouvé de la variable lue ici (tourte_types), ou None."""
+    __slots__ = ('name', 'depth', 'slot', 'inferred_type')
+    _fields = ()
     def __init__(self, token):
         super().__init__(token)
         self.name = token.value
+        self.depth = None
+        self.slot = None
+        self.inferred_type = None
 
     def __repr__(self):
         return f"Identifier('{self.name}')"
 
 class NoneNode(ASTNode):
+    __slots__ = ('value',)
+    _fields = ()
     def __init__(self, token):
         super().__init__(token)
         self.value = None
@@ -233,16 +650,24 @@ class NoneNode(ASTNode):
         return "None"
 
 class BinaryOpNode(ASTNode):
+    """Opération binaire ; l'inférence de types (tourte_types) renseigne les types prouvés de
+    ses opérandes (`operand_types`) et de son résultat (`inferred_type`), None si inconnus."""
+    __slots__ = ('left', 'op', 'right', 'operand_types', 'inferred_type')
+    _fields = ('left', 'right')
     def __init__(self, left, op_token, right):
         super().__init__(op_token)
         self.left = left
         self.op = op_token
         self.right = right
+        self.operand_types = None
+        self.inferred_type = None
 
     def __repr__(self):
         return f"BinaryOp({self.left}, {self.op.value}, {self.right})"
 
 class UnaryOpNode(ASTNode):
+    __slots__ = ('op', 'operand')
+    _fields = ('operand',)
     def __init__(self, op_token, operand):
         super().__init__(op_token)
         self.op = op_token
@@ -252,6 +677,8 @@ class UnaryOpNode(ASTNode):
         return f"UnaryOp({self.op.value}, {self.operand})"
 
 class ListNode(ASTNode):
+    __slots__ = ('elements',)
+    _fields = ('elements',)
     def __init__(self, elements, token=None):
         super().__init__(token)
         self.elements = elements
@@ -260,6 +687,8 @@ class ListNode(ASTNode):
         return f"List({self.elements})"
 
 class DictionaryNode(ASTNode):
+    __slots__ = ('pairs',)
+    _fields = ('pairs',)
     def __init__(self, pairs, token=None):
         super().__init__(token)
         self.pairs = pairs
@@ -269,6 +698,8 @@ class DictionaryNode(ASTNode):
 
 class SubscriptNode(ASTNode):
     """Représente l'accès à un élément de liste ou de dictionnaire (ex: list[index], dict["key"])."""
+    __slots__ = ('target', 'index_expr')
+    _fields = ('target', 'index_expr')
     def __init__(self, target, index_expr, token=None):
         super().__init__(token)
         self.target = target
@@ -278,14 +709,19 @@ class SubscriptNode(ASTNode):
         return f"Subscript({self.target}, {self.index_expr})"
 
 class ProgramNode(ASTNode):
+    __slots__ = ('statements', 'frame_size')
+    _fields = ('statements',)
     def __init__(self, statements):
         super().__init__()
         self.statements = statements
+        self.frame_size = None # Nombre de slots du cadre global, fixé par l'analyse sémantique
 
     def __repr__(self):
         return f"Program(Statements={self.statements})"
 
 class AssignmentNode(ASTNode):
+    __slots__ = ('identifier', 'expression')
+    _fields = ('identifier', 'expression')
     def __init__(self, identifier, expression, token=None):
         super().__init__(token)
         self.identifier = identifier
@@ -295,6 +731,8 @@ class AssignmentNode(ASTNode):
         return f"Assignment({self.identifier}, {self.expression})"
 
 class PrintStatementNode(ASTNode):
+    __slots__ = ('expressions',)
+    _fields = ('expressions',)
     def __init__(self, expressions, token=None):
         super().__init__(token)
         self.expressions = expressions
@@ -303,6 +741,8 @@ class PrintStatementNode(ASTNode):
         return f"Print({self.expressions})"
 
 class InputFunctionCallNode(ASTNode):
+    __slots__ = ('prompt_expr',)
+    _fields = ('prompt_expr',)
     def __init__(self, prompt_expr, token=None):
         super().__init__(token)
         self.prompt_expr = prompt_expr
@@ -311,6 +751,8 @@ class InputFunctionCallNode(ASTNode):
         return f"Input({self.prompt_expr})"
 
 class TypeConversionNode(ASTNode):
+    __slots__ = ('type_token', 'expression')
+    _fields = ('expression',)
     def __init__(self, type_token, expression, token=None):
         super().__init__(token)
         self.type_token = type_token
@@ -320,6 +762,8 @@ class TypeConversionNode(ASTNode):
         return f"TypeConvert({self.type_token.value}, {self.expression})"
 
 class FunctionCallNode(ASTNode):
+    __slots__ = ('identifier', 'arguments')
+    _fields = ('identifier', 'arguments')
     def __init__(self, identifier, arguments, token=None):
         super().__init__(token)
         self.identifier = identifier
@@ -329,16 +773,21 @@ class FunctionCallNode(ASTNode):
         return f"Call({self.identifier.name}, {self.arguments})"
 
 class FunctionDeclarationNode(ASTNode):
+    __slots__ = ('identifier', 'parameters', 'body_statements', 'frame_size')
+    _fields = ('identifier', 'parameters', 'body_statements')
     def __init__(self, identifier, parameters, body_statements, token=None):
         super().__init__(token)
         self.identifier = identifier
         self.parameters = parameters
         self.body_statements = body_statements
+        self.frame_size = None # Nombre de slots du cadre d'un appel (paramètres en premier)
 
     def __repr__(self):
         return f"FuncDecl({self.identifier.name}, Params={self.parameters}, Body={self.body_statements})"
 
 class ReturnStatementNode(ASTNode):
+    __slots__ = ('expression',)
+    _fields = ('expression',)
     def __init__(self, expression=None, token=None):
         super().__init__(token)
         self.expression = expression
@@ -347,6 +796,8 @@ class ReturnStatementNode(ASTNode):
         return f"Return({self.expression})"
 
 class IfStatementNode(ASTNode):
+    __slots__ = ('condition', 'if_body', 'elif_branches', 'else_body')
+    _fields = ('condition', 'if_body', 'elif_branches', 'else_body')
     def __init__(self, condition, if_body, elif_branches, else_body, token=None):
         super().__init__(token)
         self.condition = condition
@@ -358,6 +809,8 @@ class IfStatementNode(ASTNode):
         return f"If(Cond={self.condition}, IfBody={self.if_body}, Elif={self.elif_branches}, Else={self.else_body})"
 
 class WhileStatementNode(ASTNode):
+    __slots__ = ('condition', 'body_statements')
+    _fields = ('condition', 'body_statements')
     def __init__(self, condition, body_statements, token=None):
         super().__init__(token)
         self.condition = condition
@@ -367,9 +820,15 @@ class WhileStatementNode(ASTNode):
         return f"While(Cond={self.condition}, Body={self.body_statements})"
 
 class ImportStatementNode(ASTNode):
+    """Import d'un fichier. Avec un chargeur de modules, l'analyse sémantique renseigne `path`
+    (chemin résolu) et `bindings` : un (nom, slot dans le module, slot local) par fonction importée."""
+    __slots__ = ('file_path', 'path', 'bindings')
+    _fields = ()
     def __init__(self, file_path_token, token=None):
         super().__init__(token)
         self.file_path = file_path_token.value
+        self.path = None
+        self.bindings = None
 
     def __repr__(self):
         return f"Import('{self.file_path}')"
@@ -386,6 +845,12 @@ class Parser:
             return self.tokens[self.current_token_index]
         return self.tokens[-1]
 
+    def peek_token(self, offset=1):
+        index = self.current_token_index + offset
+        if index < len(self.tokens):
+            return self.tokens[index]
+        return self.tokens[-1]
+
     def advance(self):
         self.current_token_index += 1
         return self.current_token()
@@ -402,6 +867,28 @@ class Parser:
         token = self.current_token()
         raise Exception(f"Erreur de syntaxe à L{token.line} C{token.column}: {message} (Token: {token.type}, Valeur: '{token.value}')")
 
+    def run(self, routine):
+        """Exécute une routine d'analyse (générateur) sans récursion Python.
+
+        Une routine délègue une sous-analyse en produisant (yield) la routine correspondante,
+        dont le résultat lui est renvoyé par send(). Les routines en cours sont gardées dans
+        une pile explicite : la profondeur d'imbrication du programme ne dépend plus de la
+        limite de récursion de Python.
+        """
+        stack = [routine]
+        result = None
+        while True:
+            try:
+                child = stack[-1].send(result)
+            except StopIteration as done:
+                stack.pop()
+                result = done.value
+                if not stack:
+                    return result
+            else:
+                stack.append(child)
+                result = None
+
     def parse_program(self):
         statements = []
         while self.current_token().type != TOKEN_TYPES['EOF']:
@@ -413,22 +900,59 @@ class Parser:
                 self.advance()
         return ProgramNode(statements)
 
+    # Points d'entrée : chaque analyse imbriquante est une routine exécutée par run()
     def parse_statement(self):
+        return self.run(self._parse_statement())
+
+    def parse_expression(self, min_precedence=1):
+        return self.run(self._parse_expression(min_precedence))
+
+    def parse_factor(self):
+        return self.run(self._parse_factor())
+
+    def parse_list_literal(self):
+        return self.run(self._parse_list_literal())
+
+    def parse_dictionary_literal(self):
+        return self.run(self._parse_dictionary_literal())
+
+    def parse_print_statement(self):
+        return self.run(self._parse_print_statement())
+
+    def parse_input_function_call(self):
+        return self.run(self._parse_input_function_call())
+
+    def parse_function_call(self):
+        return self.run(self._parse_function_call())
+
+    def parse_function_declaration(self):
+        return self.run(self._parse_function_declaration())
+
+    def parse_return_statement(self):
+        return self.run(self._parse_return_statement())
+
+    def parse_if_statement(self):
+        return self.run(self._parse_if_statement())
+
+    def parse_while_statement(self):
+        return self.run(self._parse_while_statement())
+
+    def _parse_statement(self):
         token = self.current_token()
 
         if token.type == TOKEN_TYPES['KEYWORD']:
             if token.value == 'func':
-                return self.parse_function_declaration()
+                return (yield self._parse_function_declaration())
             elif token.value == 'if':
-                return self.parse_if_statement()
+                return (yield self._parse_if_statement())
             elif token.value == 'while':
-                return self.parse_while_statement()
+                return (yield self._parse_while_statement())
             elif token.value == 'print':
-                return self.parse_print_statement()
+                return (yield self._parse_print_statement())
             elif token.value == 'input':
                 self.error("L'instruction 'input' doit être assignée à une variable ou utilisée dans une expression.")
             elif token.value == 'return':
-                return self.parse_return_statement()
+                return (yield self._parse_return_statement())
             elif token.value == 'import':
                 return self.parse_import_statement()
             elif token.value in {'and', 'or', 'not', 'in'}:
@@ -445,12 +969,9 @@ class Parser:
             # Il est plus robuste d'analyser l'expression de gauche (qui peut être un SubscriptNode)
             # puis de voir si un '=' suit.
 
-            # Sauvegarder la position actuelle pour pouvoir revenir en arrière si ce n'est pas une affectation
-            start_index = self.current_token_index 
-            
             # Tenter d'analyser ce qui pourrait être la L-value d'une affectation (Identifier ou Subscript)
             # Ou ce qui pourrait être le début d'une expression comme un appel de fonction
-            temp_node = self.parse_factor() # Appelle parse_factor pour gérer les identifiants et les subscripting
+            temp_node = yield self._parse_factor() # Analyse le facteur pour gérer les identifiants et les subscripting
 
             # Après avoir analysé le 'temp_node', si le token suivant est '=', c'est une affectation.
             if self.current_token().type == TOKEN_TYPES['OPERATOR'] and self.current_token().value == '=':
@@ -460,7 +981,7 @@ class Parser:
                     self.error(f"Cible d'affectation invalide. Attendu un identifiant ou une expression d'indexation.")
                 
                 assignment_op_token = self.eat(TOKEN_TYPES['OPERATOR'], '=')
-                expression_node = self.parse_expression()
+                expression_node = yield self._parse_expression()
                 self.eat(TOKEN_TYPES['DELIMITER'], ';')
                 return AssignmentNode(temp_node, expression_node, assignment_op_token)
             elif isinstance(temp_node, FunctionCallNode):
@@ -477,155 +998,146 @@ class Parser:
 
         self.error(f"Instruction non reconnue ou syntaxe invalide. Token: {token.type}, Valeur: '{token.value}'")
 
+    def _parse_block_body(self):
+        """Instructions d'un bloc, jusqu'au '}' fermant (non consommé)."""
+        statements = []
+        while not (self.current_token().type == TOKEN_TYPES['DELIMITER'] and self.current_token().value == '}'):
+            statement = yield self._parse_statement()
+            if statement:
+                statements.append(statement)
+            while self.current_token().type == TOKEN_TYPES['NEWLINE'] or \
+                  (self.current_token().type == TOKEN_TYPES['DELIMITER'] and self.current_token().value == ';'):
+                self.advance()
+        return statements
 
-    def parse_expression(self):
-        return self.parse_logical_or_expression()
-
-    def parse_logical_or_expression(self):
-        node = self.parse_logical_and_expression()
-        while self.current_token().type == TOKEN_TYPES['KEYWORD'] and self.current_token().value == 'or':
-            op_token = self.eat(TOKEN_TYPES['KEYWORD'], 'or')
-            right = self.parse_logical_and_expression()
-            node = BinaryOpNode(node, op_token, right)
-        return node
-
-    def parse_logical_and_expression(self):
-        node = self.parse_comparison_expression()
-        while self.current_token().type == TOKEN_TYPES['KEYWORD'] and self.current_token().value == 'and':
-            op_token = self.eat(TOKEN_TYPES['KEYWORD'], 'and')
-            right = self.parse_comparison_expression()
-            node = BinaryOpNode(node, op_token, right)
-        return node
-
-    def parse_comparison_expression(self):
-        node = self.parse_arithmetic_expression()
-        
+    def _parse_expression(self, min_precedence=1):
+        """Analyse par priorités pilotée par BINARY_PRECEDENCE, avec une pile d'opérateurs explicite."""
+        operands = []
+        operators = []
         while True:
-            current_token = self.current_token()
-            op_value = current_token.value
-            op_type = current_token.type
-
-            is_comparison_op = (op_type == TOKEN_TYPES['OPERATOR'] and op_value in ['==', '!=', '>', '<', '>=', '<='])
-            is_in_op = (op_type == TOKEN_TYPES['KEYWORD'] and op_value == 'in')
-            is_not_in_op = False
-            
-            # Vérifier 'not in' avec prudence pour ne pas aller au-delà des tokens
-            if op_type == TOKEN_TYPES['KEYWORD'] and op_value == 'not':
-                if self.current_token_index + 1 < len(self.tokens) and \
-                   self.tokens[self.current_token_index + 1].type == TOKEN_TYPES['KEYWORD'] and \
-                   self.tokens[self.current_token_index + 1].value == 'in':
-                    is_not_in_op = True
+            node = self.parse_leaf()
+            if node is None:
+                node = yield self._parse_factor()
+            operands.append(node)
 
-            if not (is_comparison_op or is_in_op or is_not_in_op):
-                break 
-
-            op_token = current_token
-
-            if is_not_in_op:
-                self.eat(TOKEN_TYPES['KEYWORD'], 'not')
-                self.eat(TOKEN_TYPES['KEYWORD'], 'in')
+            op_token = self.current_token()
+            precedence = BINARY_PRECEDENCE[op_token.kind]
+            if precedence < min_precedence:
+                break
+            if op_token.kind == KIND_NOT:
+                # 'not' n'est binaire que suivi de 'in'
+                if self.peek_token().kind != KIND_IN:
+                    break
+                self.advance()
+                self.advance()
                 op_token.value = 'not in' # Change value for AST representation
             else:
                 self.advance()
-            
-            right = self.parse_arithmetic_expression()
-            node = BinaryOpNode(node, op_token, right)
-            
-        return node
-
-    def parse_arithmetic_expression(self):
-        node = self.parse_term()
-        while self.current_token().type == TOKEN_TYPES['OPERATOR'] and \
-              self.current_token().value in ['+', '-']:
-            op_token = self.current_token()
+            # Tous les opérateurs sont associatifs à gauche : on réduit ceux de priorité supérieure ou égale
+            while operators and BINARY_PRECEDENCE[operators[-1].kind] >= precedence:
+                right = operands.pop()
+                operands[-1] = BinaryOpNode(operands[-1], operators.pop(), right)
+            operators.append(op_token)
+
+        while operators:
+            right = operands.pop()
+            operands[-1] = BinaryOpNode(operands[-1], operators.pop(), right)
+        return operands[0]
+
+    def parse_leaf(self):
+        """Identifiant, nombre ou chaîne isolé (ni appel ni indexation) ; None pour tout autre facteur."""
+        token = self.current_token()
+        kind = token.kind
+        if kind == KIND_IDENTIFIER:
+            if self.peek_token().kind in (KIND_LPAREN, KIND_LBRACKET):
+                return None
             self.advance()
-            right = self.parse_term()
-            node = BinaryOpNode(node, op_token, right)
-        return node
+            return IdentifierNode(token)
+        if kind == KIND_INT_LITERAL or kind == KIND_FLOAT_LITERAL or kind == KIND_STR_LITERAL:
+            if self.peek_token().kind == KIND_LBRACKET:
+                return None
+            self.advance()
+            return StringNode(token) if kind == KIND_STR_LITERAL else NumberNode(token)
+        return None
 
-    def parse_term(self):
-        node = self.parse_factor()
-        while self.current_token().type == TOKEN_TYPES['OPERATOR'] and \
-              self.current_token().value in ['*', '/', '//', '**', '///', '%']:
-            op_token = self.current_token()
+    def _parse_factor(self):
+        # Les 'not' préfixes sont empilés puis appliqués autour du facteur qui les suit
+        not_tokens = []
+        while self.current_token().kind == KIND_NOT:
+            not_tokens.append(self.current_token())
             self.advance()
-            right = self.parse_factor()
-            node = BinaryOpNode(node, op_token, right)
-        return node
 
-    def parse_factor(self):
         token = self.current_token()
+        kind = token.kind
         node = None
 
-        if token.type == TOKEN_TYPES['INT_LITERAL'] or token.type == TOKEN_TYPES['FLOAT_LITERAL']:
+        if kind == KIND_IDENTIFIER:
+            if self.peek_token().kind == KIND_LPAREN:
+                node = yield self._parse_function_call()
+            else:
+                self.advance()
+                node = IdentifierNode(token)
+        elif kind == KIND_INT_LITERAL or kind == KIND_FLOAT_LITERAL:
             self.advance()
             node = NumberNode(token)
-        elif token.type == TOKEN_TYPES['STR_LITERAL']:
+        elif kind == KIND_STR_LITERAL:
             self.advance()
             node = StringNode(token)
-        elif token.type == TOKEN_TYPES['KEYWORD'] and token.value == 'none':
+        elif kind == KIND_LPAREN:
             self.advance()
-            node = NoneNode(token)
-        elif token.type == TOKEN_TYPES['IDENTIFIER']:
-            if self.current_token_index + 1 < len(self.tokens) and \
-               self.tokens[self.current_token_index + 1].type == TOKEN_TYPES['DELIMITER'] and \
-               self.tokens[self.current_token_index + 1].value == '(':
-                node = self.parse_function_call()
-            else:
-                self.advance()
-                node = IdentifierNode(token)
-        elif token.type == TOKEN_TYPES['DELIMITER'] and token.value == '(':
-            self.eat(TOKEN_TYPES['DELIMITER'], '(')
-            node = self.parse_expression()
+            node = yield self._parse_expression()
             self.eat(TOKEN_TYPES['DELIMITER'], ')')
-        elif token.type == TOKEN_TYPES['DELIMITER'] and token.value == '[':
-            node = self.parse_list_literal()
-        elif token.type == TOKEN_TYPES['DELIMITER'] and token.value == '||':
-            node = self.parse_dictionary_literal()
-        elif token.type == TOKEN_TYPES['KEYWORD'] and token.value == 'not':
-            op_token = self.eat(TOKEN_TYPES['KEYWORD'], 'not')
-            operand = self.parse_factor()
-            node = UnaryOpNode(op_token, operand)
-        elif token.type == TOKEN_TYPES['KEYWORD'] and token.value == 'input':
-            node = self.parse_input_function_call()
-        elif token.type == TOKEN_TYPES['TYPE_KEYWORD'] and token.value in {'int', 'float', 'STR'}:
-            type_token = self.advance()
+        elif kind == KIND_LBRACKET:
+            node = yield self._parse_list_literal()
+        elif kind == KIND_DOUBLE_BAR:
+            node = yield self._parse_dictionary_literal()
+        elif kind == KIND_INPUT:
+            node = yield self._parse_input_function_call()
+        elif kind in CONVERSION_KINDS:
+            type_token = token
+            self.advance()
             self.eat(TOKEN_TYPES['DELIMITER'], '(')
-            expression_to_convert = self.parse_expression()
+            expression_to_convert = yield self._parse_expression()
             self.eat(TOKEN_TYPES['DELIMITER'], ')')
             node = TypeConversionNode(type_token, expression_to_convert)
+        elif kind == KIND_NONE:
+            self.advance()
+            node = NoneNode(token)
         else:
             self.error(f"Expression inattendue. Token: {token.type}, Valeur: '{token.value}'")
 
-        while self.current_token().type == TOKEN_TYPES['DELIMITER'] and self.current_token().value == '[':
-            bracket_token = self.eat(TOKEN_TYPES['DELIMITER'], '[')
-            index_expr = self.parse_expression()
+        while self.current_token().kind == KIND_LBRACKET:
+            bracket_token = self.current_token()
+            self.advance()
+            index_expr = yield self._parse_expression()
             self.eat(TOKEN_TYPES['DELIMITER'], ']')
             node = SubscriptNode(node, index_expr, bracket_token)
-            
+
+        for not_token in reversed(not_tokens):
+            node = UnaryOpNode(not_token, node)
         return node
 
 
-    def parse_list_literal(self):
+    def _parse_list_literal(self):
         list_token = self.eat(TOKEN_TYPES['DELIMITER'], '[')
         elements = []
         if self.current_token().type != TOKEN_TYPES['DELIMITER'] or self.current_token().value != ']':
-            elements.append(self.parse_expression())
+            elements.append((yield self._parse_expression()))
             while self.current_token().type == TOKEN_TYPES['DELIMITER'] and self.current_token().value == ',':
                 self.eat(TOKEN_TYPES['DELIMITER'], ',')
-                elements.append(self.parse_expression())
+                elements.append((yield self._parse_expression()))
         self.eat(TOKEN_TYPES['DELIMITER'], ']')
         return ListNode(elements, list_token)
 
-    def parse_dictionary_literal(self):
+    def _parse_dictionary_literal(self):
         dict_token = self.eat(TOKEN_TYPES['DELIMITER'], '||')
         pairs = []
         if self.current_token().type != TOKEN_TYPES['DELIMITER'] or self.current_token().value != '||':
             while True:
-                key_node = self.parse_expression()
+                key_node = yield self._parse_expression()
                 
                 self.eat(TOKEN_TYPES['DELIMITER'], ':')
-                value_node = self.parse_expression()
+                value_node = yield self._parse_expression()
                 pairs.append((key_node, value_node))
                 
                 if self.current_token().type == TOKEN_TYPES['DELIMITER'] and self.current_token().value == ',':
@@ -635,29 +1147,29 @@ class Parser:
         self.eat(TOKEN_TYPES['DELIMITER'], '||')
         return DictionaryNode(pairs, dict_token)
 
-    def parse_print_statement(self):
+    def _parse_print_statement(self):
         print_token = self.eat(TOKEN_TYPES['KEYWORD'], 'print')
         self.eat(TOKEN_TYPES['DELIMITER'], '(')
         
         expressions = []
-        expressions.append(self.parse_expression())
+        expressions.append((yield self._parse_expression()))
         while self.current_token().type == TOKEN_TYPES['DELIMITER'] and self.current_token().value == ',':
             self.eat(TOKEN_TYPES['DELIMITER'], ',')
-            expressions.append(self.parse_expression())
+            expressions.append((yield self._parse_expression()))
             
         self.eat(TOKEN_TYPES['DELIMITER'], ')')
         self.eat(TOKEN_TYPES['DELIMITER'], ';')
         
         return PrintStatementNode(expressions, print_token)
 
-    def parse_input_function_call(self):
+    def _parse_input_function_call(self):
         input_token = self.eat(TOKEN_TYPES['KEYWORD'], 'input')
         self.eat(TOKEN_TYPES['DELIMITER'], '(')
-        prompt_expr = self.parse_expression()
+        prompt_expr = yield self._parse_expression()
         self.eat(TOKEN_TYPES['DELIMITER'], ')')
         return InputFunctionCallNode(prompt_expr, input_token)
 
-    def parse_function_call(self):
+    def _parse_function_call(self):
         identifier_token = self.eat(TOKEN_TYPES['IDENTIFIER'])
         identifier_node = IdentifierNode(identifier_token)
         
@@ -665,16 +1177,16 @@ class Parser:
         
         arguments = []
         if self.current_token().type != TOKEN_TYPES['DELIMITER'] or self.current_token().value != ')':
-            arguments.append(self.parse_expression())
+            arguments.append((yield self._parse_expression()))
             while self.current_token().type == TOKEN_TYPES['DELIMITER'] and self.current_token().value == ',':
                 self.eat(TOKEN_TYPES['DELIMITER'], ',')
-                arguments.append(self.parse_expression())
+                arguments.append((yield self._parse_expression()))
                 
         self.eat(TOKEN_TYPES['DELIMITER'], ')')
         
         return FunctionCallNode(identifier_node, arguments, identifier_token)
 
-    def parse_function_declaration(self):
+    def _parse_function_declaration(self):
         func_token = self.eat(TOKEN_TYPES['KEYWORD'], 'func')
         identifier_token = self.eat(TOKEN_TYPES['IDENTIFIER'])
         identifier_node = IdentifierNode(identifier_token)
@@ -691,61 +1203,40 @@ class Parser:
         self.eat(TOKEN_TYPES['DELIMITER'], ')')
         self.eat(TOKEN_TYPES['DELIMITER'], '{')
         
-        body_statements = []
-        while not (self.current_token().type == TOKEN_TYPES['DELIMITER'] and self.current_token().value == '}'):
-            statement = self.parse_statement()
-            if statement:
-                body_statements.append(statement)
-            while self.current_token().type == TOKEN_TYPES['NEWLINE'] or \
-                  (self.current_token().type == TOKEN_TYPES['DELIMITER'] and self.current_token().value == ';'):
-                self.advance()
+        body_statements = yield self._parse_block_body()
 
         self.eat(TOKEN_TYPES['DELIMITER'], '}')
         self.eat(TOKEN_TYPES['DELIMITER'], ';')
         
         return FunctionDeclarationNode(identifier_node, parameters, body_statements, func_token)
 
-    def parse_return_statement(self):
+    def _parse_return_statement(self):
         return_token = self.eat(TOKEN_TYPES['KEYWORD'], 'return')
         expression = None
         if self.current_token().type != TOKEN_TYPES['DELIMITER'] or self.current_token().value != ';':
-            expression = self.parse_expression()
+            expression = yield self._parse_expression()
         self.eat(TOKEN_TYPES['DELIMITER'], ';')
         return ReturnStatementNode(expression, return_token)
 
-    def parse_if_statement(self):
+    def _parse_if_statement(self):
         if_token = self.eat(TOKEN_TYPES['KEYWORD'], 'if')
         self.eat(TOKEN_TYPES['DELIMITER'], '(')
-        condition = self.parse_expression()
+        condition = yield self._parse_expression()
         self.eat(TOKEN_TYPES['DELIMITER'], ')')
         self.eat(TOKEN_TYPES['DELIMITER'], '{')
         
-        if_body = []
-        while not (self.current_token().type == TOKEN_TYPES['DELIMITER'] and self.current_token().value == '}'):
-            statement = self.parse_statement()
-            if statement:
-                if_body.append(statement)
-            while self.current_token().type == TOKEN_TYPES['NEWLINE'] or \
-                  (self.current_token().type == TOKEN_TYPES['DELIMITER'] and self.current_token().value == ';'):
-                self.advance()
+        if_body = yield self._parse_block_body()
         self.eat(TOKEN_TYPES['DELIMITER'], '}')
         
         elif_branches = []
         while self.current_token().type == TOKEN_TYPES['KEYWORD'] and self.current_token().value == 'elif':
             elif_token = self.eat(TOKEN_TYPES['KEYWORD'], 'elif')
             self.eat(TOKEN_TYPES['DELIMITER'], '(')
-            elif_condition = self.parse_expression()
+            elif_condition = yield self._parse_expression()
             self.eat(TOKEN_TYPES['DELIMITER'], ')')
             self.eat(TOKEN_TYPES['DELIMITER'], '{')
             
-            elif_body = []
-            while not (self.current_token().type == TOKEN_TYPES['DELIMITER'] and self.current_token().value == '}'):
-                statement = self.parse_statement()
-                if statement:
-                    elif_body.append(statement)
-                while self.current_token().type == TOKEN_TYPES['NEWLINE'] or \
-                      (self.current_token().type == TOKEN_TYPES['DELIMITER'] and self.current_token().value == ';'):
-                    self.advance()
+            elif_body = yield self._parse_block_body()
             self.eat(TOKEN_TYPES['DELIMITER'], '}')
             elif_branches.append((elif_condition, elif_body))
         
@@ -754,34 +1245,20 @@ class Parser:
             self.eat(TOKEN_TYPES['KEYWORD'], 'else')
             self.eat(TOKEN_TYPES['DELIMITER'], '{')
             
-            else_body = []
-            while not (self.current_token().type == TOKEN_TYPES['DELIMITER'] and self.current_token().value == '}'):
-                statement = self.parse_statement()
-                if statement:
-                    else_body.append(statement)
-                while self.current_token().type == TOKEN_TYPES['NEWLINE'] or \
-                      (self.current_token().type == TOKEN_TYPES['DELIMITER'] and self.current_token().value == ';'):
-                    self.advance()
+            else_body = yield self._parse_block_body()
             self.eat(TOKEN_TYPES['DELIMITER'], '}')
         
         self.eat(TOKEN_TYPES['DELIMITER'], ';')
         return IfStatementNode(condition, if_body, elif_branches, else_body, if_token)
 
-    def parse_while_statement(self):
+    def _parse_while_statement(self):
         while_token = self.eat(TOKEN_TYPES['KEYWORD'], 'while')
         self.eat(TOKEN_TYPES['DELIMITER'], '(')
-        condition = self.parse_expression()
+        condition = yield self._parse_expression()
         self.eat(TOKEN_TYPES['DELIMITER'], ')')
         self.eat(TOKEN_TYPES['DELIMITER'], '{')
         
-        body_statements = []
-        while not (self.current_token().type == TOKEN_TYPES['DELIMITER'] and self.current_token().value == '}'):
-            statement = self.parse_statement()
-            if statement:
-                body_statements.append(statement)
-            while self.current_token().type == TOKEN_TYPES['NEWLINE'] or \
-                  (self.current_token().type == TOKEN_TYPES['DELIMITER'] and self.current_token().value == ';'):
-                self.advance()
+        body_statements = yield self._parse_block_body()
         self.eat(TOKEN_TYPES['DELIMITER'], '}')
         self.eat(TOKEN_TYPES['DELIMITER'], ';')
         return WhileStatementNode(condition, body_statements, while_token)
@@ -793,12 +1270,45 @@ class Parser:
         return ImportStatementNode(file_path_token, import_token)
 
 
+class StreamingParser(Parser):
+    """Parser alimenté par un itérateur de tokens (ex: lex_file) à travers un petit tampon d'anticipation.
+
+    Les tokens déjà consommés sont libérés : la mémoire dépend de l'anticipation, pas du nombre de tokens.
+    """
+    def __init__(self, token_iterator):
+        super().__init__([])
+        self.token_iterator = iter(token_iterator)
+        self.buffer = deque()
+        self.buffer_start = 0 # Index absolu du premier token du tampon
+        self.last_token = None
+
+    def token_at(self, index):
+        while self.buffer_start < self.current_token_index and self.buffer:
+            self.buffer.popleft()
+            self.buffer_start += 1
+        while index >= self.buffer_start + len(self.buffer):
+            if self.last_token is not None and self.last_token.type == TOKEN_TYPES['EOF']:
+                return self.last_token
+            self.last_token = next(self.token_iterator)
+            self.buffer.append(self.last_token)
+        return self.buffer[index - self.buffer_start]
+
+    def current_token(self):
+        return self.token_at(self.current_token_index)
+
+    def peek_token(self, offset=1):
+        return self.token_at(self.current_token_index + offset)
+
+
 # --- Classes pour l'Analyse Sémantique ---
 class Symbol:
     def __init__(self, name, type=None, value=None):
         self.name = name
         self.type = type
         self.value = value
+        self.level = None # Niveau de fonction de la table qui le déclare
+        self.slot = None # Index dans le cadre de cette fonction
+        self.module = None # Chemin du module d'origine pour un symbole importé
 
     def __repr__(self):
         return f"<Symbol: {self.name}, Type: {self.type}>"
@@ -822,10 +1332,18 @@ class VariableSymbol(Symbol):
 
 
 class SymbolTable:
+    """Portées d'une fonction (ou du programme) : un cadre dont chaque symbole déclaré reçoit un slot.
+
+    Les portées de bloc (if, while) partagent le cadre de leur fonction ; deux blocs frères
+    ont des slots distincts. `level` compte les fonctions englobantes.
+    """
     def __init__(self, parent=None):
         self.scopes = [{}]
+        self.visible = {} # Nom -> symboles qui le déclarent, du plus externe au plus interne
         self.parent = parent
         self.depth = 0 if parent is None else parent.depth + 1
+        self.level = 0 if parent is None else parent.level + 1
+        self.slots = 0 # Taille du cadre : nombre de symboles déclarés
 
     def enter_scope(self):
         self.scopes.append({})
@@ -833,7 +1351,11 @@ class SymbolTable:
 
     def exit_scope(self):
         if len(self.scopes) > 1:
-            self.scopes.pop()
+            for name in self.scopes.pop():
+                shadowed = self.visible[name]
+                shadowed.pop()
+                if not shadowed:
+                    del self.visible[name]
             self.depth -= 1
         else:
             raise Exception("Impossible de sortir de la portée globale.")
@@ -843,84 +1365,158 @@ class SymbolTable:
         if symbol.name in current_scope:
             raise Exception(f"Erreur sémantique: Le symbole '{symbol.name}' est déjà déclaré dans cette portée.")
         current_scope[symbol.name] = symbol
+        self.visible.setdefault(symbol.name, []).append(symbol)
+        symbol.level = self.level
+        symbol.slot = self.slots
+        self.slots += 1
+
+    def resolve(self, identifier, symbol):
+        """Annote un IdentifierNode avec la position (depth, slot) de `symbol` vue depuis cette table."""
+        identifier.depth = self.level - symbol.level
+        identifier.slot = symbol.slot
 
     def lookup(self, name):
-        for scope in reversed(self.scopes):
-            if name in scope:
-                return scope[name]
-        
-        if self.parent:
-            return self.parent.lookup(name)
-            
+        # Le symbole visible est le dernier déclaré : pas de parcours des portées imbriquées
+        table = self
+        while table is not None:
+            symbols = table.visible.get(name)
+            if symbols:
+                return symbols[-1]
+            table = table.parent # Remonte aux portées englobantes sans récursion
         return None
 
 
-class SemanticAnalyzer:
-    def __init__(self):
-        self.global_symbol_table = SymbolTable()
+# --- Parcours de l'AST ---
+def iter_child_nodes(node):
+    """Enfants directs de `node`, dans l'ordre de ses `_fields` (listes et tuples dépliés)."""
+    for name in node._fields:
+        child = getattr(node, name)
+        if isinstance(child, ASTNode):
+            yield child
+        elif isinstance(child, (list, tuple)):
+            pending = [iter(child)]
+            while pending:
+                item = next(pending[-1], _NO_CHILD)
+                if item is _NO_CHILD:
+                    pending.pop()
+                elif isinstance(item, ASTNode):
+                    yield item
+                elif isinstance(item, (list, tuple)):
+                    pending.append(iter(item))
+
+_NO_CHILD = object()
+
+def count_nodes(node):
+    """Nombre de nœuds de l'arbre de racine `node` (parcours itératif)."""
+    count = 0
+    pending = [node]
+    while pending:
+        count += 1
+        pending.extend(iter_child_nodes(pending.pop()))
+    return count
+
+class NodeVisitor:
+    """Base des passes sur l'AST.
+
+    visit() répartit chaque nœud vers visit_<Classe>, ou generic_visit à défaut, via une
+    table par classe de visiteur remplie à la première rencontre de chaque classe de nœud.
+    Le parcours n'est pas récursif : une méthode visit_* qui a des enfants est un générateur
+    qui les produit (yield) un à un et reçoit en retour le résultat de leur visite
+    (`valeur = yield enfant`) ; son propre résultat est sa valeur de retour. Une méthode
+    ordinaire (sans yield) est une feuille dont le résultat est la valeur renvoyée.
+    """
+    _dispatch = {} # Classe de nœud -> méthode ; chaque sous-classe a la sienne
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._dispatch = {}
+
+    def visitor_method(self, node_class):
+        """Méthode (non liée) qui visite les nœuds de `node_class`."""
+        method = self._dispatch.get(node_class)
+        if method is None:
+            method = getattr(type(self), node_class._visit_name, type(self).generic_visit)
+            self._dispatch[node_class] = method
+        return method
+
+    def visit(self, node):
+        pending = []
+        result = None
+        while True:
+            if node is not None:
+                method = self._dispatch.get(node.__class__) or self.visitor_method(node.__class__)
+                result = method(self, node)
+                if type(result) is GeneratorType:
+                    pending.append(result)
+                    result = None
+            if not pending:
+                return result
+            try:
+                node = pending[-1].send(result)
+                result = None
+            except StopIteration as done:
+                pending.pop()
+                node = None
+                result = done.value
+
+    def generic_visit(self, node):
+        return iter_child_nodes(node) # Générateur : visite chaque enfant, sans résultat
+
+
+class SemanticAnalyzer(NodeVisitor):
+    """Analyse sémantique. Les imports ne sont résolus qu'avec un chargeur de modules (`loader`,
+    voir tourte_modules.ModuleLoader) et le chemin `path` du fichier analysé ; sinon ils sont ignorés."""
+    def __init__(self, loader=None, path=None, symbol_table_class=SymbolTable):
+        self.symbol_table_class = symbol_table_class # Sous-classe possible, ex: comptage des recherches (tourte_stats)
+        self.global_symbol_table = symbol_table_class()
         self.current_symbol_table = self.global_symbol_table
         self.errors = []
+        self.loader = loader
+        self.path = path
 
     def error(self, node, message):
         line = node.token.line if node.token else "Inconnu"
         column = node.token.column if node.token else "Inconnu"
         self.errors.append(f"Erreur sémantique à L{line} C{column}: {message}")
 
-    def analyze(self, ast):
+    def analyze(self, ast, verbose=True):
+        """Analyse l'AST ; sans `verbose`, rien n'est affiché et les erreurs sont jointes à l'exception."""
         self.visit(ast)
         if self.errors:
+            if not verbose:
+                raise Exception("Analyse sémantique échouée en raison d'erreurs.\n" + "\n".join(self.errors))
             print("\n--- Erreurs sémantiques détectées ---")
             for err in self.errors:
                 print(err)
             raise Exception("Analyse sémantique échouée en raison d'erreurs.")
-        print("\n--- Analyse sémantique terminée avec succès ---")
-
-    def visit(self, node):
-        if node is None:
-            return
-        
-        method_name = 'visit_' + node.__class__.__name__
-        visitor_method = getattr(self, method_name, self.generic_visit)
-        return visitor_method(node)
-
-    def generic_visit(self, node):
-        for attr_name in dir(node):
-            if not attr_name.startswith('__') and not callable(getattr(node, attr_name)):
-                attr = getattr(node, attr_name)
-                if isinstance(attr, ASTNode):
-                    self.visit(attr)
-                elif isinstance(attr, list):
-                    for item in attr:
-                        if isinstance(item, ASTNode):
-                            self.visit(item)
-                        elif isinstance(item, tuple) and all(isinstance(elem, ASTNode) for elem in item):
-                            for elem in item:
-                                self.visit(elem)
-
+        if verbose:
+            print("\n--- Analyse sémantique terminée avec succès ---")
 
     def visit_ProgramNode(self, node):
-        for statement in node.statements:
-            self.visit(statement)
+        yield from node.statements
+        node.frame_size = self.current_symbol_table.slots
 
     def visit_FunctionDeclarationNode(self, node):
         func_symbol = FunctionSymbol(node.identifier.name, parameters=[VariableSymbol(p.name) for p in node.parameters])
         self.current_symbol_table.declare(func_symbol)
+        self.current_symbol_table.resolve(node.identifier, func_symbol)
 
-        function_scope_table = SymbolTable(parent=self.current_symbol_table)
+        function_scope_table = self.symbol_table_class(parent=self.current_symbol_table)
         old_symbol_table = self.current_symbol_table
         self.current_symbol_table = function_scope_table
 
         for param in node.parameters:
             param_symbol = VariableSymbol(param.name)
             self.current_symbol_table.declare(param_symbol)
+            self.current_symbol_table.resolve(param, param_symbol)
 
-        for statement in node.body_statements:
-            self.visit(statement)
+        yield from node.body_statements
 
+        node.frame_size = function_scope_table.slots
         self.current_symbol_table = old_symbol_table
 
     def visit_AssignmentNode(self, node):
-        self.visit(node.expression) # Visiter l'expression de droite
+        yield node.expression # Visiter l'expression de droite
 
         if isinstance(node.identifier, IdentifierNode):
             symbol = self.current_symbol_table.lookup(node.identifier.name)
@@ -928,58 +1524,58 @@ class SemanticAnalyzer:
                 # Si non déclaré, le déclarer comme une nouvelle variable
                 var_symbol = VariableSymbol(node.identifier.name)
                 self.current_symbol_table.declare(var_symbol)
+                self.current_symbol_table.resolve(node.identifier, var_symbol)
             elif not isinstance(symbol, VariableSymbol):
                 # Si c'est un autre type de symbole (ex: fonction), c'est une erreur de réassignation
                 self.error(node, f"Le symbole '{node.identifier.name}' est déjà déclaré comme une fonction et ne peut être réassigné.")
-            # else: C'est une réassignation à une variable existante, ce qui est OK
+            else:
+                # C'est une réassignation à une variable existante, ce qui est OK
+                self.current_symbol_table.resolve(node.identifier, symbol)
         elif isinstance(node.identifier, SubscriptNode):
             # Pour l'affectation à un élément de liste/dictionnaire (ex: maListe[0] = 10;)
             # On visite les composants du SubscriptNode pour s'assurer que 'maListe' et '0' sont valides
-            self.visit(node.identifier.target)
-            self.visit(node.identifier.index_expr)
+            yield node.identifier.target
+            yield node.identifier.index_expr
 
 
     def visit_IdentifierNode(self, node):
         symbol = self.current_symbol_table.lookup(node.name)
         if symbol is None:
             self.error(node, f"Utilisation d'un identifiant non déclaré: '{node.name}'.")
+        else:
+            self.current_symbol_table.resolve(node, symbol)
 
     def visit_PrintStatementNode(self, node):
-        for expr in node.expressions:
-            self.visit(expr)
+        yield from node.expressions
 
     def visit_BinaryOpNode(self, node):
-        self.visit(node.left)
-        self.visit(node.right)
+        yield node.left
+        yield node.right
 
     def visit_UnaryOpNode(self, node):
-        self.visit(node.operand)
+        yield node.operand
 
     def visit_IfStatementNode(self, node):
-        self.visit(node.condition)
+        yield node.condition
         self.current_symbol_table.enter_scope()
-        for stmt in node.if_body:
-            self.visit(stmt)
+        yield from node.if_body
         self.current_symbol_table.exit_scope()
 
         for cond, body in node.elif_branches:
-            self.visit(cond)
+            yield cond
             self.current_symbol_table.enter_scope()
-            for stmt in body:
-                self.visit(stmt)
+            yield from body
             self.current_symbol_table.exit_scope()
 
         if node.else_body:
             self.current_symbol_table.enter_scope()
-            for stmt in node.else_body:
-                self.visit(stmt)
+            yield from node.else_body
             self.current_symbol_table.exit_scope()
 
     def visit_WhileStatementNode(self, node):
-        self.visit(node.condition)
+        yield node.condition
         self.current_symbol_table.enter_scope()
-        for stmt in node.body_statements:
-            self.visit(stmt)
+        yield from node.body_statements
         self.current_symbol_table.exit_scope()
 
     def visit_FunctionCallNode(self, node):
@@ -989,34 +1585,33 @@ class SemanticAnalyzer:
         elif not isinstance(func_symbol, FunctionSymbol):
             self.error(node, f"'{node.identifier.name}' n'est pas une fonction et ne peut être appelée.")
         else:
+            self.current_symbol_table.resolve(node.identifier, func_symbol)
             if len(node.arguments) != len(func_symbol.parameters):
                 self.error(node, f"Nombre d'arguments incorrect pour l'appel de '{func_symbol.name}'. Attendu {len(func_symbol.parameters)}, trouvé {len(node.arguments)}.")
 
-        for arg in node.arguments:
-            self.visit(arg)
+        yield from node.arguments
 
     def visit_ReturnStatementNode(self, node):
         if node.expression:
-            self.visit(node.expression)
+            yield node.expression
 
     def visit_InputFunctionCallNode(self, node):
-        self.visit(node.prompt_expr)
+        yield node.prompt_expr
 
     def visit_TypeConversionNode(self, node):
-        self.visit(node.expression)
+        yield node.expression
 
     def visit_ListNode(self, node):
-        for element in node.elements:
-            self.visit(element)
+        yield from node.elements
 
     def visit_DictionaryNode(self, node):
         for key_node, value_node in node.pairs:
-            self.visit(key_node)
-            self.visit(value_node)
+            yield key_node
+            yield value_node
 
     def visit_SubscriptNode(self, node):
-        self.visit(node.target)
-        self.visit(node.index_expr)
+        yield node.target
+        yield node.index_expr
 
     def visit_NumberNode(self, node):
         pass 
@@ -1028,9 +1623,42 @@ class SemanticAnalyzer:
         pass 
 
     def visit_ImportStatementNode(self, node):
-        pass
+        if self.loader is None:
+            return # Sans chargeur de modules, l'import reste sans effet
+        module = self.loader.imported(node.file_path, self.path)
+        current_scope = self.current_symbol_table.scopes[-1]
+        bindings = []
+        for name, symbol in module.exports.items():
+            existing = current_scope.get(name)
+            if existing is not None:
+                if existing.module == module.path:
+                    # Même module importé deux fois dans cette portée : même liaison
+                    bindings.append((name, symbol.slot, existing.slot))
+                else:
+                    self.error(node, f"La fonction '{name}' importée de '{node.file_path}' est déjà déclarée dans cette portée.")
+                continue
+            imported = FunctionSymbol(name, symbol.parameters, symbol.return_type)
+            imported.module = module.path
+            self.current_symbol_table.declare(imported)
+            bindings.append((name, symbol.slot, imported.slot))
+        node.path = module.path
+        node.bindings = tuple(bindings)
 
 # --- Exemple d'utilisation ---
+if __name__ == "__main__" and len(sys.argv) > 1:
+    # Fichiers donnés en argument : compilation avec le cache disque (__tourtecache__)
+    from tourte_cache import compile_file # Import local : tourte_cache dépend de ce module
+    failed = False
+    for path in sys.argv[1:]:
+        try:
+            ast, cached = compile_file(path)
+            origin = "chargé depuis le cache" if cached else "analysé"
+            print(f"{path}: {len(ast.statements)} instruction(s), {origin}")
+        except Exception as e:
+            print(f"{path}: {e}")
+            failed = True
+    sys.exit(1 if failed else 0)
+
 if __name__ == "__main__":
     tourte_code_example = """
 # Ceci est un programme Tourte simple
@@ -0,0 +1,513 @@
+import operator
+import sys
+
+from tourte_compil import FunctionCallNode, NodeVisitor, NumberNode, StringNode, SubscriptNode
+from tourte_modules import ModuleLoader
+from tourte_types import infer_types, is_specialized
+
+# --- Valeurs et erreurs d'exécution ---
+class Function:
+    """Fonction Tourte : le corps compilé et le cadre dans lequel elle a été déclarée."""
+    __slots__ = ('name', 'locals', 'body', 'frame')
+    def __init__(self, name, locals, body, frame):
+        self.name = name
+        self.locals = locals # Slots du cadre d'un appel après les paramètres, tous à none
+        self.body = body
+        self.frame = frame
+
+    def __repr__(self):
+        return f"<func {self.name}>"
+
+TYPE_NAMES = {type(None): 'none', bool: 'bool', int: 'int', float: 'float', str: 'STR',
+              list: 'List', dict: 'Dictionary', Function: 'func'}
+
+def type_name(value):
+    return TYPE_NAMES.get(type(value), type(value).__name__)
+
+def format_value(value):
+    """Texte affiché par print() et produit par STR() ; les listes et dictionnaires s'affichent comme en Python."""
+    if value is None:
+        return 'none'
+    if type(value) is str:
+        return value
+    return str(value)
+
+def runtime_error(token, message):
+    if token is None:
+        return Exception(f"Erreur d'exécution: {message}")
+    return Exception(f"Erreur d'exécution à L{token.line} C{token.column}: {message}")
+
+def nth_root(value, n):
+    """value /// n : racine n-ième, exacte pour les puissances entières (27 /// 3 -> 3.0)."""
+    root = value ** (1 / n)
+    if type(root) is float:
+        nearest = round(root)
+        if nearest ** n == value:
+            return float(nearest)
+    return root
+
+# Opérateurs binaires, résolus une fois pour toutes à la compilation ('and', 'or', 'in' et
+# 'not in' sont compilés à part)
+BINARY_OPERATORS = {
+    '+': operator.add, '-': operator.sub, '*': operator.mul, '/': operator.truediv,
+    '//': operator.floordiv, '%': operator.mod, '**': operator.pow, '///': nth_root,
+    '==': operator.eq, '!=': operator.ne, '>': operator.gt, '<': operator.lt,
+    '>=': operator.ge, '<=': operator.le,
+}
+
+CONVERSIONS = {'int': int, 'float': float, 'STR': format_value}
+
+# Opérations dont les deux opérandes sont des nombres prouvés (tourte_types.is_specialized) :
+# l'opérateur Python est appliqué directement, sans appel de fonction ni rattrapage d'erreur
+NUMERIC_OPERATIONS = {
+    '+': lambda left, right: lambda frame: left(frame) + right(frame),
+    '-': lambda left, right: lambda frame: left(frame) - right(frame),
+    '*': lambda left, right: lambda frame: left(frame) * right(frame),
+    '==': lambda left, right: lambda frame: left(frame) == right(frame),
+    '!=': lambda left, right: lambda frame: left(frame) != right(frame),
+    '<': lambda left, right: lambda frame: left(frame) < right(frame),
+    '>': lambda left, right: lambda frame: left(frame) > right(frame),
+    '<=': lambda left, right: lambda frame: left(frame) <= right(frame),
+    '>=': lambda left, right: lambda frame: left(frame) >= right(frame),
+}
+
+# Mêmes opérations avec un opérande droit constant
+NUMERIC_CONSTANT_OPERATIONS = {
+    '+': lambda left, constant: lambda frame: left(frame) + constant,
+    '-': lambda left, constant: lambda frame: left(frame) - constant,
+    '*': lambda left, constant: lambda frame: left(frame) * constant,
+    '==': lambda left, constant: lambda frame: left(frame) == constant,
+    '!=': lambda left, constant: lambda frame: left(frame) != constant,
+    '<': lambda left, constant: lambda frame: left(frame) < constant,
+    '>': lambda left, constant: lambda frame: left(frame) > constant,
+    '<=': lambda left, constant: lambda frame: left(frame) <= constant,
+    '>=': lambda left, constant: lambda frame: left(frame) >= constant,
+    '//': lambda left, constant: lambda frame: left(frame) // constant, # Constante non nulle
+    '%': lambda left, constant: lambda frame: left(frame) % constant,
+}
+
+RECURSION_LIMIT = 100000 # Un appel Tourte coûte quelques appels de fermetures Python
+
+_NO_RESULT = (None,)
+
+
+# --- Compilation en fermetures ---
+class ClosureCompiler(NodeVisitor):
+    """Compile un AST analysé en un arbre de fermetures Python, une par nœud.
+
+    Chaque expression devient une fonction `f(frame) -> valeur` et chaque instruction une
+    fonction `f(frame)` qui renvoie None, ou le tuple (valeur,) quand un `return` est exécuté.
+    Un cadre est une liste : l'index 0 est le cadre englobant (celui où la fonction a été
+    déclarée), puis un élément par slot de SymbolTable. Un identifiant résolu en (depth, slot)
+    se lit donc en remontant `depth` fois par l'index 0, puis à l'index slot + 1.
+    Les opérateurs et la forme des accès sont choisis ici, une fois, et non à chaque évaluation.
+    """
+    def __init__(self, runtime=None):
+        self.runtime = runtime
+
+    def compile(self, ast):
+        return self.visit(ast)
+
+    def generic_visit(self, node):
+        raise Exception(f"Nœud non compilable: {node.__class__.__name__}")
+
+    def block(self, statements):
+        """Fermeture exécutant une suite d'instructions ; à utiliser avec `yield from`."""
+        closures = []
+        for statement in statements:
+            closure = yield statement
+            if isinstance(statement, FunctionCallNode):
+                closure = discard_result(closure)
+            closures.append(closure)
+        if not closures:
+            return lambda frame: None
+        if len(closures) == 1:
+            return closures[0]
+        closures = tuple(closures)
+        def run_block(frame):
+            for statement in closures:
+                result = statement(frame)
+                if result is not None:
+                    return result
+        return run_block
+
+    # --- Instructions ---
+    def visit_ProgramNode(self, node):
+        body = yield from self.block(node.statements)
+        size = node.frame_size
+        if size is None:
+            raise Exception("Le programme doit être analysé (SemanticAnalyzer) avant d'être compilé.")
+        def run_program():
+            frame = [None] * (size + 1)
+            body(frame)
+            return frame
+        return run_program
+
+    def visit_AssignmentNode(self, node):
+        value = yield node.expression
+        target = node.identifier
+        if isinstance(target, SubscriptNode):
+            container = yield target.target
+            index = yield target.index_expr
+            token = target.token
+            def assign_item(frame):
+                item = value(frame)
+                collection = container(frame)
+                key = index(frame)
+                try:
+                    collection[key] = item
+                except (IndexError, KeyError, TypeError):
+                    raise subscript_error(token, collection, key)
+            return assign_item
+
+        depth, index = resolved(target)
+        if depth == 0:
+            def assign(frame):
+                frame[index] = value(frame)
+        elif depth == 1:
+            def assign(frame):
+                frame[0][index] = value(frame)
+        else:
+            def assign(frame):
+                result = value(frame)
+                for _ in range(depth):
+                    frame = frame[0]
+                frame[index] = result
+        return assign
+
+    def visit_PrintStatementNode(self, node):
+        expressions = []
+        for expression in node.expressions:
+            expressions.append((yield expression))
+        if len(expressions) == 1:
+            expression = expressions[0]
+            def print_one(frame):
+                print(format_value(expression(frame)))
+            return print_one
+        def print_values(frame):
+            print(*[format_value(expression(frame)) for expression in expressions])
+        return print_values
+
+    def visit_FunctionDeclarationNode(self, node):
+        body = yield from self.block(node.body_statements)
+        depth, index = resolved(node.identifier)
+        name = node.identifier.name
+        locals = [None] * (node.frame_size - len(node.parameters))
+        def declare(frame):
+            frame[index] = Function(name, locals, body, frame)
+        return declare
+
+    def visit_ReturnStatementNode(self, node):
+        if node.expression is None:
+            return lambda frame: _NO_RESULT
+        value = yield node.expression
+        return lambda frame: (value(frame),)
+
+    def visit_IfStatementNode(self, node):
+        condition = yield node.condition
+        if_body = yield from self.block(node.if_body)
+        branches = [(condition, if_body)]
+        for elif_condition, elif_body in node.elif_branches:
+            branches.append(((yield elif_condition), (yield from self.block(elif_body))))
+        else_body = (yield from self.block(node.else_body)) if node.else_body else None
+
+        if len(branches) == 1:
+            if else_body is None:
+                def run_if(frame):
+                    if condition(frame):
+                        return if_body(frame)
+            else:
+                def run_if(frame):
+                    if condition(frame):
+                        return if_body(frame)
+                    return else_body(frame)
+            return run_if
+        branches = tuple(branches)
+        def run_if_chain(frame):
+            for branch_condition, branch_body in branches:
+                if branch_condition(frame):
+                    return branch_body(frame)
+            if else_body is not None:
+                return else_body(frame)
+        return run_if_chain
+
+    def visit_WhileStatementNode(self, node):
+        condition = yield node.condition
+        body = yield from self.block(node.body_statements)
+        def run_while(frame):
+            while condition(frame):
+                result = body(frame)
+                if result is not None:
+                    return result
+        return run_while
+
+    def visit_ImportStatementNode(self, node):
+        if node.bindings is None:
+            return lambda frame: None # Import non résolu (analyse sans chargeur) : sans effet
+        runtime = self.runtime
+        path = node.path
+        bindings = tuple((module_slot + 1, local_slot + 1) for _, module_slot, local_slot in node.bindings)
+        def import_module(frame):
+            if runtime is None:
+                raise runtime_error(node.token, f"Import de '{path}' sans environnement d'exécution.")
+            module_frame = runtime.module_frame(path)
+            for source, target in bindings:
+                frame[target] = module_frame[source]
+        return import_module
+
+    # --- Expressions ---
+    def visit_NumberNode(self, node):
+        value = node.value
+        return lambda frame: value
+
+    def visit_StringNode(self, node):
+        value = node.value
+        return lambda frame: value
+
+    def visit_NoneNode(self, node):
+        return lambda frame: None
+
+    def visit_IdentifierNode(self, node):
+        depth, index = resolved(node)
+        if depth == 0:
+            return lambda frame: frame[index]
+        if depth == 1:
+            return lambda frame: frame[0][index]
+        def load(frame):
+            for _ in range(depth):
+                frame = frame[0]
+            return frame[index]
+        return load
+
+    def visit_BinaryOpNode(self, node):
+        left = yield node.left
+        right = yield node.right
+        symbol = node.op.value
+        if symbol == 'and':
+            return lambda frame: left(frame) and right(frame)
+        if symbol == 'or':
+            return lambda frame: left(frame) or right(frame)
+
+        token = node.op
+        if symbol == 'in' or symbol == 'not in':
+            negate = symbol == 'not in'
+            def membership(frame):
+                item = left(frame)
+                collection = right(frame)
+                try:
+                    return (item not in collection) if negate else (item in collection)
+                except TypeError:
+                    raise operation_error(token, symbol, item, collection)
+            return membership
+
+        if is_specialized(node):
+            if isinstance(node.right, NumberNode):
+                return NUMERIC_CONSTANT_OPERATIONS[symbol](left, node.right.value)
+            return NUMERIC_OPERATIONS[symbol](left, right)
+
+        apply = BINARY_OPERATORS[symbol]
+        if isinstance(node.right, (NumberNode, StringNode)):
+            # Opérande droit constant (x + 1, n // 2...) : une fermeture de moins à chaque évaluation
+            constant = node.right.value
+            def binary_constant(frame):
+                value = left(frame)
+                try:
+                    return apply(value, constant)
+                except (TypeError, ValueError, ZeroDivisionError, OverflowError) as error:
+                    raise operation_error(token, symbol, value, constant, error)
+            return binary_constant
+        def binary(frame):
+            a = left(frame)
+            b = right(frame)
+            try:
+                return apply(a, b)
+            except (TypeError, ValueError, ZeroDivisionError, OverflowError) as error:
+                raise operation_error(token, symbol, a, b, error)
+        return binary
+
+    def visit_UnaryOpNode(self, node):
+        operand = yield node.operand
+        return lambda frame: not operand(frame)
+
+    def visit_ListNode(self, node):
+        elements = []
+        for element in node.elements:
+            elements.append((yield element))
+        return lambda frame: [element(frame) for element in elements]
+
+    def visit_DictionaryNode(self, node):
+        pairs = []
+        for key_node, value_node in node.pairs:
+            pairs.append(((yield key_node), (yield value_node)))
+        token = node.token
+        def dictionary(frame):
+            result = {}
+            for key, value in pairs:
+                item_key = key(frame)
+                try:
+                    result[item_key] = value(frame)
+                except TypeError:
+                    raise key_type_error(token, item_key)
+            return result
+        return dictionary
+
+    def visit_SubscriptNode(self, node):
+        container = yield node.target
+        index = yield node.index_expr
+        token = node.token
+        def subscript(frame):
+            collection = container(frame)
+            key = index(frame)
+            try:
+                return collection[key]
+            except (IndexError, KeyError, TypeError):
+                raise subscript_error(token, collection, key)
+        return subscript
+
+    def visit_FunctionCallNode(self, node):
+        callee = yield node.identifier
+        arguments = []
+        for argument in node.arguments:
+            arguments.append((yield argument))
+
+        # Le cadre de l'appel est construit d'un bloc : [cadre englobant, paramètres..., locales...]
+        if not arguments:
+            def call(frame):
+                function = callee(frame)
+                result = function.body([function.frame] + function.locals)
+                return result[0] if result is not None else None
+        elif len(arguments) == 1:
+            first, = arguments
+            def call(frame):
+                function = callee(frame)
+                result = function.body([function.frame, first(frame)] + function.locals)
+                return result[0] if result is not None else None
+        elif len(arguments) == 2:
+            first, second = arguments
+            def call(frame):
+                function = callee(frame)
+                result = function.body([function.frame, first(frame), second(frame)] + function.locals)
+                return result[0] if result is not None else None
+        else:
+            arguments = tuple(arguments)
+            def call(frame):
+                function = callee(frame)
+                callee_frame = [function.frame]
+                callee_frame += [argument(frame) for argument in arguments]
+                result = function.body(callee_frame + function.locals)
+                return result[0] if result is not None else None
+        return call
+
+    def visit_InputFunctionCallNode(self, node):
+        prompt = yield node.prompt_expr
+        token = node.token
+        def read_input(frame):
+            text = format_value(prompt(frame))
+            try:
+                return input(text)
+            except EOFError:
+                raise runtime_error(token, "Fin de l'entrée standard.")
+        return read_input
+
+    def visit_TypeConversionNode(self, node):
+        value = yield node.expression
+        name = node.type_token.value
+        convert = CONVERSIONS[name]
+        token = node.type_token
+        def conversion(frame):
+            original = value(frame)
+            try:
+                return convert(original)
+            except (TypeError, ValueError, OverflowError):
+                raise conversion_error(token, name, original)
+        return conversion
+
+
+def resolved(identifier):
+    """(depth, index dans le cadre) d'un identifiant annoté par l'analyse sémantique."""
+    if identifier.slot is None:
+        raise Exception(f"Identifiant '{identifier.name}' non résolu : l'AST doit être analysé "
+                        f"(SemanticAnalyzer) avant d'être compilé.")
+    return identifier.depth, identifier.slot + 1
+
+def discard_result(call):
+    """Appel de fonction utilisé comme instruction : sa valeur n'est pas un `return`."""
+    def call_statement(frame):
+        call(frame)
+    return call_statement
+
+def operation_error(token, symbol, a, b, error=None):
+    if isinstance(error, ZeroDivisionError):
+        return runtime_error(token, f"Division par zéro ('{symbol}').")
+    return runtime_error(token, f"Opération '{symbol}' impossible entre {type_name(a)} et {type_name(b)}.")
+
+def key_type_error(token, key):
+    return runtime_error(token, f"Une valeur de type {type_name(key)} ne peut pas servir de clé.")
+
+def conversion_error(token, name, value):
+    return runtime_error(token, f"Conversion en {name} impossible pour {format_value(value)!r} ({type_name(value)}).")
+
+def subscript_error(token, collection, key):
+    if isinstance(collection, (list, str)) and type(key) is int:
+        return runtime_error(token, f"Index {key} hors limites ({type_name(collection)} de longueur {len(collection)}).")
+    if isinstance(collection, dict):
+        try:
+            hash(key)
+        except TypeError:
+            return key_type_error(token, key)
+        return runtime_error(token, f"Clé {format_value(key)!r} absente du dictionnaire.")
+    return runtime_error(token, f"Indexation impossible: {type_name(collection)}[{type_name(key)}].")
+
+
+# --- Exécution ---
+class Runtime:
+    """Exécute des programmes analysés. Avec un chargeur de modules (tourte_modules.ModuleLoader),
+    chaque module importé est exécuté une seule fois, au premier import, et son cadre global
+    est partagé par tous ceux qui l'importent."""
+    def __init__(self, loader=None):
+        self.loader = loader
+        self.frames = {} # Chemin d'un module -> cadre global après son exécution
+
+    def compile(self, ast):
+        infer_types(ast) # Annotations utilisées par ClosureCompiler pour spécialiser les opérations
+        return ClosureCompiler(self).compile(ast)
+
+    def run(self, ast):
+        """Compile et exécute `ast` ; renvoie son cadre global."""
+        program = self.compile(ast)
+        limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(max(limit, RECURSION_LIMIT))
+        try:
+            return program()
+        except RecursionError:
+            raise runtime_error(None, "Récursion trop profonde.")
+        finally:
+            sys.setrecursionlimit(limit)
+
+    def module_frame(self, path):
+        frame = self.frames.get(path)
+        if frame is None:
+            if self.loader is None or path not in self.loader.modules:
+                raise runtime_error(None, f"Module '{path}' non chargé.")
+            frame = self.compile(self.loader.modules[path].ast)()
+            self.frames[path] = frame
+        return frame
+
+def run_file(path):
+    """Charge (avec ses imports), analyse puis exécute un fichier Tourte."""
+    loader = ModuleLoader()
+    module = loader.load(path)
+    runtime = Runtime(loader)
+    runtime.frames[module.path] = runtime.run(module.ast)
+    return runtime
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Usage: python tourte_exec.py <programme.tourte>")
+        sys.exit(2)
+    try:
+        run_file(sys.argv[1])
+    except Exception as e:
+        print(e)
+        sys.exit(1)
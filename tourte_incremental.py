@@ -0,0 +1,241 @@
+from bisect import bisect_left, bisect_right
+
+from tourte_compil import TOKEN_TYPES, Lexer, LineIndex, Parser, ProgramNode, Token
+
+# --- Segments : une instruction de haut niveau et ses tokens ---
+class Segment:
+    """Instruction de haut niveau du document.
+
+    Ses tokens ont des offsets relatifs au début du segment et résolvent leur
+    ligne/colonne à travers lui. Les segments situés après le dernier point de
+    modification sont repérés depuis la fin du document (`from_end`) : une
+    modification placée avant eux ne les touche donc pas.
+    Un segment sans instruction (`statement` à None) marque une zone qui n'a pas
+    encore pu être analysée et sera reprise à la prochaine modification.
+    """
+    __slots__ = ('document', '_start', '_end', 'from_end', 'tokens', 'statement')
+
+    def __init__(self, document, start, end, tokens=None, statement=None):
+        self.document = document
+        self._start = start
+        self._end = end
+        self.from_end = False
+        self.tokens = tokens
+        self.statement = statement
+
+    @property
+    def start(self):
+        return self._start + len(self.document.source) if self.from_end else self._start
+
+    @property
+    def end(self):
+        return self._end + len(self.document.source) if self.from_end else self._end
+
+    def anchor(self, from_end):
+        """Change le repère du segment (début ou fin du document courant) sans le déplacer."""
+        if from_end != self.from_end:
+            shift = len(self.document.source)
+            if from_end:
+                shift = -shift
+            self._start += shift
+            self._end += shift
+            self.from_end = from_end
+
+    def line_of(self, offset):
+        return self.document.lines.line_of(self.start + offset)
+
+    def column_of(self, offset):
+        return self.document.lines.column_of(self.start + offset)
+
+    def __repr__(self):
+        return f"Segment({self.start}:{self.end}, {self.statement})"
+
+
+class IncrementalDocument:
+    """Source Tourte analysé (tokens + AST) et remis à jour modification par modification.
+
+    Seules les instructions de haut niveau touchées par une modification sont
+    ré-analysées (lexer puis parser) ; les autres gardent leurs tokens et leurs
+    sous-arbres. Le coût d'une modification dépend de sa taille et de la distance
+    au point de modification précédent, pas de la taille du fichier.
+    """
+    def __init__(self, source):
+        self.source = source
+        self.segments = []
+        self.statements = [] # Instruction de chaque segment, au même index
+        self.gap = 0 # Les segments [gap:] sont repérés depuis la fin du document
+        self.dirty = None # Segment en attente après une erreur
+        self.error = None
+        self._lines = None
+        self.relexed_characters = 0
+        self.reparsed_statements = 0
+        self._update(0, -1)
+
+    @property
+    def lines(self):
+        if self._lines is None:
+            self._lines = LineIndex(self.source)
+        return self._lines
+
+    @property
+    def ast(self):
+        if self.error is not None:
+            raise self.error
+        return ProgramNode(list(self.statements))
+
+    @property
+    def tokens(self):
+        """Tous les tokens des instructions (sans NEWLINE ni ';' entre elles), suivis d'EOF."""
+        tokens = [token for segment in self.segments if segment.tokens for token in segment.tokens]
+        tokens.append(Token(TOKEN_TYPES['EOF'], 'EOF', None, None, len(self.source), 0, self.lines))
+        return tokens
+
+    def edit(self, start, end, text):
+        """Remplace source[start:end] par `text` et renvoie le nouvel AST (ProgramNode)."""
+        if not 0 <= start <= end <= len(self.source):
+            raise Exception(f"Modification hors du document: [{start}, {end}]")
+
+        # Segments touchés (un contact suffit) : de first à last inclus
+        first = bisect_left(self.segments, start, key=lambda segment: segment.end)
+        last = bisect_right(self.segments, end, key=lambda segment: segment.start) - 1
+        if self.dirty is not None:
+            index = self.segments.index(self.dirty)
+            first = min(first, index)
+            last = max(last, index)
+
+        # Tout ce qui suit la modification est repéré depuis la fin avant de changer le texte
+        self.move_gap(first)
+        self.source = self.source[:start] + text + self.source[end:]
+        self._lines = None
+        self._update(first, last)
+        return self.ast
+
+    def move_gap(self, index):
+        segments = self.segments
+        while self.gap < index:
+            segments[self.gap].anchor(from_end=False)
+            self.gap += 1
+        while self.gap > index:
+            self.gap -= 1
+            segments[self.gap].anchor(from_end=True)
+
+    def _update(self, first, last):
+        segments = self.segments
+        region_start = segments[first - 1].end if first > 0 else 0
+        self.relexed_characters = 0
+        self.reparsed_statements = 0
+
+        while True:
+            following = last + 1
+            if following < len(segments):
+                region_end = segments[following].start
+                sync_length = segments[following].tokens[0].length
+            else:
+                region_end = sync_length = None
+            try:
+                new_segments = self._parse_region(region_start, region_end, sync_length, first > 0)
+            except _RegionTooShort:
+                last += 1
+                continue
+            except Exception as error:
+                # Zone laissée en attente : elle sera reprise à la prochaine modification
+                stop = region_end if region_end is not None else len(self.source)
+                self.dirty = Segment(self, region_start, stop)
+                new_segments = [self.dirty]
+                self.error = error
+            else:
+                self.dirty = self.error = None
+            break
+
+        segments[first:last + 1] = new_segments
+        self.statements[first:last + 1] = [segment.statement for segment in new_segments]
+        self.gap = first + len(new_segments)
+        if self.error is not None:
+            raise self.error
+
+    def _parse_region(self, region_start, region_end, sync_length, after_statement):
+        """Lexe et parse source[region_start:region_end] ; region_end à None signifie jusqu'à la fin.
+
+        Si la zone suit une instruction (`after_statement`), elle commence par les séparateurs
+        que Parser.parse_program saute après chaque instruction.
+
+        Lève _RegionTooShort si la zone ne se termine pas proprement sur une frontière
+        de token et d'instruction, auquel cas il faut l'étendre au segment suivant.
+        """
+        if region_end is None:
+            text = self.source[region_start:]
+            limit = None
+        else:
+            # Le premier token du segment suivant est inclus : un token doit commencer pile en region_end
+            text = self.source[region_start:region_end + sync_length]
+            limit = region_end - region_start
+        self.relexed_characters += len(text)
+
+        anchor = Segment(self, region_start, region_start)
+        tokens = []
+        lexer = Lexer(text)
+        try:
+            for type, value, start, stop in lexer.scan():
+                if limit is not None and stop > limit:
+                    if start != limit:
+                        raise _RegionTooShort()
+                    break
+                tokens.append(Token(type, value, None, None, start, stop - start, anchor))
+        except _RegionTooShort:
+            raise
+        except Exception:
+            # Une erreur lexicale au-delà de la zone (ex: chaîne non terminée) peut disparaître en l'étendant
+            if limit is not None and lexer.position >= limit:
+                raise _RegionTooShort()
+            self._raise_lexical_error(region_start, text)
+        if limit is not None:
+            tokens.append(Token(TOKEN_TYPES['EOF'], 'EOF', None, None, limit, 0, anchor))
+
+        parser = Parser(tokens)
+        eof_index = len(tokens) - 1
+        new_segments = []
+        try:
+            if after_statement:
+                _skip_separators(parser)
+            while parser.current_token().type != TOKEN_TYPES['EOF']:
+                first_index = parser.current_token_index
+                statement = parser.parse_statement()
+                if statement:
+                    new_segments.append(self._make_segment(tokens[first_index:parser.current_token_index], statement))
+                _skip_separators(parser)
+        except Exception:
+            # Une erreur survenue avant que le parser ait pu voir la fin de la zone est réelle
+            if limit is not None and parser.current_token_index + 1 >= eof_index:
+                raise _RegionTooShort()
+            raise
+        self.reparsed_statements += len(new_segments)
+        return new_segments
+
+    def _make_segment(self, tokens, statement):
+        anchor = tokens[0].lines
+        start = anchor.start + tokens[0].offset
+        end = anchor.start + tokens[-1].offset + tokens[-1].length
+        segment = Segment(self, start, end, tokens, statement)
+        for token in tokens:
+            token.offset += anchor.start - start
+            token.lines = segment
+        return segment
+
+    def _raise_lexical_error(self, region_start, text):
+        # Relance l'analyse en connaissant la position absolue de la zone pour un message exact
+        lexer = Lexer(text)
+        lexer.first_line = self.lines.line_of(region_start)
+        lexer.first_column = self.lines.column_of(region_start)
+        for _ in lexer.scan():
+            pass
+        raise Exception("Erreur lexicale introuvable lors de la relecture de la zone modifiée.")
+
+
+def _skip_separators(parser):
+    while parser.current_token().type == TOKEN_TYPES['NEWLINE'] or \
+          (parser.current_token().type == TOKEN_TYPES['DELIMITER'] and parser.current_token().value == ';'):
+        parser.advance()
+
+
+class _RegionTooShort(Exception):
+    pass
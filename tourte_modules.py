@@ -0,0 +1,199 @@
+import os
+
+from tourte_compil import (
+    FunctionSymbol, Lexer, NodeVisitor, Parser, SemanticAnalyzer, SymbolTable, count_nodes, read_source_chunks,
+)
+from tourte_stats import CountingSymbolTable
+
+MODULE_EXTENSION = '.tourte'
+
+# --- Modules et chargeur ---
+class Module:
+    """Fichier Tourte parsé et analysé.
+
+    `dependencies` liste les chemins résolus de ses imports (dans l'ordre, sans doublon) ;
+    `exports` associe le nom de chaque fonction de haut niveau à son symbole, dont le slot
+    est celui du cadre global du module.
+    """
+    def __init__(self, path, ast, dependencies, stamp=None):
+        self.path = path
+        self.ast = ast
+        self.dependencies = dependencies
+        self.exports = {}
+        self.stamp = stamp # (mtime_ns, taille) du fichier lu
+
+    def __repr__(self):
+        return f"Module({self.path}, imports={len(self.dependencies)})"
+
+
+class ModuleLoader:
+    """Charge un programme et tous les fichiers qu'il importe, chacun une seule fois.
+
+    Le graphe des imports est parcouru avec une pile explicite : chaque fichier est lu et
+    parsé à sa première rencontre, les cycles sont détectés, puis les modules sont analysés
+    dépendances d'abord afin que l'analyse d'un import trouve les fonctions qu'il expose.
+    Les modules chargés restent en mémoire (`modules`) et servent aux chargements suivants.
+    Avec `stats` (tourte_stats.Stats), lecture, lexing, parsing et analyse de chaque fichier
+    sont mesurés séparément.
+    """
+    def __init__(self, search_paths=(), stats=None):
+        self.search_paths = list(search_paths)
+        self.stats = stats
+        self.modules = {} # Chemin absolu -> Module analysé
+        self.graph = {} # Chemin absolu -> chemins importés
+        self.order = [] # Modules dans l'ordre d'analyse (dépendances avant les modules qui les importent)
+        self.parsed_files = 0
+
+    def resolve(self, name, importer=None):
+        """Chemin absolu du fichier importé sous `name` (extension .tourte par défaut).
+
+        Il est cherché relativement au fichier qui l'importe, puis dans `search_paths`.
+        """
+        if not os.path.splitext(name)[1]:
+            name += MODULE_EXTENSION
+        directories = [os.path.dirname(importer)] if importer else [os.getcwd()]
+        for directory in directories + self.search_paths:
+            candidate = os.path.abspath(os.path.join(directory, name))
+            if os.path.isfile(candidate):
+                return candidate
+        origin = f" (importé depuis {importer})" if importer else ""
+        raise Exception(f"Module introuvable: '{name}'{origin}")
+
+    def imported(self, name, importer):
+        """Module déjà chargé correspondant à un import ; utilisé par SemanticAnalyzer."""
+        path = self.resolve(name, importer)
+        module = self.modules.get(path)
+        if module is None:
+            raise Exception(f"Module '{path}' importé avant d'avoir été chargé.")
+        return module
+
+    def load(self, path, ast=None):
+        """Charge et analyse `path` et ses dépendances ; renvoie son Module.
+
+        `ast` permet de fournir l'AST déjà parsé du fichier principal.
+        """
+        root = os.path.abspath(path)
+        if root in self.modules:
+            return self.modules[root]
+
+        # Chemin -> (AST, état du fichier avant sa lecture) des modules parsés mais pas encore analysés
+        parsed = {root: (ast, file_stamp(root)) if ast is not None else self.parse(root)}
+        in_progress = [root] # Chemin d'imports en cours d'exploration, pour signaler les cycles
+        pending = [iter(self.dependencies_of(root, parsed[root][0]))]
+        while pending:
+            dependency = next(pending[-1], None)
+            if dependency is None:
+                # Toutes les dépendances de ce module sont chargées : il peut être analysé
+                pending.pop()
+                self.analyze(in_progress.pop(), parsed)
+            elif dependency in self.modules:
+                continue
+            elif dependency in in_progress:
+                cycle = in_progress[in_progress.index(dependency):] + [dependency]
+                raise Exception("Import circulaire: " + " -> ".join(os.path.basename(step) for step in cycle))
+            else:
+                parsed[dependency] = self.parse(dependency)
+                in_progress.append(dependency)
+                pending.append(iter(self.dependencies_of(dependency, parsed[dependency][0])))
+        return self.modules[root]
+
+    def refresh(self):
+        """Oublie les modules dont le fichier a changé, et tous ceux qui les importent
+        (directement ou non) ; renvoie les chemins oubliés."""
+        stale = {path for path, module in self.modules.items() if file_stamp(path) != module.stamp}
+        changed = True
+        while changed:
+            changed = False
+            for path, module in self.modules.items():
+                if path not in stale and any(dependency in stale for dependency in module.dependencies):
+                    stale.add(path)
+                    changed = True
+        for path in stale:
+            del self.modules[path]
+            self.graph.pop(path, None)
+        self.order = [module for module in self.order if module.path not in stale]
+        return stale
+
+    def parse(self, path):
+        self.parsed_files += 1
+        return parse_module(path, self.stats)
+
+    def dependencies_of(self, path, ast):
+        if path not in self.graph:
+            dependencies = []
+            for node in find_imports(ast):
+                dependency = self.resolve(node.file_path, path)
+                if dependency not in dependencies:
+                    dependencies.append(dependency)
+            self.graph[path] = dependencies
+        return self.graph[path]
+
+    def analyze(self, path, parsed):
+        ast, stamp = parsed.pop(path)
+        module = Module(path, ast, self.graph[path], stamp)
+        stats = self.stats
+        analyzer = SemanticAnalyzer(loader=self, path=path,
+                                    symbol_table_class=SymbolTable if stats is None else CountingSymbolTable)
+        try:
+            if stats is None:
+                analyzer.analyze(module.ast, verbose=False)
+            else:
+                with stats.phase('analyze'):
+                    analyzer.analyze(module.ast, verbose=False)
+        except Exception as error:
+            raise Exception(f"{path}: {error}")
+        finally:
+            if stats is not None:
+                table = analyzer.global_symbol_table
+                stats.count('analyze', 'lookups', table.lookups)
+                stats.count('analyze', 'table_walks', table.table_walks)
+                stats.count('analyze', 'symbols', table.symbols)
+        for name, symbol in analyzer.global_symbol_table.scopes[0].items():
+            if isinstance(symbol, FunctionSymbol) and symbol.module is None:
+                module.exports[name] = symbol
+        self.modules[path] = module
+        self.order.append(module)
+
+
+def parse_module(path, stats=None):
+    """(AST, état du fichier) ; l'état est relevé avant la lecture pour qu'une modification
+    concurrente soit vue par le prochain refresh(). Avec `stats`, chaque phase est mesurée."""
+    stamp = file_stamp(path)
+    try:
+        if stats is None:
+            return Parser(Lexer(''.join(read_source_chunks(path))).get_tokens()).parse_program(), stamp
+        with stats.phase('read'):
+            source = ''.join(read_source_chunks(path))
+        stats.count('read', 'characters', len(source))
+        with stats.phase('lex'):
+            tokens = Lexer(source).get_tokens()
+        stats.count('lex', 'tokens', len(tokens))
+        with stats.phase('parse'):
+            ast = Parser(tokens).parse_program()
+        stats.count('parse', 'nodes', count_nodes(ast))
+        return ast, stamp
+    except OSError as error:
+        raise Exception(f"Lecture de '{path}' impossible: {error}")
+    except Exception as error:
+        raise Exception(f"{path}: {error}")
+
+def file_stamp(path):
+    try:
+        status = os.stat(path)
+    except OSError:
+        return None
+    return status.st_mtime_ns, status.st_size
+
+def find_imports(ast):
+    return _ImportCollector().collect(ast)
+
+
+class _ImportCollector(NodeVisitor):
+    """Imports d'un AST, où qu'ils soient (y compris dans un corps de fonction)."""
+    def collect(self, ast):
+        self.imports = []
+        self.visit(ast)
+        return self.imports
+
+    def visit_ImportStatementNode(self, node):
+        self.imports.append(node)
@@ -0,0 +1,336 @@
+import sys
+
+from tourte_compil import (
+    IdentifierNode, NodeVisitor, NoneNode, NumberNode, StringNode, SubscriptNode,
+    count_nodes, iter_child_nodes,
+)
+from tourte_exec import BINARY_OPERATORS, CONVERSIONS, Runtime
+from tourte_modules import ModuleLoader
+from tourte_pyback import run_file as run_python
+from tourte_vm import VirtualMachine, compile_program
+
+LITERAL_NODES = (NumberNode, StringNode, NoneNode)
+FOLDABLE_TYPES = (int, float, str, bool, type(None)) # Valeurs représentables par un littéral
+
+# Bornes des valeurs calculées à la compilation : au-delà, l'opération reste à l'exécution
+# (elle y coûterait autant, et le littéral gonflerait l'AST et le bytecode)
+MAX_FOLDED_LENGTH = 1024
+MAX_FOLDED_BITS = 4096
+
+FOLDED_OPERATORS = dict(BINARY_OPERATORS)
+FOLDED_OPERATORS['in'] = lambda item, collection: item in collection
+FOLDED_OPERATORS['not in'] = lambda item, collection: item not in collection
+
+# --- Littéraux ---
+def literal(value, token):
+    """Nœud littéral (NumberNode, StringNode ou NoneNode) portant `value` ; les booléens
+    calculés deviennent des NumberNode, comme une comparaison évaluée à l'exécution."""
+    if value is None:
+        node_class = NoneNode
+    elif type(value) is str:
+        node_class = StringNode
+    else:
+        node_class = NumberNode
+    node = node_class.__new__(node_class)
+    node.token = token
+    node.value = value
+    return node
+
+def is_literal(node):
+    return isinstance(node, LITERAL_NODES)
+
+def fold_binary(symbol, a, b):
+    """Résultat de `a symbol b`, ou None si l'opération doit rester à l'exécution (erreur,
+    résultat non littéral ou trop grand)."""
+    if symbol == '**' and type(b) is int and b > 0 and type(a) in (int, bool) and abs(a) > 1:
+        if b * a.bit_length() > MAX_FOLDED_BITS:
+            return None
+    if symbol == '*':
+        for text, count in ((a, b), (b, a)):
+            if type(text) is str and type(count) in (int, bool) and len(text) * count > MAX_FOLDED_LENGTH:
+                return None
+    try:
+        value = FOLDED_OPERATORS[symbol](a, b)
+    except (TypeError, ValueError, ZeroDivisionError, OverflowError, MemoryError):
+        return None # L'erreur sera signalée, à sa place, par l'exécution
+    return (value,) if is_foldable(value) else None
+
+def is_foldable(value):
+    if type(value) not in FOLDABLE_TYPES:
+        return False
+    if type(value) is str:
+        return len(value) <= MAX_FOLDED_LENGTH
+    if type(value) is int:
+        return value.bit_length() <= MAX_FOLDED_BITS
+    return True
+
+
+# --- Affectations par variable ---
+class _AssignmentCounter(NodeVisitor):
+    """Nombre de liaisons de chaque variable, identifiée par (fonction qui la déclare, slot).
+
+    Paramètres, déclarations de fonctions et imports comptent comme des affectations : une
+    variable n'est constante que si sa seule liaison est une affectation d'un littéral.
+    """
+    def count(self, ast):
+        self.counts = {}
+        self.functions = []
+        self.visit(ast)
+        return self.counts
+
+    def bind(self, identifier):
+        key = (id(self.functions[-1 - identifier.depth]), identifier.slot)
+        self.counts[key] = self.counts.get(key, 0) + 1
+
+    def visit_ProgramNode(self, node):
+        self.functions.append(node)
+        yield from node.statements
+        self.functions.pop()
+
+    def visit_FunctionDeclarationNode(self, node):
+        self.bind(node.identifier)
+        self.functions.append(node)
+        for parameter in node.parameters:
+            self.bind(parameter)
+        yield from node.body_statements
+        self.functions.pop()
+
+    def visit_AssignmentNode(self, node):
+        if isinstance(node.identifier, IdentifierNode):
+            self.bind(node.identifier)
+        yield from iter_child_nodes(node)
+
+    def visit_ImportStatementNode(self, node):
+        for _, _, local_slot in node.bindings or ():
+            key = (id(self.functions[-1]), local_slot)
+            self.counts[key] = self.counts.get(key, 0) + 2
+
+
+# --- Optimisation ---
+class Optimizer(NodeVisitor):
+    """Simplifie un AST analysé avant sa compilation par un backend (tourte_exec, tourte_vm,
+    tourte_pyback).
+
+    - Pliage des constantes : opérations, `not` et conversions dont les opérandes sont des
+      littéraux sont calculées ici (8 /// 3, "abc" * 3, 1 == 1, int("42")...). Celles qui
+      échoueraient restent en place pour que l'erreur soit signalée à l'exécution, à sa position.
+    - Propagation : une variable liée une seule fois, par l'affectation d'un littéral, est
+      remplacée par ce littéral dans les lectures qui suivent. L'analyse sémantique garantit
+      qu'une lecture suit sa déclaration dans le texte ; comme un bloc if/while limite la portée
+      de ses variables, une telle lecture s'exécute toujours après l'affectation.
+    - Branches mortes : les branches d'un if dont la condition est un littéral faux sont
+      supprimées, celles qui suivent une condition toujours vraie aussi ; un if réduit à une
+      seule branche certaine est remplacé par son corps. Un while de condition fausse disparaît.
+
+    Les slots calculés par l'analyse restent valables : le corps d'une branche conservée garde
+    les siens dans le cadre de la fonction.
+    """
+    def optimize(self, ast):
+        """Optimise `ast` en place ; renvoie le nombre de nœuds supprimés."""
+        if ast.frame_size is None:
+            raise Exception("Le programme doit être analysé (SemanticAnalyzer) avant d'être optimisé.")
+        before = count_nodes(ast)
+        self.counts = _AssignmentCounter().count(ast)
+        self.constants = {} # (id de la fonction, slot) -> valeur
+        self.functions = []
+        self.folded = 0
+        self.propagated = 0
+        self.pruned = 0 # Branches et boucles supprimées
+        self.visit(ast)
+        self.removed = before - count_nodes(ast)
+        return self.removed
+
+    def generic_visit(self, node):
+        """Remplace chaque enfant par le résultat de sa visite."""
+        for name in node._fields:
+            child = getattr(node, name)
+            if child is None:
+                continue
+            if isinstance(child, (list, tuple)):
+                items = []
+                for item in child:
+                    if isinstance(item, tuple):
+                        pair = []
+                        for element in item:
+                            pair.append((yield element))
+                        items.append(tuple(pair))
+                    else:
+                        items.append((yield item))
+                setattr(node, name, items if isinstance(child, list) else tuple(items))
+            else:
+                setattr(node, name, (yield child))
+        return node
+
+    def block(self, statements):
+        """Instructions optimisées : une instruction peut disparaître (None) ou être remplacée
+        par plusieurs (liste) ; à utiliser avec `yield from`."""
+        result = []
+        for statement in statements:
+            optimized = yield statement
+            if isinstance(optimized, list):
+                result.extend(optimized)
+            elif optimized is not None:
+                result.append(optimized)
+        return result
+
+    def key(self, identifier):
+        return id(self.functions[-1 - identifier.depth]), identifier.slot
+
+    # --- Instructions ---
+    def visit_ProgramNode(self, node):
+        self.functions.append(node)
+        node.statements = yield from self.block(node.statements)
+        self.functions.pop()
+        return node
+
+    def visit_FunctionDeclarationNode(self, node):
+        self.functions.append(node)
+        node.body_statements = yield from self.block(node.body_statements)
+        self.functions.pop()
+        return node
+
+    def visit_AssignmentNode(self, node):
+        node.expression = yield node.expression
+        target = node.identifier
+        if isinstance(target, SubscriptNode):
+            target.target = yield target.target
+            target.index_expr = yield target.index_expr
+        elif is_literal(node.expression) and self.counts.get(self.key(target)) == 1:
+            self.constants[self.key(target)] = node.expression.value
+        return node
+
+    def visit_IfStatementNode(self, node):
+        branches = [(node.condition, node.if_body)] + list(node.elif_branches)
+        else_body = node.else_body
+        kept = []
+        for index, (condition, body) in enumerate(branches):
+            condition = yield condition
+            if not is_literal(condition):
+                kept.append((condition, (yield from self.block(body))))
+            elif not condition.value:
+                self.pruned += 1
+            else:
+                # Condition toujours vraie : la branche devient le else, les suivantes disparaissent
+                self.pruned += len(branches) - index - 1 + (1 if else_body else 0)
+                else_body = body
+                break
+        else_body = (yield from self.block(else_body)) if else_body else else_body
+        if not kept:
+            return else_body or None # Le corps restant remplace le if
+        (node.condition, node.if_body), node.elif_branches = kept[0], kept[1:]
+        node.else_body = else_body
+        return node
+
+    def visit_WhileStatementNode(self, node):
+        node.condition = yield node.condition
+        if is_literal(node.condition) and not node.condition.value:
+            self.pruned += 1
+            return None
+        node.body_statements = yield from self.block(node.body_statements)
+        return node
+
+    def visit_ImportStatementNode(self, node):
+        return node
+
+    # --- Expressions ---
+    def visit_IdentifierNode(self, node):
+        key = self.key(node)
+        if key in self.constants:
+            self.propagated += 1
+            return literal(self.constants[key], node.token)
+        return node
+
+    def visit_FunctionCallNode(self, node):
+        arguments = []
+        for argument in node.arguments:
+            arguments.append((yield argument))
+        node.arguments = arguments # L'appelé est une fonction : jamais une constante
+        return node
+
+    def visit_BinaryOpNode(self, node):
+        left = yield node.left
+        right = yield node.right
+        symbol = node.op.value
+        if is_literal(left) and symbol in ('and', 'or'):
+            # Même valeur que l'exécution : l'opérande gauche s'il décide, sinon le droit
+            self.folded += 1
+            return left if bool(left.value) == (symbol == 'or') else right
+        if is_literal(left) and is_literal(right):
+            value = fold_binary(symbol, left.value, right.value)
+            if value is not None:
+                self.folded += 1
+                return literal(value[0], node.op)
+        node.left = left
+        node.right = right
+        return node
+
+    def visit_UnaryOpNode(self, node):
+        operand = yield node.operand
+        if is_literal(operand):
+            self.folded += 1
+            return literal(not operand.value, node.op)
+        node.operand = operand
+        return node
+
+    def visit_TypeConversionNode(self, node):
+        value = yield node.expression
+        if is_literal(value):
+            try:
+                converted = CONVERSIONS[node.type_token.value](value.value)
+            except (TypeError, ValueError, OverflowError):
+                converted = _NOT_FOLDED
+            if converted is not _NOT_FOLDED and is_foldable(converted):
+                self.folded += 1
+                return literal(converted, node.type_token)
+        node.expression = value
+        return node
+
+_NOT_FOLDED = object()
+
+def optimize(ast):
+    """Optimise un AST analysé en place ; renvoie l'Optimizer (compteurs, nœuds supprimés)."""
+    optimizer = Optimizer()
+    optimizer.optimize(ast)
+    return optimizer
+
+
+class OptimizingLoader(ModuleLoader):
+    """ModuleLoader qui optimise chaque module juste après son analyse sémantique ; tout
+    backend qui compile les ASTs du chargeur reçoit donc des ASTs optimisés."""
+    def __init__(self, search_paths=()):
+        super().__init__(search_paths)
+        self.reports = {} # Chemin -> Optimizer (compteurs de l'optimisation du module)
+
+    def analyze(self, path, parsed):
+        super().analyze(path, parsed)
+        self.reports[path] = optimize(self.modules[path].ast)
+
+
+BACKENDS = ('exec', 'vm', 'python')
+
+if __name__ == "__main__":
+    arguments = sys.argv[1:]
+    backend = None
+    if len(arguments) == 3 and arguments[1] == '--run' and arguments[2] in BACKENDS:
+        backend = arguments[2]
+    elif len(arguments) != 1:
+        print("Usage: python tourte_optim.py <programme.tourte> [--run exec|vm|python]")
+        sys.exit(2)
+    try:
+        loader = OptimizingLoader()
+        module = loader.load(arguments[0])
+        if backend is None:
+            for path, report in loader.reports.items():
+                print(f"{path}: {report.removed} nœud(s) supprimé(s) ({report.folded} pliage(s), "
+                      f"{report.propagated} propagation(s), {report.pruned} branche(s) ou boucle(s) supprimée(s))")
+        elif backend == 'exec':
+            runtime = Runtime(loader)
+            runtime.frames[module.path] = runtime.run(module.ast)
+        elif backend == 'vm':
+            machine = VirtualMachine(loader)
+            machine.frames[module.path] = machine.run(compile_program(module.ast))
+        else:
+            run_python(module.path, loader)
+    except Exception as e:
+        print(e)
+        sys.exit(1)
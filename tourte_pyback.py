@@ -0,0 +1,462 @@
+import ast as pyast
+import keyword
+import os
+import sys
+import unicodedata
+import warnings
+
+from tourte_compil import NodeVisitor, SubscriptNode
+from tourte_exec import RECURSION_LIMIT
+from tourte_modules import ModuleLoader
+
+# --- Fonctions d'appui du module généré ---
+# Copie autonome des règles de tourte_exec (format_value, nth_root) : le module généré
+# s'exécute et s'importe sans le compilateur.
+PRELUDE = '''
+def _tourte_format(value):
+    if value is None:
+        return 'none'
+    if type(value) is str:
+        return value
+    return str(value)
+
+def _tourte_print(*values):
+    print(*[_tourte_format(value) for value in values])
+
+def _tourte_input(prompt):
+    return input(_tourte_format(prompt))
+
+def _tourte_root(value, n):
+    root = value ** (1 / n)
+    if type(root) is float:
+        nearest = round(root)
+        if nearest ** n == value:
+            return float(nearest)
+    return root
+
+_tourte_loaded = {}
+
+def _tourte_import(index):
+    exports = _tourte_loaded.get(index)
+    if exports is None:
+        exports = _tourte_loaded[index] = _tourte_modules[index]()
+    return exports
+'''
+
+PRELUDE_FUNCTIONS = {'_tourte_format', '_tourte_print', '_tourte_input', '_tourte_root', '_tourte_import'}
+
+MAIN_GUARD = '''
+if __name__ == '__main__':
+    import sys
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 100000))
+    main()
+'''
+
+BINARY_OPERATORS = {
+    '+': pyast.Add, '-': pyast.Sub, '*': pyast.Mult, '/': pyast.Div, '//': pyast.FloorDiv,
+    '%': pyast.Mod, '**': pyast.Pow,
+}
+
+COMPARISONS = {
+    '==': pyast.Eq, '!=': pyast.NotEq, '>': pyast.Gt, '<': pyast.Lt, '>=': pyast.GtE,
+    '<=': pyast.LtE, 'in': pyast.In, 'not in': pyast.NotIn,
+}
+
+CONVERSIONS = {'int': 'int', 'float': 'float', 'STR': '_tourte_format'}
+
+
+def python_name(name):
+    """Nom Python d'un identifiant Tourte ; les mots-clés Python, les noms réservés au module
+    généré et ceux que Python normaliserait (NFKC) sont échappés."""
+    if (name.isidentifier() and not keyword.iskeyword(name) and not name.startswith('_tourte')
+            and unicodedata.normalize('NFKC', name) == name):
+        return name
+    return '_tourte_v_' + ''.join(c if c.isascii() and (c.isalnum() or c == '_') else f'_{ord(c):x}' for c in name)
+
+
+# --- Traduction de l'AST Tourte en AST Python ---
+class _Function:
+    """Fonction Python en cours de génération : noms de ses slots et noms extérieurs qu'elle modifie."""
+    def __init__(self, parent):
+        self.parent = parent
+        self.names = {} # Slot -> nom Python
+        self.by_name = {} # Nom Tourte -> nom Python : les variables de blocs if/while fuient dans la fonction
+        self.used = set()
+        self.parameters = []
+        self.nonlocals = set()
+
+    def outer_names(self):
+        names = set()
+        function = self.parent
+        while function is not None:
+            names |= function.used
+            function = function.parent
+        return names
+
+
+class PythonLowering(NodeVisitor):
+    """Traduit un AST analysé en AST Python (module `ast`), compilable par compile().
+
+    Chaque module Tourte devient une fonction Python, et chaque `func` une fonction imbriquée :
+    les variables Tourte sont des variables locales Python (accès rapides de CPython), et les
+    variables d'une fonction englobante des variables libres (`nonlocal` quand elles sont
+    modifiées). Toutes les variables d'une fonction valent None à son entrée, si bien qu'une
+    variable pas encore affectée se lit `none`. Un même nom déclaré dans plusieurs blocs d'une
+    fonction y est une seule variable Python. Un nom qui masquerait celui d'une fonction
+    englobante est renommé (suffixe _1, _2...) pour que les accès à ce dernier restent possibles.
+    Les nœuds Python portent la ligne et la colonne des tokens Tourte.
+    """
+    def __init__(self, module_indexes=None):
+        self.module_indexes = module_indexes or {} # Chemin d'un module importé -> index dans _tourte_modules
+        self.function = None
+
+    def lower(self, ast, name, exports=None):
+        """FunctionDef `name` exécutant le programme `ast` ; avec `exports` (noms Tourte ->
+        symboles), elle renvoie le dictionnaire des fonctions exportées."""
+        if ast.frame_size is None:
+            raise Exception("Le programme doit être analysé (SemanticAnalyzer) avant d'être compilé.")
+        self.function = _Function(None)
+        body = self.visit(ast)
+        if exports:
+            keys = [pyast.Constant(export) for export in exports]
+            values = [pyast.Name(self.function.names[symbol.slot], pyast.Load()) for symbol in exports.values()]
+            body.append(pyast.Return(pyast.Dict(keys, values)))
+        return self.finish_function(name, body, ast.token)
+
+    def generic_visit(self, node):
+        raise Exception(f"Nœud non compilable: {node.__class__.__name__}")
+
+    def block(self, statements):
+        """Liste d'instructions Python ; à utiliser avec `yield from`."""
+        body = []
+        for statement in statements:
+            result = yield statement
+            if isinstance(result, list):
+                body.extend(result)
+            elif isinstance(result, pyast.expr):
+                body.append(located(pyast.Expr(result), statement.token))
+            else:
+                body.append(result)
+        return body
+
+    def finish_function(self, name, body, token):
+        function = self.function
+        prologue = []
+        if function.nonlocals:
+            prologue.append(pyast.Nonlocal(sorted(function.nonlocals)))
+        locals = sorted(function.used - set(function.parameters))
+        if locals:
+            targets = [pyast.Name(local, pyast.Store()) for local in locals]
+            prologue.append(pyast.Assign(targets, pyast.Constant(None)))
+        arguments = pyast.arguments(posonlyargs=[], args=[pyast.arg(parameter) for parameter in function.parameters],
+                                    kwonlyargs=[], kw_defaults=[], defaults=[])
+        definition = pyast.FunctionDef(name, arguments, prologue + body or [pyast.Pass()], [], None)
+        for statement in prologue:
+            located(statement, token)
+        return located(definition, token)
+
+    def slot_name(self, identifier):
+        """Nom Python du slot d'un identifiant déclaré dans la fonction courante."""
+        function = self.function
+        name = function.names.get(identifier.slot)
+        if name is None:
+            name = function.by_name.get(identifier.name)
+            if name is None:
+                base = python_name(identifier.name)
+                taken = function.outer_names() | function.used
+                name = base
+                suffix = 1
+                while name in taken:
+                    name = f"{base}_{suffix}"
+                    suffix += 1
+                function.by_name[identifier.name] = name
+                function.used.add(name)
+            function.names[identifier.slot] = name
+        return name
+
+    def variable(self, identifier, store=False):
+        """Nom Python d'un identifiant résolu en (depth, slot)."""
+        if identifier.slot is None:
+            raise Exception(f"Identifiant '{identifier.name}' non résolu : l'AST doit être analysé "
+                            f"(SemanticAnalyzer) avant d'être compilé.")
+        if identifier.depth == 0:
+            return self.slot_name(identifier)
+        function = self.function
+        for _ in range(identifier.depth):
+            function = function.parent
+        name = function.names[identifier.slot]
+        if store:
+            self.function.nonlocals.add(name)
+        return name
+
+    # --- Instructions ---
+    def visit_ProgramNode(self, node):
+        return (yield from self.block(node.statements))
+
+    def visit_AssignmentNode(self, node):
+        value = yield node.expression
+        target = node.identifier
+        if isinstance(target, SubscriptNode):
+            container = yield target.target
+            index = yield target.index_expr
+            target = located(pyast.Subscript(container, index, pyast.Store()), target.token)
+        else:
+            target = located(pyast.Name(self.variable(target, store=True), pyast.Store()), target.token)
+        return located(pyast.Assign([target], value), node.token)
+
+    def visit_PrintStatementNode(self, node):
+        expressions = []
+        for expression in node.expressions:
+            expressions.append((yield expression))
+        return located(pyast.Expr(call('_tourte_print', expressions, node.token)), node.token)
+
+    def visit_FunctionDeclarationNode(self, node):
+        name = self.variable(node.identifier, store=True)
+        outer = self.function
+        self.function = _Function(outer)
+        for parameter in node.parameters:
+            self.function.parameters.append(self.slot_name(parameter))
+        body = yield from self.block(node.body_statements)
+        definition = self.finish_function(name, body, node.token)
+        self.function = outer
+        return definition
+
+    def visit_ReturnStatementNode(self, node):
+        value = (yield node.expression) if node.expression is not None else None
+        return located(pyast.Return(value), node.token)
+
+    def visit_IfStatementNode(self, node):
+        condition = yield node.condition
+        if_body = yield from self.block(node.if_body)
+        branches = [(condition, if_body)]
+        for elif_condition, elif_body in node.elif_branches:
+            branches.append(((yield elif_condition), (yield from self.block(elif_body))))
+        orelse = (yield from self.block(node.else_body)) if node.else_body else []
+        for condition, body in reversed(branches):
+            statement = located(pyast.If(condition, body or [pyast.Pass()], orelse), node.token)
+            orelse = [statement]
+        return statement
+
+    def visit_WhileStatementNode(self, node):
+        condition = yield node.condition
+        body = yield from self.block(node.body_statements)
+        return located(pyast.While(condition, body or [pyast.Pass()], []), node.token)
+
+    def visit_ImportStatementNode(self, node):
+        if node.bindings is None:
+            return located(pyast.Pass(), node.token) # Import non résolu (analyse sans chargeur) : sans effet
+        index = self.module_indexes.get(node.path)
+        if index is None:
+            raise Exception(f"Module '{node.path}' absent du programme généré.")
+        statements = []
+        for name, _, local_slot in node.bindings:
+            local = self.function.names.get(local_slot) or self.slot_name(_Slot(name, local_slot))
+            exports = call('_tourte_import', [pyast.Constant(index)], node.token)
+            item = pyast.Subscript(exports, pyast.Constant(name), pyast.Load())
+            statements.append(located(pyast.Assign([pyast.Name(local, pyast.Store())], item), node.token))
+        return statements
+
+    # --- Expressions ---
+    def visit_NumberNode(self, node):
+        return located(pyast.Constant(node.value), node.token)
+
+    def visit_StringNode(self, node):
+        return located(pyast.Constant(node.value), node.token)
+
+    def visit_NoneNode(self, node):
+        return located(pyast.Constant(None), node.token)
+
+    def visit_IdentifierNode(self, node):
+        return located(pyast.Name(self.variable(node), pyast.Load()), node.token)
+
+    def visit_BinaryOpNode(self, node):
+        left = yield node.left
+        right = yield node.right
+        symbol = node.op.value
+        if symbol == 'and' or symbol == 'or':
+            operator = pyast.And() if symbol == 'and' else pyast.Or()
+            return located(pyast.BoolOp(operator, [left, right]), node.op)
+        if symbol == '///':
+            return call('_tourte_root', [left, right], node.op)
+        if symbol in COMPARISONS:
+            return located(pyast.Compare(left, [COMPARISONS[symbol]()], [right]), node.op)
+        return located(pyast.BinOp(left, BINARY_OPERATORS[symbol](), right), node.op)
+
+    def visit_UnaryOpNode(self, node):
+        operand = yield node.operand
+        return located(pyast.UnaryOp(pyast.Not(), operand), node.op)
+
+    def visit_ListNode(self, node):
+        elements = []
+        for element in node.elements:
+            elements.append((yield element))
+        return located(pyast.List(elements, pyast.Load()), node.token)
+
+    def visit_DictionaryNode(self, node):
+        keys = []
+        values = []
+        for key, value in node.pairs:
+            keys.append((yield key))
+            values.append((yield value))
+        return located(pyast.Dict(keys, values), node.token)
+
+    def visit_SubscriptNode(self, node):
+        container = yield node.target
+        index = yield node.index_expr
+        return located(pyast.Subscript(container, index, pyast.Load()), node.token)
+
+    def visit_FunctionCallNode(self, node):
+        callee = yield node.identifier
+        arguments = []
+        for argument in node.arguments:
+            arguments.append((yield argument))
+        return located(pyast.Call(callee, arguments, []), node.token)
+
+    def visit_InputFunctionCallNode(self, node):
+        prompt = yield node.prompt_expr
+        return call('_tourte_input', [prompt], node.token)
+
+    def visit_TypeConversionNode(self, node):
+        value = yield node.expression
+        return call(CONVERSIONS[node.type_token.value], [value], node.type_token)
+
+
+class _Slot:
+    """Identifiant local créé par un import (nom et slot de la fonction importée)."""
+    __slots__ = ('name', 'slot')
+    def __init__(self, name, slot):
+        self.name = name
+        self.slot = slot
+
+
+def located(pynode, token):
+    """Donne à `pynode` la position du token Tourte (les nœuds sans position héritent de leur parent)."""
+    line = token.line if token is not None else None
+    if line is not None:
+        pynode.lineno = pynode.end_lineno = line
+        pynode.col_offset = pynode.end_col_offset = max((token.column or 1) - 1, 0)
+    return pynode
+
+def call(function, arguments, token):
+    return located(pyast.Call(pyast.Name(function, pyast.Load()), arguments, []), token)
+
+
+# --- Module Python d'un programme ---
+def python_module(ast, dependencies=()):
+    """AST Python (un seul module) d'un programme analysé et des modules qu'il importe.
+
+    Chaque module importé (tourte_modules.Module, dépendances d'abord) devient une fonction
+    `_tourte_module_<i>`, exécutée au premier import (`_tourte_import`), et le programme la
+    fonction `main`.
+    """
+    indexes = {module.path: index for index, module in enumerate(dependencies)}
+    body = pyast.parse(PRELUDE).body
+    for index, module in enumerate(dependencies):
+        body.append(PythonLowering(indexes).lower(module.ast, f"_tourte_module_{index}", module.exports))
+    body.append(PythonLowering(indexes).lower(ast, 'main'))
+    modules = [pyast.Name(f"_tourte_module_{index}", pyast.Load()) for index in range(len(dependencies))]
+    body.append(pyast.Assign([pyast.Name('_tourte_modules', pyast.Store())], pyast.Tuple(modules, pyast.Load())))
+    body.extend(pyast.parse(MAIN_GUARD).body)
+    module = pyast.Module(body, [])
+    pyast.fix_missing_locations(module)
+    return module
+
+def load_program(path, loader=None):
+    """Charge `path` et ses imports ; renvoie (Module du programme, modules qu'il importe)."""
+    loader = loader or ModuleLoader()
+    root = loader.load(path)
+    reachable = set()
+    pending = [root.path]
+    while pending:
+        for dependency in loader.graph.get(pending.pop(), ()):
+            if dependency not in reachable:
+                reachable.add(dependency)
+                pending.append(dependency)
+    return root, [module for module in loader.order if module.path in reachable]
+
+def compile_program(ast, dependencies=(), filename='<tourte>'):
+    """Code Python d'un programme analysé. Les imbrications que CPython refuse (une vingtaine
+    de boucles, quelques milliers de niveaux d'expressions ou de blocs) deviennent des erreurs Tourte."""
+    try:
+        with warnings.catch_warnings():
+            # Après propagation des constantes, `1[0]` est valide : l'erreur est levée à l'exécution
+            warnings.simplefilter('ignore', SyntaxWarning)
+            return compile(python_module(ast, dependencies), filename, 'exec')
+    except (SyntaxError, RecursionError, MemoryError) as error:
+        raise Exception(f"Programme trop imbriqué pour le backend Python: {error}")
+
+def write_module(path, output, loader=None):
+    """Écrit dans `output` le module Python autonome du programme `path` : il s'exécute
+    (`python output.py`) ou s'importe (`import output; output.main()`) sans Tourte."""
+    root, dependencies = load_program(path, loader)
+    try:
+        source = pyast.unparse(python_module(root.ast, dependencies))
+    except RecursionError as error:
+        raise Exception(f"Programme trop imbriqué pour le backend Python: {error}")
+    with open(output, 'w', encoding='utf-8') as file:
+        file.write(f"# Généré par tourte_pyback depuis {os.path.basename(path)}\n")
+        file.write(source)
+        file.write('\n')
+    return output
+
+
+# --- Exécution ---
+def run(ast, dependencies=(), filename='<tourte>'):
+    """Traduit puis exécute un programme analysé ; renvoie l'espace de noms du module généré."""
+    code = compile_program(ast, dependencies, filename)
+    namespace = {'__name__': 'tourte_main'}
+    exec(code, namespace)
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(max(limit, RECURSION_LIMIT))
+    try:
+        namespace['main']()
+    except RecursionError:
+        raise Exception("Erreur d'exécution: Récursion trop profonde.")
+    except (TypeError, ValueError, ZeroDivisionError, IndexError, KeyError, OverflowError, EOFError) as error:
+        raise execution_error(error, filename, [module.path for module in dependencies])
+    finally:
+        sys.setrecursionlimit(limit)
+    return namespace
+
+def run_file(path, loader=None):
+    """Charge (avec ses imports), traduit puis exécute un fichier Tourte."""
+    root, dependencies = load_program(path, loader)
+    return run(root.ast, dependencies, root.path)
+
+def execution_error(error, filename, module_paths):
+    """Erreur Tourte située à la ligne de la dernière fonction générée traversée par l'exception."""
+    line = None
+    where = ''
+    traceback = error.__traceback__
+    while traceback is not None:
+        code = traceback.tb_frame.f_code
+        if code.co_filename == filename and code.co_name not in PRELUDE_FUNCTIONS:
+            line = traceback.tb_lineno
+            function = code.co_qualname.split('.', 1)[0]
+            if function.startswith('_tourte_module_'):
+                where = f" ({module_paths[int(function[len('_tourte_module_'):])]})"
+            else:
+                where = ''
+        traceback = traceback.tb_next
+    message = f"{type(error).__name__}: {error}"
+    if line is None:
+        return Exception(f"Erreur d'exécution: {message}")
+    return Exception(f"Erreur d'exécution à L{line}{where}: {message}")
+
+
+if __name__ == "__main__":
+    arguments = sys.argv[1:]
+    output = None
+    if len(arguments) == 3 and arguments[1] == '-o':
+        output = arguments[2]
+    elif len(arguments) != 1:
+        print("Usage: python tourte_pyback.py <programme.tourte> [-o module.py]")
+        sys.exit(2)
+    try:
+        if output is not None:
+            write_module(arguments[0], output)
+        else:
+            run_file(arguments[0])
+    except Exception as e:
+        print(e)
+        sys.exit(1)
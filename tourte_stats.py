@@ -0,0 +1,129 @@
+import json
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+from tourte_compil import SymbolTable
+
+# Ordre d'affichage des phases d'une compilation
+PHASES = ('read', 'lex', 'parse', 'analyze')
+
+# Compteurs dont le rapport donne aussi le débit par seconde de leur phase
+RATE_COUNTERS = ('characters', 'tokens', 'nodes', 'lookups')
+
+# --- Comptage des recherches de symboles ---
+class CountingSymbolTable(SymbolTable):
+    """SymbolTable qui compte, dans la table globale, les recherches de symboles (`lookups`),
+    les tables parcourues pour les satisfaire (`table_walks`) et les déclarations (`symbols`).
+    Donnée à SemanticAnalyzer(symbol_table_class=...) seulement quand on mesure."""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.root = self if parent is None else parent.root
+        self.lookups = 0
+        self.table_walks = 0
+        self.symbols = 0
+
+    def declare(self, symbol):
+        super().declare(symbol)
+        self.root.symbols += 1
+
+    def lookup(self, name):
+        root = self.root
+        root.lookups += 1
+        table = self
+        while table is not None:
+            root.table_walks += 1
+            symbols = table.visible.get(name)
+            if symbols:
+                return symbols[-1]
+            table = table.parent
+        return None
+
+
+# --- Mesures par phase ---
+class Stats:
+    """Mesures d'une ou plusieurs compilations, par phase : appels, durée, compteurs (caractères lus,
+    tokens, nœuds, recherches de symboles...) et, avec `memory`, pic de mémoire allouée mesuré
+    par tracemalloc (qui ralentit nettement l'exécution mesurée).
+
+    Rien n'est mesuré tant qu'un Stats n'est pas passé au code instrumenté (ModuleLoader(stats=...)) :
+    sans lui, celui-ci suit son chemin habituel, sans aucun relevé.
+    """
+    def __init__(self, memory=False):
+        self.memory = memory
+        self.phases = {} # Phase -> {'calls', 'seconds', 'peak_memory' et compteurs}
+
+    def entry(self, name):
+        phase = self.phases.get(name)
+        if phase is None:
+            phase = self.phases[name] = {'calls': 0, 'seconds': 0.0}
+        return phase
+
+    @contextmanager
+    def phase(self, name):
+        """Mesure le bloc `with` comme un appel de la phase `name`."""
+        phase = self.entry(name)
+        traced = self.memory and not tracemalloc.is_tracing()
+        if traced:
+            tracemalloc.start()
+        elif self.memory:
+            tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0] if self.memory else 0
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            phase['seconds'] += time.perf_counter() - start
+            phase['calls'] += 1
+            if self.memory:
+                peak = tracemalloc.get_traced_memory()[1] - baseline
+                phase['peak_memory'] = max(phase.get('peak_memory', 0), peak)
+                if traced:
+                    tracemalloc.stop()
+
+    def count(self, name, counter, value):
+        phase = self.entry(name)
+        phase[counter] = phase.get(counter, 0) + value
+
+    def merge(self, phases):
+        """Ajoute les mesures brutes (`phases`) d'un autre Stats, par exemple d'un autre processus."""
+        for name, measures in phases.items():
+            phase = self.entry(name)
+            for counter, value in measures.items():
+                if counter == 'peak_memory':
+                    phase[counter] = max(phase.get(counter, 0), value)
+                else:
+                    phase[counter] = phase.get(counter, 0) + value
+
+    def report(self):
+        """Dictionnaire sérialisable en JSON : les mesures de chaque phase et leurs débits par seconde."""
+        phases = {}
+        names = [name for name in PHASES if name in self.phases] + [name for name in self.phases if name not in PHASES]
+        for name in names:
+            measures = dict(self.phases[name])
+            seconds = measures['seconds']
+            for counter in RATE_COUNTERS:
+                if counter in measures and seconds > 0:
+                    measures[counter + '_per_second'] = round(measures[counter] / seconds)
+            measures['seconds'] = round(seconds, 6)
+            phases[name] = measures
+        return {'phases': phases, 'seconds': round(sum(phase['seconds'] for phase in self.phases.values()), 6)}
+
+    def to_json(self):
+        return json.dumps(self.report(), ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    from tourte_modules import ModuleLoader # Import local : tourte_modules dépend de ce module
+    arguments = [argument for argument in sys.argv[1:] if argument != '--memory']
+    if len(arguments) != 1:
+        print("Usage: python tourte_stats.py <programme.tourte> [--memory]")
+        sys.exit(2)
+    stats = Stats(memory='--memory' in sys.argv)
+    try:
+        ModuleLoader(stats=stats).load(arguments[0])
+    except Exception as e:
+        print(e)
+        sys.exit(1)
+    print(stats.to_json())
@@ -0,0 +1,271 @@
+import sys
+
+from tourte_compil import IdentifierNode, NodeVisitor, NumberNode, SubscriptNode, iter_child_nodes
+from tourte_modules import ModuleLoader
+
+# Noms de types : ceux de tourte_exec.TYPE_NAMES
+NUMERIC_TYPES = frozenset({'bool', 'int', 'float'})
+
+# Opérations qu'un backend peut spécialiser quand ses deux opérandes sont des nombres prouvés :
+# elles ne peuvent alors pas échouer. Les comparaisons sont exactes entre int et float ; les
+# calculs, eux, convertissent l'int en float, ce qui échoue s'il est trop grand (2 ** 2000 + 0.5) :
+# ils ne sont spécialisés qu'entre entiers (bool ou int) ou entre floats. '//' et '%' échouent
+# aussi sur une division par zéro, sauf par une constante non nulle ; '/' sur un int trop grand.
+SPECIALIZED_COMPARISONS = frozenset({'==', '!=', '<', '>', '<=', '>='})
+SPECIALIZED_OPERATORS = frozenset({'+', '-', '*'}) | SPECIALIZED_COMPARISONS
+SPECIALIZED_DIVISIONS = frozenset({'//', '%'})
+
+COMPARISON_OPERATORS = frozenset({'==', '!=', '<', '>', '<=', '>=', 'in', 'not in'})
+
+LITERAL_TYPES = {type(None): 'none', bool: 'bool', int: 'int', float: 'float', str: 'STR'}
+
+CONVERSION_TYPES = {'int': 'int', 'float': 'float', 'STR': 'STR'}
+
+
+def binary_type(symbol, left, right):
+    """Type du résultat de `left symbol right` quand l'opération réussit, ou None s'il dépend des valeurs."""
+    if symbol == 'and' or symbol == 'or':
+        return left if left == right else None
+    if symbol == '==' or symbol == '!=' or symbol == 'in' or symbol == 'not in':
+        return 'bool'
+    if left is None or right is None:
+        return None
+    if left in NUMERIC_TYPES and right in NUMERIC_TYPES:
+        if symbol in COMPARISON_OPERATORS:
+            return 'bool'
+        if symbol == '/':
+            return 'float'
+        if symbol in ('+', '-', '*', '//', '%'):
+            return 'float' if 'float' in (left, right) else 'int'
+        return None # '**' (2 ** -1 est un float) et '///' (racine d'un négatif : complexe)
+    if symbol in COMPARISON_OPERATORS:
+        return 'bool' if left == right and left in ('STR', 'List') else None
+    if symbol == '+' and left == right and left in ('STR', 'List'):
+        return left
+    if symbol == '*':
+        for sequence, count in ((left, right), (right, left)):
+            if sequence in ('STR', 'List') and count in ('int', 'bool'):
+                return sequence
+    if symbol == '%' and left == 'STR':
+        return 'STR' # Formatage
+    return None
+
+def is_specialized(node):
+    """Vrai si un backend peut compiler l'opération `node` sans vérifier le type de ses opérandes."""
+    types = node.operand_types
+    if types is None or types[0] not in NUMERIC_TYPES or types[1] not in NUMERIC_TYPES:
+        return False
+    symbol = node.op.value
+    if symbol in SPECIALIZED_COMPARISONS:
+        return True
+    if (types[0] == 'float') != (types[1] == 'float'):
+        return False # Calcul mixte int/float
+    if symbol in SPECIALIZED_DIVISIONS:
+        return isinstance(node.right, NumberNode) and node.right.value != 0
+    return symbol in SPECIALIZED_OPERATORS
+
+def join(environments):
+    """Types valables à la sortie de plusieurs chemins : ceux sur lesquels tous s'accordent."""
+    first = environments[0]
+    return {key: type for key, type in first.items()
+            if all(environment.get(key) == type for environment in environments[1:])}
+
+
+# --- Variables modifiées par des fonctions imbriquées ---
+class _SharedVariables(NodeVisitor):
+    """Variables (fonction qui les déclare, slot) affectées depuis une fonction imbriquée : un
+    appel peut les modifier n'importe quand, leur type n'est donc jamais prouvé."""
+    def collect(self, ast):
+        self.shared = set()
+        self.functions = []
+        self.visit(ast)
+        return self.shared
+
+    def visit_ProgramNode(self, node):
+        self.functions.append(node)
+        yield from node.statements
+        self.functions.pop()
+
+    def visit_FunctionDeclarationNode(self, node):
+        self.functions.append(node)
+        yield from node.body_statements
+        self.functions.pop()
+
+    def visit_AssignmentNode(self, node):
+        target = node.identifier
+        if isinstance(target, IdentifierNode) and target.depth > 0:
+            self.shared.add((id(self.functions[-1 - target.depth]), target.slot))
+        yield from iter_child_nodes(node)
+
+
+# --- Inférence ---
+class TypeInference(NodeVisitor):
+    """Inférence de types sensible au flot d'exécution, sur un AST analysé.
+
+    Le type d'une variable (identifiée par sa fonction et son slot) suit les affectations dans
+    l'ordre du programme. Après un if, il est celui sur lequel toutes les branches s'accordent ;
+    une boucle while est parcourue jusqu'à ce que les types à son entrée ne changent plus, de
+    sorte qu'un compteur `i = 0; while (...) { i = i + 1; }` reste un int. Les paramètres, les
+    résultats d'appels, les éléments de listes et dictionnaires, les variables d'une fonction
+    englobante et celles qu'une fonction imbriquée modifie sont de type inconnu (None).
+
+    Chaque IdentifierNode lu reçoit `inferred_type`, chaque BinaryOpNode `operand_types` et
+    `inferred_type`. Les compteurs `operations` et `specialized` mesurent la part des opérations
+    binaires qu'un backend peut spécialiser (is_specialized).
+    """
+    def infer(self, ast):
+        if ast.frame_size is None:
+            raise Exception("Le programme doit être analysé (SemanticAnalyzer) avant l'inférence de types.")
+        self.shared = _SharedVariables().collect(ast)
+        self.functions = []
+        self.env = {} # (id de la fonction, slot) -> type prouvé
+        self.annotated = {} # id d'un BinaryOpNode -> nœud, pour les compteurs (une boucle est parcourue plusieurs fois)
+        self.reads = {} # id d'un IdentifierNode lu -> nœud
+        self.visit(ast)
+        self.operations = len(self.annotated)
+        self.specialized = sum(1 for node in self.annotated.values() if is_specialized(node))
+        self.typed_reads = sum(1 for node in self.reads.values() if node.inferred_type is not None)
+        return self
+
+    def key(self, identifier):
+        return id(self.functions[-1 - identifier.depth]), identifier.slot
+
+    def generic_visit(self, node):
+        """Visite les enfants ; le type du nœud est inconnu."""
+        yield from iter_child_nodes(node)
+
+    def bind(self, identifier, type):
+        key = self.key(identifier)
+        if type is None or key in self.shared:
+            self.env.pop(key, None)
+        else:
+            self.env[key] = type
+
+    # --- Instructions ---
+    def visit_ProgramNode(self, node):
+        self.functions.append(node)
+        yield from node.statements
+        self.functions.pop()
+
+    def visit_FunctionDeclarationNode(self, node):
+        self.bind(node.identifier, 'func')
+        outer = self.env
+        self.env = {} # Paramètres inconnus
+        self.functions.append(node)
+        yield from node.body_statements
+        self.functions.pop()
+        self.env = outer
+
+    def visit_AssignmentNode(self, node):
+        type = yield node.expression
+        target = node.identifier
+        if isinstance(target, SubscriptNode):
+            yield target.target
+            yield target.index_expr
+        elif target.depth == 0:
+            self.bind(target, type)
+
+    def visit_IfStatementNode(self, node):
+        yield node.condition
+        start = self.env
+        ends = []
+        bodies = [node.if_body]
+        for condition, body in node.elif_branches:
+            self.env = start
+            yield condition
+            bodies.append(body)
+        if node.else_body:
+            bodies.append(node.else_body)
+        for body in bodies:
+            self.env = dict(start)
+            yield from body
+            ends.append(self.env)
+        if not node.else_body:
+            ends.append(start)
+        self.env = join(ends)
+
+    def visit_WhileStatementNode(self, node):
+        entry = self.env
+        while True:
+            self.env = dict(entry)
+            yield node.condition
+            yield from node.body_statements
+            after = join([entry, self.env])
+            if after == entry:
+                break
+            entry = after # Un type a changé dans le corps : on recommence avec moins de certitudes
+        self.env = entry
+
+    def visit_ImportStatementNode(self, node):
+        for _, _, local_slot in node.bindings or ():
+            self.env[(id(self.functions[-1]), local_slot)] = 'func'
+
+    # --- Expressions ---
+    def visit_NumberNode(self, node):
+        return LITERAL_TYPES.get(type(node.value))
+
+    def visit_StringNode(self, node):
+        return 'STR'
+
+    def visit_NoneNode(self, node):
+        return 'none'
+
+    def visit_IdentifierNode(self, node):
+        type = self.env.get(self.key(node)) if node.depth == 0 else None
+        node.inferred_type = type
+        self.reads[id(node)] = node
+        return type
+
+    def visit_BinaryOpNode(self, node):
+        left = yield node.left
+        right = yield node.right
+        node.operand_types = (left, right)
+        node.inferred_type = binary_type(node.op.value, left, right)
+        self.annotated[id(node)] = node
+        return node.inferred_type
+
+    def visit_UnaryOpNode(self, node):
+        yield node.operand
+        return 'bool'
+
+    def visit_ListNode(self, node):
+        yield from iter_child_nodes(node)
+        return 'List'
+
+    def visit_DictionaryNode(self, node):
+        yield from iter_child_nodes(node)
+        return 'Dictionary'
+
+    def visit_SubscriptNode(self, node):
+        target = yield node.target
+        yield node.index_expr
+        return 'STR' if target == 'STR' else None
+
+    def visit_InputFunctionCallNode(self, node):
+        yield node.prompt_expr
+        return 'STR'
+
+    def visit_TypeConversionNode(self, node):
+        yield node.expression
+        return CONVERSION_TYPES[node.type_token.value]
+
+def infer_types(ast):
+    """Annote un AST analysé ; renvoie le TypeInference et ses compteurs."""
+    return TypeInference().infer(ast)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Usage: python tourte_types.py <programme.tourte>")
+        sys.exit(2)
+    try:
+        loader = ModuleLoader()
+        loader.load(sys.argv[1])
+    except Exception as e:
+        print(e)
+        sys.exit(1)
+    for module in loader.order:
+        report = infer_types(module.ast)
+        share = 100 * report.specialized / report.operations if report.operations else 0
+        print(f"{module.path}: {report.specialized}/{report.operations} opération(s) spécialisable(s) "
+              f"({share:.0f} %), {report.typed_reads}/{len(report.reads)} lecture(s) de variable typée(s)")
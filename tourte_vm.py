@@ -0,0 +1,763 @@
+import marshal
+import math
+import sys
+from array import array
+
+from tourte_compil import (
+    BinaryOpNode, FunctionCallNode, InputFunctionCallNode, NodeVisitor, SubscriptNode, iter_child_nodes,
+)
+from tourte_exec import (
+    TYPE_NAMES, conversion_error, format_value, key_type_error, nth_root, operation_error, runtime_error,
+    subscript_error,
+)
+from tourte_modules import ModuleLoader
+
+# --- Jeu d'instructions ---
+# Une instruction occupe 4 entiers (opcode, a, b, c). Les opérandes sont des registres du
+# cadre courant, sauf quand OPERAND_KINDS dit autre chose.
+OPCODE_NAMES = (
+    'MOVE', 'LOAD_OUTER', 'STORE_OUTER',
+    'ADD', 'SUB', 'MUL', 'DIV', 'FLOORDIV', 'MOD', 'POW', 'ROOT',
+    'EQ', 'NE', 'GT', 'LT', 'GE', 'LE', 'IN', 'NOT_IN', 'NOT',
+    'JUMP', 'JUMP_IF_FALSE', 'JUMP_IF_TRUE',
+    'JUMP_IF_EQ', 'JUMP_IF_NE', 'JUMP_IF_GT', 'JUMP_IF_LT', 'JUMP_IF_GE', 'JUMP_IF_LE',
+    'JUMP_UNLESS_EQ', 'JUMP_UNLESS_NE', 'JUMP_UNLESS_GT', 'JUMP_UNLESS_LT', 'JUMP_UNLESS_GE', 'JUMP_UNLESS_LE',
+    'BUILD_LIST', 'BUILD_DICT', 'GET_ITEM', 'SET_ITEM',
+    'PRINT', 'INPUT', 'CONVERT',
+    'MAKE_FUNCTION', 'CALL', 'RETURN', 'RETURN_NONE', 'IMPORT',
+)
+(MOVE, LOAD_OUTER, STORE_OUTER,
+ ADD, SUB, MUL, DIV, FLOORDIV, MOD, POW, ROOT,
+ EQ, NE, GT, LT, GE, LE, IN, NOT_IN, NOT,
+ JUMP, JUMP_IF_FALSE, JUMP_IF_TRUE,
+ JUMP_IF_EQ, JUMP_IF_NE, JUMP_IF_GT, JUMP_IF_LT, JUMP_IF_GE, JUMP_IF_LE,
+ JUMP_UNLESS_EQ, JUMP_UNLESS_NE, JUMP_UNLESS_GT, JUMP_UNLESS_LT, JUMP_UNLESS_GE, JUMP_UNLESS_LE,
+ BUILD_LIST, BUILD_DICT, GET_ITEM, SET_ITEM,
+ PRINT, INPUT, CONVERT,
+ MAKE_FUNCTION, CALL, RETURN, RETURN_NONE, IMPORT) = range(len(OPCODE_NAMES))
+
+# Nature des opérandes a, b, c : r registre, n entier, j cible de saut (index d'instruction),
+# f index de fonction, i index d'import, '' inutilisé
+OPERAND_KINDS = [('r', 'r', '')] * len(OPCODE_NAMES)
+for _opcode in range(ADD, NOT):
+    OPERAND_KINDS[_opcode] = ('r', 'r', 'r')
+for _opcode in range(JUMP_IF_EQ, JUMP_UNLESS_LE + 1):
+    OPERAND_KINDS[_opcode] = ('r', 'r', 'j')
+OPERAND_KINDS[LOAD_OUTER] = OPERAND_KINDS[STORE_OUTER] = ('r', 'n', 'n')
+OPERAND_KINDS[JUMP] = ('j', '', '')
+OPERAND_KINDS[JUMP_IF_FALSE] = OPERAND_KINDS[JUMP_IF_TRUE] = ('r', 'j', '')
+OPERAND_KINDS[BUILD_LIST] = OPERAND_KINDS[BUILD_DICT] = ('r', 'r', 'n')
+OPERAND_KINDS[GET_ITEM] = OPERAND_KINDS[SET_ITEM] = OPERAND_KINDS[CALL] = ('r', 'r', 'r')
+OPERAND_KINDS[PRINT] = ('r', 'n', '')
+OPERAND_KINDS[CONVERT] = ('r', 'r', 'n')
+OPERAND_KINDS[MAKE_FUNCTION] = ('r', 'f', '')
+OPERAND_KINDS[RETURN] = ('r', '', '')
+OPERAND_KINDS[RETURN_NONE] = ('', '', '')
+OPERAND_KINDS[IMPORT] = ('i', '', '')
+
+BINARY_OPCODES = {
+    '+': ADD, '-': SUB, '*': MUL, '/': DIV, '//': FLOORDIV, '%': MOD, '**': POW, '///': ROOT,
+    '==': EQ, '!=': NE, '>': GT, '<': LT, '>=': GE, '<=': LE, 'in': IN, 'not in': NOT_IN,
+}
+OPCODE_SYMBOLS = {opcode: symbol for symbol, opcode in BINARY_OPCODES.items()}
+JUMP_IF = {'==': JUMP_IF_EQ, '!=': JUMP_IF_NE, '>': JUMP_IF_GT, '<': JUMP_IF_LT, '>=': JUMP_IF_GE, '<=': JUMP_IF_LE}
+JUMP_UNLESS = {'==': JUMP_UNLESS_EQ, '!=': JUMP_UNLESS_NE, '>': JUMP_UNLESS_GT, '<': JUMP_UNLESS_LT,
+               '>=': JUMP_UNLESS_GE, '<=': JUMP_UNLESS_LE}
+for _symbol, _opcode in list(JUMP_IF.items()) + list(JUMP_UNLESS.items()):
+    OPCODE_SYMBOLS[_opcode] = _symbol
+
+CONVERSION_NAMES = ('int', 'float', 'STR')
+CONVERSION_FUNCTIONS = (int, float, format_value)
+
+BYTECODE_FORMAT = 1
+MAX_CALL_DEPTH = 100000
+
+
+# --- Code compilé ---
+class CodeObject:
+    """Bytecode d'une fonction (ou du programme principal).
+
+    `code` contient les instructions (4 entiers chacune) et `positions` leur (ligne, colonne)
+    dans le source. `template` est le cadre initial d'un appel : index 0 pour le cadre
+    englobant, puis les slots de SymbolTable (paramètres en premier), les temporaires et enfin
+    les constantes, chargées une fois pour toutes dans leurs registres.
+    """
+    __slots__ = ('name', 'code', 'positions', 'template', 'parameter_count', 'register_names', '_instructions')
+
+    def __init__(self, name, code, positions, template, parameter_count, register_names):
+        self.name = name
+        self.code = code
+        self.positions = positions
+        self.template = template
+        self.parameter_count = parameter_count
+        self.register_names = register_names
+        self._instructions = None
+
+    @property
+    def instructions(self):
+        """Instructions décodées une fois en tuples : la boucle d'exécution évite ainsi quatre
+        lectures dans le tableau à chaque instruction."""
+        if self._instructions is None:
+            code = self.code
+            self._instructions = tuple(tuple(code[index:index + 4]) for index in range(0, len(code), 4))
+        return self._instructions
+
+    def position(self, index):
+        line, column = self.positions[2 * index], self.positions[2 * index + 1]
+        return Location(line, column) if line else None
+
+
+class Location:
+    __slots__ = ('line', 'column')
+    def __init__(self, line, column):
+        self.line = line
+        self.column = column
+
+
+class Program:
+    """Programme compilé : ses CodeObject (le premier est le programme principal) et ses imports,
+    des (chemin du module, ((registre dans le module, registre local), ...))."""
+    def __init__(self, codes, imports):
+        self.codes = codes
+        self.imports = imports
+
+    def to_bytes(self):
+        """Forme sérialisée (marshal), à écrire sur disque et relire avec from_bytes."""
+        codes = [(unit.name, unit.code.tobytes(), unit.positions.tobytes(), tuple(unit.template),
+                  unit.parameter_count, tuple(unit.register_names)) for unit in self.codes]
+        return marshal.dumps((BYTECODE_FORMAT, sys.byteorder, codes, self.imports))
+
+    @classmethod
+    def from_bytes(cls, data):
+        format, byteorder, codes, imports = marshal.loads(data)
+        if format != BYTECODE_FORMAT or byteorder != sys.byteorder:
+            raise Exception(f"Format de bytecode incompatible: {format} ({byteorder})")
+        units = []
+        for name, code, positions, template, parameter_count, register_names in codes:
+            code_array = array('i')
+            code_array.frombytes(code)
+            position_array = array('i')
+            position_array.frombytes(positions)
+            units.append(CodeObject(name, code_array, position_array, list(template), parameter_count, list(register_names)))
+        return cls(units, imports)
+
+
+class BytecodeFunction:
+    __slots__ = ('code', 'frame')
+    def __init__(self, code, frame):
+        self.code = code
+        self.frame = frame
+
+    def __repr__(self):
+        return f"<func {self.code.name}>"
+
+TYPE_NAMES[BytecodeFunction] = 'func' # Nom affiché dans les messages d'erreur d'exécution
+
+
+# --- Compilation de l'AST en bytecode ---
+class _Unit:
+    """CodeObject en cours de compilation.
+
+    Les registres 1..variables sont les slots de l'analyse sémantique ; les temporaires suivent.
+    Une constante reçoit d'abord un numéro négatif, remplacé par un vrai registre (après le
+    dernier temporaire) quand le nombre de temporaires est connu.
+    """
+    def __init__(self, name, variables, parameter_count):
+        self.name = name
+        self.code = array('i')
+        self.positions = array('i')
+        self.variables = variables
+        self.parameter_count = parameter_count
+        self.names = {}
+        self.constants = {} # (type, valeur) -> registre provisoire (négatif)
+        self.constant_values = []
+        self.top = variables + 1 # Premier temporaire libre
+        self.registers = variables + 1
+        self.last_writer = None # Index de la dernière instruction, si elle écrit seule son registre a
+
+    def emit(self, opcode, a=0, b=0, c=0, token=None, writer=False):
+        index = len(self.code) // 4
+        self.code.extend((opcode, a, b, c))
+        self.positions.extend((token.line or 0, token.column or 0) if token is not None else (0, 0))
+        self.last_writer = index if writer else None
+        return index
+
+    def patch(self, index, target=None):
+        """Fait sauter l'instruction `index` vers `target` (par défaut : la prochaine instruction)."""
+        if target is None:
+            target = len(self.code) // 4
+            self.last_writer = None # Une instruction visée par un saut n'est plus seule à écrire
+        operand = OPERAND_KINDS[self.code[4 * index]].index('j')
+        self.code[4 * index + 1 + operand] = target
+
+    def temporary(self, count=1):
+        register = self.top
+        self.top += count
+        self.registers = max(self.registers, self.top)
+        return register
+
+    def is_temporary(self, register):
+        return register > self.variables
+
+    def constant(self, value):
+        key = (type(value), value)
+        if type(value) is float:
+            key += (math.copysign(1.0, value),) # -0.0 == 0.0, mais ne s'affiche pas pareil
+        register = self.constants.get(key)
+        if register is None:
+            self.constant_values.append(value)
+            register = -len(self.constant_values)
+            self.constants[key] = register
+        return register
+
+    def finish(self):
+        first_constant = self.registers
+        code = self.code
+        for index in range(0, len(code), 4):
+            for position, kind in enumerate(OPERAND_KINDS[code[index]], start=1):
+                if kind == 'r' and code[index + position] < 0:
+                    code[index + position] = first_constant - 1 - code[index + position]
+        template = [None] * first_constant + self.constant_values
+        names = [''] * len(template)
+        for register, name in self.names.items():
+            names[register] = name
+        for offset, value in enumerate(self.constant_values):
+            names[first_constant + offset] = repr(value) if value is not None else 'none'
+        return CodeObject(self.name, code, self.positions, template, self.parameter_count, names)
+
+
+class BytecodeCompiler(NodeVisitor):
+    """Compile un AST analysé en Program.
+
+    Les expressions rendent le registre qui contient leur valeur : une variable locale ou une
+    constante ne coûte aucune instruction, et une affectation écrit directement dans le
+    registre de sa variable (`i = i + 1` donne ADD i, i, 1). Les conditions des if et while
+    utilisent des sauts comparatifs (JUMP_UNLESS_LT...) et les boucles testent leur condition
+    en fin de corps : un seul saut par tour.
+    """
+    def compile(self, ast):
+        if ast.frame_size is None:
+            raise Exception("Le programme doit être analysé (SemanticAnalyzer) avant d'être compilé.")
+        self.impure = impure_nodes(ast)
+        self.codes = [None]
+        self.imports = []
+        self.unit = _Unit('<programme>', ast.frame_size, 0)
+        self.visit(ast)
+        self.codes[0] = self.unit.finish()
+        return Program(self.codes, tuple(self.imports))
+
+    def generic_visit(self, node):
+        raise Exception(f"Nœud non compilable: {node.__class__.__name__}")
+
+    def block(self, statements):
+        unit = self.unit
+        for statement in statements:
+            unit.top = unit.variables + 1 # Les temporaires ne survivent pas à une instruction
+            yield statement
+
+    def protect(self, register, later):
+        """Copie une variable locale dans un temporaire si l'évaluation de `later` (un appel de
+        fonction, un input) peut la modifier avant qu'elle ne soit lue."""
+        unit = self.unit
+        if 0 < register <= unit.variables and id(later) in self.impure:
+            temporary = unit.temporary()
+            unit.emit(MOVE, temporary, register)
+            return temporary
+        return register
+
+    def result_register(self, *operands):
+        unit = self.unit
+        for register in operands:
+            if unit.is_temporary(register):
+                return register
+        return unit.temporary()
+
+    def jump_unless(self, condition):
+        """Saut (à corriger avec patch) pris quand `condition` est fausse."""
+        if isinstance(condition, BinaryOpNode) and condition.op.value in JUMP_UNLESS:
+            left = self.protect((yield condition.left), condition.right)
+            right = yield condition.right
+            return self.unit.emit(JUMP_UNLESS[condition.op.value], left, right, token=condition.op)
+        register = yield condition
+        return self.unit.emit(JUMP_IF_FALSE, register)
+
+    def jump_if(self, condition, target):
+        if isinstance(condition, BinaryOpNode) and condition.op.value in JUMP_IF:
+            left = self.protect((yield condition.left), condition.right)
+            right = yield condition.right
+            return self.unit.emit(JUMP_IF[condition.op.value], left, right, target, token=condition.op)
+        register = yield condition
+        return self.unit.emit(JUMP_IF_TRUE, register, target)
+
+    def operands(self, nodes):
+        """Évalue `nodes` dans des registres consécutifs ; renvoie le premier."""
+        unit = self.unit
+        start = unit.temporary(len(nodes))
+        for offset, node in enumerate(nodes):
+            register = yield node
+            if register != start + offset:
+                unit.emit(MOVE, start + offset, register)
+        return start
+
+    # --- Instructions ---
+    def visit_ProgramNode(self, node):
+        yield from self.block(node.statements)
+        self.unit.emit(RETURN_NONE)
+
+    def visit_AssignmentNode(self, node):
+        unit = self.unit
+        value = yield node.expression
+        target = node.identifier
+        if isinstance(target, SubscriptNode):
+            value = self.protect(value, target)
+            container = self.protect((yield target.target), target.index_expr)
+            key = yield target.index_expr
+            unit.emit(SET_ITEM, container, key, value, token=target.token)
+            return
+        register = target.slot + 1
+        if target.depth:
+            unit.emit(STORE_OUTER, value, target.depth, register, token=target.token)
+            return
+        unit.names[register] = target.name
+        if value == register:
+            return
+        last = unit.last_writer
+        if unit.is_temporary(value) and last is not None and last == len(unit.code) // 4 - 1 \
+                and unit.code[4 * last + 1] == value:
+            unit.code[4 * last + 1] = register # L'instruction qui calcule la valeur écrit directement la variable
+        else:
+            unit.emit(MOVE, register, value)
+
+    def visit_PrintStatementNode(self, node):
+        start = yield from self.operands(node.expressions)
+        self.unit.emit(PRINT, start, len(node.expressions), token=node.token)
+
+    def visit_FunctionDeclarationNode(self, node):
+        index = len(self.codes)
+        self.codes.append(None)
+        outer = self.unit
+        self.unit = _Unit(node.identifier.name, node.frame_size, len(node.parameters))
+        for parameter in node.parameters:
+            self.unit.names[parameter.slot + 1] = parameter.name
+        yield from self.block(node.body_statements)
+        self.unit.emit(RETURN_NONE)
+        self.codes[index] = self.unit.finish()
+        self.unit = outer
+        register = node.identifier.slot + 1
+        outer.names[register] = node.identifier.name
+        outer.emit(MAKE_FUNCTION, register, index, token=node.token)
+
+    def visit_ReturnStatementNode(self, node):
+        if node.expression is None:
+            self.unit.emit(RETURN_NONE, token=node.token)
+            return
+        register = yield node.expression
+        self.unit.emit(RETURN, register, token=node.token)
+
+    def visit_IfStatementNode(self, node):
+        unit = self.unit
+        exits = []
+        skip = yield from self.jump_unless(node.condition)
+        yield from self.block(node.if_body)
+        for condition, body in node.elif_branches:
+            exits.append(unit.emit(JUMP))
+            unit.patch(skip)
+            skip = yield from self.jump_unless(condition)
+            yield from self.block(body)
+        if node.else_body:
+            exits.append(unit.emit(JUMP))
+            unit.patch(skip)
+            yield from self.block(node.else_body)
+        else:
+            unit.patch(skip)
+        for index in exits:
+            unit.patch(index)
+
+    def visit_WhileStatementNode(self, node):
+        unit = self.unit
+        entry = unit.emit(JUMP)
+        body = len(unit.code) // 4
+        yield from self.block(node.body_statements)
+        unit.patch(entry)
+        unit.top = unit.variables + 1
+        yield from self.jump_if(node.condition, body)
+
+    def visit_ImportStatementNode(self, node):
+        if node.bindings is None:
+            return # Import non résolu (analyse sans chargeur) : sans effet
+        bindings = tuple((module_slot + 1, local_slot + 1) for _, module_slot, local_slot in node.bindings)
+        for name, _, local_slot in node.bindings:
+            self.unit.names[local_slot + 1] = name
+        self.imports.append((node.path, bindings))
+        self.unit.emit(IMPORT, len(self.imports) - 1, token=node.token)
+
+    def visit_FunctionCallNode(self, node):
+        unit = self.unit
+        callee = yield node.identifier
+        start = yield from self.operands(node.arguments)
+        destination = start if node.arguments else unit.temporary()
+        unit.emit(CALL, destination, callee, start, token=node.token, writer=True)
+        return destination
+
+    # --- Expressions ---
+    def visit_NumberNode(self, node):
+        return self.unit.constant(node.value)
+
+    visit_StringNode = visit_NumberNode
+
+    def visit_NoneNode(self, node):
+        return self.unit.constant(None)
+
+    def visit_IdentifierNode(self, node):
+        if not node.depth:
+            if node.slot is None:
+                raise Exception(f"Identifiant '{node.name}' non résolu : l'AST doit être analysé "
+                                f"(SemanticAnalyzer) avant d'être compilé.")
+            return node.slot + 1
+        register = self.unit.temporary()
+        self.unit.emit(LOAD_OUTER, register, node.depth, node.slot + 1, token=node.token, writer=True)
+        return register
+
+    def visit_BinaryOpNode(self, node):
+        unit = self.unit
+        symbol = node.op.value
+        left = yield node.left
+        if symbol == 'and' or symbol == 'or':
+            result = self.result_register(left)
+            if result != left:
+                unit.emit(MOVE, result, left)
+            skip = unit.emit(JUMP_IF_FALSE if symbol == 'and' else JUMP_IF_TRUE, result)
+            right = yield node.right
+            if right != result:
+                unit.emit(MOVE, result, right)
+            unit.patch(skip)
+            return result
+        left = self.protect(left, node.right)
+        right = yield node.right
+        result = self.result_register(left, right)
+        unit.emit(BINARY_OPCODES[symbol], result, left, right, token=node.op, writer=True)
+        return result
+
+    def visit_UnaryOpNode(self, node):
+        operand = yield node.operand
+        result = self.result_register(operand)
+        self.unit.emit(NOT, result, operand, writer=True)
+        return result
+
+    def visit_ListNode(self, node):
+        start = yield from self.operands(node.elements)
+        result = start if node.elements else self.unit.temporary()
+        self.unit.emit(BUILD_LIST, result, start, len(node.elements), token=node.token, writer=True)
+        return result
+
+    def visit_DictionaryNode(self, node):
+        start = yield from self.operands([item for pair in node.pairs for item in pair])
+        result = start if node.pairs else self.unit.temporary()
+        self.unit.emit(BUILD_DICT, result, start, len(node.pairs), token=node.token, writer=True)
+        return result
+
+    def visit_SubscriptNode(self, node):
+        container = self.protect((yield node.target), node.index_expr)
+        key = yield node.index_expr
+        result = self.result_register(container, key)
+        self.unit.emit(GET_ITEM, result, container, key, token=node.token, writer=True)
+        return result
+
+    def visit_InputFunctionCallNode(self, node):
+        prompt = yield node.prompt_expr
+        result = self.result_register(prompt)
+        self.unit.emit(INPUT, result, prompt, token=node.token, writer=True)
+        return result
+
+    def visit_TypeConversionNode(self, node):
+        value = yield node.expression
+        result = self.result_register(value)
+        self.unit.emit(CONVERT, result, value, CONVERSION_NAMES.index(node.type_token.value),
+                       token=node.type_token, writer=True)
+        return result
+
+
+def impure_nodes(ast):
+    """id() des nœuds dont l'évaluation peut modifier des variables : appels de fonction et
+    input(), ou expressions qui en contiennent."""
+    impure = set()
+    pending = [(ast, False)]
+    while pending:
+        node, children_done = pending.pop()
+        if not children_done:
+            pending.append((node, True))
+            pending.extend((child, False) for child in iter_child_nodes(node))
+        elif isinstance(node, (FunctionCallNode, InputFunctionCallNode)) or \
+                any(id(child) in impure for child in iter_child_nodes(node)):
+            impure.add(id(node))
+    return impure
+
+
+# --- Désassembleur ---
+def disassemble(program):
+    """Listing lisible du bytecode : une section par fonction, une ligne par instruction."""
+    lines = []
+    for index, unit in enumerate(program.codes):
+        lines.append(f"fonction {index} '{unit.name}' ({unit.parameter_count} paramètre(s), "
+                     f"{len(unit.template)} registres) :")
+        for position, (opcode, *operands) in enumerate(unit.instructions):
+            text = []
+            for kind, operand in zip(OPERAND_KINDS[opcode], operands):
+                if kind == 'r':
+                    name = unit.register_names[operand]
+                    text.append(f"r{operand}" + (f"({name})" if name else ""))
+                elif kind == 'j':
+                    text.append(f"-> {operand}")
+                elif kind == 'f':
+                    text.append(f"fonction {operand} '{program.codes[operand].name}'")
+                elif kind == 'i':
+                    text.append(f"'{program.imports[operand][0]}'")
+                elif kind == 'n':
+                    text.append(str(operand))
+            location = unit.position(position)
+            where = f"L{location.line}" if location else ""
+            lines.append(f"  {position:5d} {where:>6} {OPCODE_NAMES[opcode]:<16} {', '.join(text)}")
+    return "\n".join(lines)
+
+
+# --- Machine virtuelle ---
+class VirtualMachine:
+    """Exécute un Program. Les appels Tourte utilisent une pile d'appels explicite : la
+    profondeur de récursion ne dépend pas de la limite de récursion de Python.
+
+    Avec `count=True`, le nombre d'exécutions de chaque opcode est compté (opcode_counts()).
+    Avec un chargeur de modules, chaque module importé est compilé et exécuté une seule fois.
+    """
+    def __init__(self, loader=None, count=False):
+        self.loader = loader
+        self.counts = [0] * len(OPCODE_NAMES) if count else None
+        self.frames = {} # Chemin d'un module -> cadre global après son exécution
+
+    def opcode_counts(self):
+        """{nom d'opcode: exécutions}, du plus fréquent au moins fréquent."""
+        if self.counts is None:
+            return {}
+        counts = {OPCODE_NAMES[opcode]: count for opcode, count in enumerate(self.counts) if count}
+        return dict(sorted(counts.items(), key=lambda item: item[1], reverse=True))
+
+    def module_frame(self, path):
+        frame = self.frames.get(path)
+        if frame is None:
+            if self.loader is None or path not in self.loader.modules:
+                raise runtime_error(None, f"Module '{path}' non chargé.")
+            frame = self.run(compile_program(self.loader.modules[path].ast))
+            self.frames[path] = frame
+        return frame
+
+    def run(self, program):
+        """Exécute `program` ; renvoie son cadre global."""
+        codes = program.codes
+        unit = codes[0]
+        instructions = unit.instructions
+        registers = list(unit.template)
+        frame = registers
+        calls = [] # (unit, instructions, index de retour, registres, registre résultat) des appelants
+        counts = self.counts
+        index = 0
+        try:
+            while True:
+                opcode, a, b, c = instructions[index]
+                index += 1
+                if counts is not None:
+                    counts[opcode] += 1
+                # Répartition en arbre sur les familles d'opcodes (numérotées de façon contiguë) :
+                # quelques comparaisons au plus par instruction, quel que soit l'opcode
+                if opcode < JUMP:
+                    if opcode < EQ:
+                        if opcode == ADD:
+                            registers[a] = registers[b] + registers[c]
+                        elif opcode == MOVE:
+                            registers[a] = registers[b]
+                        elif opcode == SUB:
+                            registers[a] = registers[b] - registers[c]
+                        elif opcode == MUL:
+                            registers[a] = registers[b] * registers[c]
+                        elif opcode == MOD:
+                            registers[a] = registers[b] % registers[c]
+                        elif opcode == LOAD_OUTER:
+                            outer = registers
+                            for _ in range(b):
+                                outer = outer[0]
+                            registers[a] = outer[c]
+                        elif opcode == FLOORDIV:
+                            registers[a] = registers[b] // registers[c]
+                        elif opcode == DIV:
+                            registers[a] = registers[b] / registers[c]
+                        elif opcode == STORE_OUTER:
+                            outer = registers
+                            for _ in range(b):
+                                outer = outer[0]
+                            outer[c] = registers[a]
+                        elif opcode == POW:
+                            registers[a] = registers[b] ** registers[c]
+                        else:
+                            registers[a] = nth_root(registers[b], registers[c])
+                    elif opcode == LT:
+                        registers[a] = registers[b] < registers[c]
+                    elif opcode == EQ:
+                        registers[a] = registers[b] == registers[c]
+                    elif opcode == NOT:
+                        registers[a] = not registers[b]
+                    elif opcode == GT:
+                        registers[a] = registers[b] > registers[c]
+                    elif opcode == NE:
+                        registers[a] = registers[b] != registers[c]
+                    elif opcode == LE:
+                        registers[a] = registers[b] <= registers[c]
+                    elif opcode == GE:
+                        registers[a] = registers[b] >= registers[c]
+                    elif opcode == IN:
+                        registers[a] = registers[b] in registers[c]
+                    else:
+                        registers[a] = registers[b] not in registers[c]
+                elif opcode < BUILD_LIST:
+                    if opcode < JUMP_UNLESS_EQ:
+                        if opcode == JUMP_IF_LT:
+                            if registers[a] < registers[b]:
+                                index = c
+                        elif opcode == JUMP:
+                            index = a
+                        elif opcode == JUMP_IF_FALSE:
+                            if not registers[a]:
+                                index = b
+                        elif opcode == JUMP_IF_TRUE:
+                            if registers[a]:
+                                index = b
+                        elif opcode == JUMP_IF_LE:
+                            if registers[a] <= registers[b]:
+                                index = c
+                        elif opcode == JUMP_IF_GT:
+                            if registers[a] > registers[b]:
+                                index = c
+                        elif opcode == JUMP_IF_GE:
+                            if registers[a] >= registers[b]:
+                                index = c
+                        elif opcode == JUMP_IF_NE:
+                            if registers[a] != registers[b]:
+                                index = c
+                        elif registers[a] == registers[b]:
+                            index = c
+                    elif opcode == JUMP_UNLESS_EQ:
+                        if not registers[a] == registers[b]:
+                            index = c
+                    elif opcode == JUMP_UNLESS_LT:
+                        if not registers[a] < registers[b]:
+                            index = c
+                    elif opcode == JUMP_UNLESS_NE:
+                        if not registers[a] != registers[b]:
+                            index = c
+                    elif opcode == JUMP_UNLESS_LE:
+                        if not registers[a] <= registers[b]:
+                            index = c
+                    elif opcode == JUMP_UNLESS_GT:
+                        if not registers[a] > registers[b]:
+                            index = c
+                    elif not registers[a] >= registers[b]:
+                        index = c
+                elif opcode < PRINT:
+                    if opcode == GET_ITEM:
+                        registers[a] = registers[b][registers[c]]
+                    elif opcode == SET_ITEM:
+                        registers[a][registers[b]] = registers[c]
+                    elif opcode == BUILD_LIST:
+                        registers[a] = registers[b:b + c]
+                    else:
+                        dictionary = {}
+                        for item in range(b, b + 2 * c, 2):
+                            dictionary[registers[item]] = registers[item + 1]
+                        registers[a] = dictionary
+                elif opcode == CALL:
+                    function = registers[b]
+                    callee = function.code
+                    callee_registers = list(callee.template)
+                    callee_registers[0] = function.frame
+                    count = callee.parameter_count
+                    if count:
+                        callee_registers[1:count + 1] = registers[c:c + count]
+                    calls.append((unit, instructions, index, registers, a))
+                    if len(calls) > MAX_CALL_DEPTH:
+                        raise RecursionError
+                    unit = callee
+                    instructions = callee.instructions
+                    registers = callee_registers
+                    index = 0
+                elif opcode == RETURN or opcode == RETURN_NONE:
+                    value = registers[a] if opcode == RETURN else None
+                    if not calls:
+                        return frame
+                    unit, instructions, index, registers, result = calls.pop()
+                    registers[result] = value
+                elif opcode == PRINT:
+                    print(*[format_value(value) for value in registers[a:a + b]])
+                elif opcode == MAKE_FUNCTION:
+                    registers[a] = BytecodeFunction(codes[b], registers)
+                elif opcode == CONVERT:
+                    registers[a] = CONVERSION_FUNCTIONS[c](registers[b])
+                elif opcode == INPUT:
+                    registers[a] = input(format_value(registers[b]))
+                elif opcode == IMPORT:
+                    path, bindings = program.imports[a]
+                    module = self.module_frame(path)
+                    for source, target in bindings:
+                        registers[target] = module[source]
+                else:
+                    raise Exception(f"Opcode inconnu: {opcode}")
+        except RecursionError:
+            raise runtime_error(None, "Récursion trop profonde.")
+        except (TypeError, ValueError, ZeroDivisionError, OverflowError, IndexError, KeyError, EOFError) as error:
+            raise execution_error(unit.position(index - 1), instructions[index - 1], registers, error)
+
+
+def execution_error(location, instruction, registers, error):
+    """Erreur Tourte correspondant à une exception Python levée par `instruction`."""
+    opcode, a, b, c = instruction
+    if ADD <= opcode < NOT:
+        return operation_error(location, OPCODE_SYMBOLS[opcode], registers[b], registers[c], error)
+    if JUMP_IF_EQ <= opcode <= JUMP_UNLESS_LE:
+        return operation_error(location, OPCODE_SYMBOLS[opcode], registers[a], registers[b], error)
+    if opcode == GET_ITEM:
+        return subscript_error(location, registers[b], registers[c])
+    if opcode == SET_ITEM:
+        return subscript_error(location, registers[a], registers[b])
+    if opcode == CONVERT:
+        return conversion_error(location, CONVERSION_NAMES[c], registers[b])
+    if opcode == BUILD_DICT:
+        for item in range(b, b + 2 * c, 2):
+            try:
+                hash(registers[item])
+            except TypeError:
+                return key_type_error(location, registers[item])
+    if opcode == INPUT and isinstance(error, EOFError):
+        return runtime_error(location, "Fin de l'entrée standard.")
+    return runtime_error(location, f"{OPCODE_NAMES[opcode]}: {error}")
+
+def compile_program(ast):
+    return BytecodeCompiler().compile(ast)
+
+
+if __name__ == "__main__":
+    arguments = [argument for argument in sys.argv[1:] if not argument.startswith('--')]
+    if len(arguments) != 1:
+        print("Usage: python tourte_vm.py <programme.tourte> [--dis] [--stats]")
+        sys.exit(2)
+    try:
+        loader = ModuleLoader()
+        module = loader.load(arguments[0])
+        program = compile_program(module.ast)
+        if '--dis' in sys.argv:
+            print(disassemble(program))
+            sys.exit(0)
+        machine = VirtualMachine(loader, count='--stats' in sys.argv)
+        machine.frames[module.path] = machine.run(program)
+    except Exception as e:
+        print(e)
+        sys.exit(1)
+    if machine.counts is not None:
+        print("\n--- Instructions exécutées ---")
+        for name, count in machine.opcode_counts().items():
+            print(f"{name:<16} {count}")